@@ -0,0 +1,154 @@
+"""
+Benchmark: scene-detection scan throughput and per-frame allocations
+
+Compares the original per-pair scan, which converts both frames of every
+pair to 320x240 grayscale with freshly allocated arrays, against
+FrameExtractor's scan, which decodes and converts into reused buffers and
+scores frames in preallocated batches.
+
+For each scan it reports decoded frames per second and the memory
+allocated per frame: the peak of traced memory between two reads, above
+what was live at the first of them, averaged over frames. It is measured
+with tracemalloc, which traces both NumPy and OpenCV arrays. NumPy has no
+allocation counter reachable from Python, so bytes stand in for counts; a
+1080p BGR frame is about 6 MB and its grayscale copy 2 MB.
+
+Run with a video of your own, or without arguments to scan a generated
+1080p clip:
+    
+    python examples/benchmark_scene_scan.py [video.mp4]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import cv2
+import numpy as np
+from loguru import logger
+from framewise import FrameExtractor
+
+FRAME_SIZE = (1920, 1080)
+N_FRAMES = 300
+SCENE_THRESHOLD = 0.1
+
+
+def make_video(path: Path) -> Path:
+    """Write a synthetic clip with a cut every second"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30, FRAME_SIZE)
+    rng = np.random.default_rng(0)
+    for idx in range(N_FRAMES):
+        if idx % 30 == 0:
+            grid = (FRAME_SIZE[1] // 40, FRAME_SIZE[0] // 40, 3)
+            scene = rng.integers(0, 256, grid, dtype=np.uint8)
+            frame = cv2.resize(scene, FRAME_SIZE, interpolation=cv2.INTER_NEAREST)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+class TracedCapture:
+    """VideoCapture wrapper recording traced allocations between reads"""
+    
+    def __init__(self, video_path: Path):
+        self.cap = cv2.VideoCapture(str(video_path))
+        self.allocated = []
+        self._live = None
+    
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+    
+    def read(self, *args):
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._live is not None:
+                self.allocated.append(peak - self._live)
+            tracemalloc.reset_peak()
+            self._live = current
+        return self.cap.read(*args)
+
+
+def original_scan(cap) -> list:
+    """The scan as originally written: both frames converted for every pair"""
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    changes = []
+    prev_frame = None
+    frame_idx = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if prev_frame is not None:
+            gray1 = cv2.resize(cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY), (320, 240))
+            gray2 = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (320, 240))
+            score = np.mean(cv2.absdiff(gray1, gray2)) / 255.0
+            if score > SCENE_THRESHOLD:
+                changes.append(frame_idx / fps)
+        prev_frame = frame
+        frame_idx += 1
+    return changes
+
+
+def buffered_scan(cap) -> list:
+    """FrameExtractor's scan over the same frames"""
+    extractor = FrameExtractor(strategy="scene", scene_threshold=SCENE_THRESHOLD)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return [t for t, _, _ in extractor._extract_by_scene_change(cap, fps)]
+
+
+def measure(scan, video_path: Path, n_frames: int) -> dict:
+    """Time a scan, then trace its allocations in a second run"""
+    cap = TracedCapture(video_path)
+    start = time.perf_counter()
+    changes = scan(cap)
+    elapsed = time.perf_counter() - start
+    cap.release()
+    
+    cap = TracedCapture(video_path)
+    tracemalloc.start()
+    scan(cap)
+    tracemalloc.stop()
+    cap.release()
+    
+    return {
+        "fps": n_frames / elapsed,
+        "mb_per_frame": np.mean(cap.allocated) / 2**20,
+        "changes": changes,
+    }
+
+
+def main():
+    """Run both scans and print the comparison"""
+    with tempfile.TemporaryDirectory() as tmp:
+        if len(sys.argv) > 1:
+            video_path = Path(sys.argv[1])
+        else:
+            logger.info(f"Generating a {N_FRAMES}-frame {FRAME_SIZE[0]}x{FRAME_SIZE[1]} clip...")
+            video_path = make_video(Path(tmp) / "benchmark.mp4")
+        
+        cap = cv2.VideoCapture(str(video_path))
+        n_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+        frame_mb = width * height * 3 / 2**20
+        
+        results = {
+            "original": measure(original_scan, video_path, n_frames),
+            "buffered": measure(buffered_scan, video_path, n_frames),
+        }
+    
+    logger.info(f"{n_frames} frames at {width}x{height} ({frame_mb:.1f} MB per decoded frame)")
+    for name, result in results.items():
+        logger.info(
+            f"{name:>9}: {result['fps']:7.1f} fps, "
+            f"{result['mb_per_frame']:5.2f} MB allocated per frame, "
+            f"{len(result['changes'])} scene changes"
+        )
+    speedup = results["buffered"]["fps"] / results["original"]["fps"]
+    logger.info(f"Speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from framewise.core.transcript_extractor import (
 from framewise.core.frame_extractor import (
     FrameExtractor,
     ExtractedFrame,
+    BatchExtractionResult,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "TranscriptSegment",
     "FrameExtractor",
     "ExtractedFrame",
+    "BatchExtractionResult",
 ]
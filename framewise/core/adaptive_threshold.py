@@ -0,0 +1,163 @@
+"""Adaptive scene-change threshold from rolling score statistics.
+
+A fixed ``scene_threshold`` suits only one kind of footage: on noisy
+camera recordings every frame pair scores above it, on clean slide decks
+real changes score below it. :class:`AdaptiveThreshold` instead flags a
+score that stands out from the recent scores of the same video: more than
+``k`` standard deviations above the rolling mean of the last ``window``
+seconds. A minimum gap between detections stops one busy moment from
+producing a burst of candidates.
+
+Every score enters the rolling statistics. A single cut among the
+hundreds of samples in a window moves them little, while a lasting rise in
+the noise level (a switch to shaky camera footage) lifts the baseline
+within one window. At low sampling rates the window holds few samples and
+each cut raises the threshold for a while, so use a longer window there.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.adaptive_threshold import AdaptiveThreshold
+        
+        detector = AdaptiveThreshold(k=3.0, window=30.0, min_gap=1.0)
+        changes = [
+            (timestamp, score) for timestamp, score in scores
+            if detector.update(timestamp, score)
+        ]
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+
+class AdaptiveThreshold:
+    """Streaming detector of scores that stand out from the local baseline.
+    
+    Attributes:
+        k: Number of standard deviations above the rolling mean a score must
+            exceed.
+        window: Length in seconds of the rolling window of past scores.
+        min_gap: Minimum time in seconds between two detections.
+        min_score: Scores at or below this never count as changes, however
+            flat the baseline (e.g. compression noise on a static screen).
+        warmup: Number of scores needed in the window before the rolling
+            statistics are trusted; until then ``fallback`` is used.
+        fallback: Fixed threshold used during warm-up.
+    """
+    
+    def __init__(
+        self,
+        k: float = 3.0,
+        window: float = 30.0,
+        min_gap: float = 1.0,
+        min_score: float = 0.02,
+        warmup: int = 10,
+        fallback: float = 0.3
+    ) -> None:
+        """Initialize the detector.
+        
+        Args:
+            k: Standard deviations above the rolling mean. Defaults to 3.0.
+            window: Rolling window length in seconds. Defaults to 30.0.
+            min_gap: Minimum seconds between detections. Defaults to 1.0.
+            min_score: Absolute floor of the threshold. Defaults to 0.02.
+            warmup: Scores needed before the rolling statistics are used.
+                Defaults to 10.
+            fallback: Threshold used during warm-up. Defaults to 0.3.
+        
+        Raises:
+            ValueError: If k is negative or window is not positive.
+        """
+        if k < 0:
+            raise ValueError(f"k must not be negative, got {k}")
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        
+        self.k = k
+        self.window = window
+        self.min_gap = min_gap
+        self.min_score = min_score
+        self.warmup = warmup
+        self.fallback = fallback
+        
+        self._scores: Deque[Tuple[float, float]] = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._last_detection: Optional[float] = None
+    
+    @property
+    def threshold(self) -> float:
+        """The threshold the next score is compared against."""
+        n = len(self._scores)
+        if n == 0 or n < self.warmup:
+            return self.fallback
+        mean = self._sum / n
+        variance = max(self._sum_sq / n - mean * mean, 0.0)
+        return max(mean + self.k * math.sqrt(variance), self.min_score)
+    
+    def update(self, timestamp: float, score: float) -> bool:
+        """Offer the next score, in time order.
+        
+        Args:
+            timestamp: Time of the score in seconds.
+            score: Scene change score.
+        
+        Returns:
+            True if the score is a scene change.
+        """
+        # Forget scores that left the window
+        while self._scores and self._scores[0][0] < timestamp - self.window:
+            _, old = self._scores.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+        
+        threshold = self.threshold
+        is_change = score > threshold and (
+            self._last_detection is None
+            or timestamp - self._last_detection >= self.min_gap
+        )
+        if is_change:
+            self._last_detection = timestamp
+        
+        self._scores.append((timestamp, score))
+        self._sum += score
+        self._sum_sq += score * score
+        return is_change
+    
+    def state(self) -> Dict:
+        """Return the detector's state, e.g. to checkpoint a scan.
+        
+        Returns:
+            JSON-serializable dictionary of the scores in the window and the
+            time of the last detection. Its size is bounded by the window.
+        """
+        return {
+            "scores": [list(entry) for entry in self._scores],
+            "last_detection": self._last_detection,
+        }
+    
+    def load_state(self, state: Dict) -> None:
+        """Continue from a state returned by :meth:`state`.
+        
+        Args:
+            state: Detector state of a detector with the same settings.
+        """
+        self._scores = deque((timestamp, score) for timestamp, score in state["scores"])
+        self._sum = sum(score for _, score in self._scores)
+        self._sum_sq = sum(score * score for _, score in self._scores)
+        self._last_detection = state["last_detection"]
+    
+    def filter(self, changes: Sequence[Tuple]) -> List[Tuple]:
+        """Keep the scored candidates that the detector flags.
+        
+        Args:
+            changes: Every scored sample as (timestamp, reason, score, ...)
+                tuples, sorted by timestamp.
+        
+        Returns:
+            The flagged tuples, in order.
+        """
+        return [change for change in changes if self.update(change[0], change[2])]
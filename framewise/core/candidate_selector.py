@@ -0,0 +1,136 @@
+"""Streaming top-k selection of frame candidates with temporal coverage.
+
+When a scan finds more candidates than the frame budget, keeping the
+strongest ones by score alone can spend the whole budget on one busy part
+of the video. :class:`CandidateSelector` splits the video into time windows
+and guarantees each window its best candidates (a quota), then fills the
+rest of the budget with the strongest remaining candidates.
+
+Selection is streaming: candidates are added one at a time and only
+O(budget) of them are held, in heaps, so the candidate frames captured by a
+single-pass scan never exceed the budget, however long the video.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.candidate_selector import CandidateSelector
+        
+        selector = CandidateSelector(budget=20, duration=600.0, window=30.0)
+        for timestamp, reason, score in candidates:
+            selector.add(timestamp, score, (timestamp, reason, score))
+        selected = selector.selected()  # at most 20, sorted by time
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+# Heap entry: (score, -sequence, timestamp, item). Equal scores rank earlier
+# candidates higher, so later ones are evicted first.
+_Entry = Tuple[float, int, float, Any]
+
+
+class CandidateSelector:
+    """Keep the best ``budget`` candidates while covering every time window.
+    
+    The selection is the top ``quota`` candidates of every time window,
+    plus the highest-scoring other candidates up to ``budget``. Windows are
+    widened when needed so that ``windows * quota`` never exceeds the
+    budget.
+    
+    Attributes:
+        budget: Maximum number of candidates selected.
+        quota: Number of candidates guaranteed to each window.
+        window: Window length in seconds, or None for plain top-k.
+        n_windows: Number of time windows.
+    """
+    
+    def __init__(
+        self,
+        budget: int,
+        duration: float = 0.0,
+        window: Optional[float] = None,
+        quota: int = 1
+    ) -> None:
+        """Initialize the selector.
+        
+        Args:
+            budget: Maximum number of candidates to select.
+            duration: Video duration in seconds. Coverage is disabled when
+                it is not positive. Defaults to 0.0.
+            window: Window length in seconds. None selects by score only.
+                Defaults to None.
+            quota: Candidates guaranteed per window. Defaults to 1.
+        
+        Raises:
+            ValueError: If budget or quota is not positive.
+        """
+        if budget < 1:
+            raise ValueError(f"budget must be at least 1, got {budget}")
+        if quota < 1:
+            raise ValueError(f"quota must be at least 1, got {quota}")
+        
+        self.budget = budget
+        self.quota = quota
+        self.window = window if window and duration > 0 else None
+        self.n_windows = 0
+        if self.window is not None:
+            max_windows = max(1, budget // quota)
+            self.n_windows = min(max(1, math.ceil(duration / self.window)), max_windows)
+            self.window = duration / self.n_windows
+        
+        self._sequence = count()
+        self._top: List[_Entry] = []
+        self._per_window: Dict[int, List[_Entry]] = {}
+        self._seen = 0
+    
+    def __len__(self) -> int:
+        """Number of candidates added so far."""
+        return self._seen
+    
+    def add(self, timestamp: float, score: float, item: Any) -> None:
+        """Offer a candidate.
+        
+        Args:
+            timestamp: Candidate time in seconds.
+            score: Candidate score; higher is better.
+            item: Object returned by :meth:`selected` if chosen.
+        """
+        self._seen += 1
+        entry = (score, -next(self._sequence), timestamp, item)
+        _push_bounded(self._top, entry, self.budget)
+        if self.window is not None:
+            window_idx = min(int(timestamp / self.window), self.n_windows - 1)
+            _push_bounded(self._per_window.setdefault(window_idx, []), entry, self.quota)
+    
+    def selected(self) -> List[Any]:
+        """Return the selected items, sorted by timestamp.
+        
+        Returns:
+            At most ``budget`` items: every window's quota first, then the
+            highest-scoring remaining candidates.
+        """
+        chosen: Dict[int, _Entry] = {}
+        for heap in self._per_window.values():
+            for entry in heap:
+                chosen[entry[1]] = entry
+        
+        # The global top-k always contains the best candidates not chosen
+        # by a window quota
+        for entry in sorted(self._top, reverse=True):
+            if len(chosen) >= self.budget:
+                break
+            chosen.setdefault(entry[1], entry)
+        
+        return [entry[3] for entry in sorted(chosen.values(), key=lambda e: (e[2], -e[1]))]
+
+
+def _push_bounded(heap: List[_Entry], entry: _Entry, size: int) -> None:
+    """Push onto a min-heap holding the ``size`` largest entries."""
+    if len(heap) < size:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
@@ -0,0 +1,254 @@
+"""Content-addressed cache of frame extraction results.
+
+Re-running extraction on an unchanged video with unchanged settings decodes
+the whole video again only to produce the same frames. The cache stores each
+extraction's frame images and metadata under a key derived from the video's
+content fingerprint and the extraction settings, so a repeat run only has to
+link the stored images into the output directory.
+
+Fingerprinting does not read the whole video: it hashes the file size,
+modification time and a few evenly spaced blocks of content.
+
+Cache layout::
+    
+    cache_dir/
+        <key>/
+            metadata.json
+            frame_0000_t0001.0s.jpg
+            ...
+
+Images are hard-linked between the output directory and the cache when both
+are on the same filesystem, so a cache entry usually costs no extra disk
+space. Entries are evicted least recently used first once the cache exceeds
+its size budget.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.extraction_cache import ExtractionCache
+        
+        cache = ExtractionCache(".framewise_cache", max_bytes=10 * 2**30)
+        key = cache.key("video.mp4", {"strategy": "scene"})
+        metadata = cache.get(key, Path("frames"))
+        if metadata is None:
+            ...  # extract into "frames", then
+            cache.put(key, Path("frames"))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+from loguru import logger
+
+# Number and size of the content blocks hashed by video_fingerprint
+FINGERPRINT_BLOCKS = 8
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def video_fingerprint(
+    video_path: Union[str, Path],
+    n_blocks: int = FINGERPRINT_BLOCKS,
+    block_size: int = FINGERPRINT_BLOCK_SIZE
+) -> str:
+    """Compute a cheap content fingerprint of a video file.
+    
+    Hashes the file size, modification time and ``n_blocks`` blocks read at
+    evenly spaced offsets (always including the start and end of the file),
+    so fingerprinting costs a few small reads regardless of video length.
+    
+    Args:
+        video_path: Path to the video file.
+        n_blocks: Number of blocks to sample. Defaults to 8.
+        block_size: Size of each sampled block in bytes. Defaults to 64 KiB.
+    
+    Returns:
+        Hex digest identifying the file's content.
+    
+    Raises:
+        FileNotFoundError: If the video file doesn't exist.
+    """
+    video_path = Path(video_path)
+    stat = video_path.stat()
+    digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    
+    last_offset = max(0, stat.st_size - block_size)
+    offsets = sorted({
+        last_offset * i // max(1, n_blocks - 1) for i in range(n_blocks)
+    })
+    with open(video_path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(block_size))
+    
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """On-disk cache of extraction results keyed by video content and settings.
+    
+    Attributes:
+        cache_dir: Directory holding one subdirectory per cached extraction.
+        max_bytes: Size budget for the cache in bytes, or None for no limit.
+            Hard-linked images count at their full size.
+    """
+    
+    METADATA_FILE = "metadata.json"
+    
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_bytes: Optional[int] = None
+    ) -> None:
+        """Initialize the cache.
+        
+        Args:
+            cache_dir: Directory for cache entries. Created if missing.
+            max_bytes: Evict least recently used entries once the cache
+                grows beyond this many bytes. None disables eviction.
+                Defaults to None.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def key(self, video_path: Union[str, Path], settings: Dict) -> str:
+        """Build the cache key for a video and extraction settings.
+        
+        Args:
+            video_path: Path to the video file.
+            settings: JSON-serializable settings that affect the result.
+        
+        Returns:
+            Hex digest combining the video fingerprint and the settings.
+        """
+        payload = json.dumps(
+            {"video": video_fingerprint(video_path), "settings": settings},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get(self, key: str, output_dir: Path) -> Optional[Dict]:
+        """Restore a cached extraction into ``output_dir``.
+        
+        Links (or copies) the cached images into ``output_dir`` and writes
+        its metadata.json with paths pointing there.
+        
+        Args:
+            key: Cache key from :meth:`key`.
+            output_dir: Directory to restore the frames into.
+        
+        Returns:
+            The restored metadata dictionary, or None on a cache miss.
+        """
+        entry = self.cache_dir / key
+        metadata_path = entry / self.METADATA_FILE
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for frame in metadata["frames"]:
+                if frame["path"] is None:
+                    continue
+                source = entry / frame["path"]
+                target = output_dir / frame["path"]
+                if not (target.exists() and target.samefile(source)):
+                    target.unlink(missing_ok=True)
+                    _link_or_copy(source, target)
+                frame["path"] = str(target)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+        
+        # Mark as recently used for eviction
+        os.utime(metadata_path)
+        
+        with open(output_dir / self.METADATA_FILE, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        
+        logger.info(f"Restored {len(metadata['frames'])} frames from cache")
+        return metadata
+    
+    def put(self, key: str, output_dir: Path) -> None:
+        """Store the extraction in ``output_dir`` under ``key``.
+        
+        Args:
+            key: Cache key from :meth:`key`.
+            output_dir: Directory holding the extraction's metadata.json
+                and frame images.
+        """
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+        
+        with open(output_dir / self.METADATA_FILE, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir))
+        try:
+            for frame in metadata["frames"]:
+                if frame["path"] is None:
+                    continue
+                source = Path(frame["path"])
+                # Frames in a shard share one file
+                if not (staging / source.name).exists():
+                    _link_or_copy(source, staging / source.name)
+                frame["path"] = source.name
+            
+            with open(staging / self.METADATA_FILE, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            
+            # Publish atomically; another process may have stored it first
+            os.rename(staging, entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache extraction {key}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        
+        logger.debug(f"Cached extraction as {key}")
+        self.evict()
+    
+    def evict(self) -> int:
+        """Remove least recently used entries until within ``max_bytes``.
+        
+        Returns:
+            Number of entries removed.
+        """
+        if self.max_bytes is None:
+            return 0
+        
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            metadata_path = entry / self.METADATA_FILE
+            if not metadata_path.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((metadata_path.stat().st_mtime, size, entry))
+            total += size
+        
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        
+        if removed:
+            logger.debug(f"Evicted {removed} cache entries")
+        return removed
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link ``source`` to ``target``, copying across filesystems."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
@@ -0,0 +1,199 @@
+"""Append-only checkpoints that let an interrupted extraction resume.
+
+metadata.json is only written once a video is finished, so a killed
+extraction of a multi-hour recording would otherwise start over from the
+first frame. With checkpointing, the extractor appends its progress to
+``extraction.checkpoint.jsonl`` in the output directory as it goes:
+
+- one ``segment`` record per finished stretch of the scene scan, holding
+  the stretch's frame range and the changes found in it;
+- one ``frame`` record per frame image written, holding the frame's
+  metadata and perceptual hash.
+
+A restarted extraction skips the scan segments already recorded and reuses
+recorded frames whose image file still exists, so it picks up roughly
+where the previous run stopped. Every record is flushed and synced on
+write, and a record cut short by the crash is dropped on load. The file
+starts with a ``header`` record holding a key derived from the video and
+the extraction settings; a checkpoint left by a different video or
+different settings is discarded. The file is deleted once metadata.json
+has been written.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.extraction_checkpoint import ExtractionCheckpoint
+        
+        checkpoint = ExtractionCheckpoint(output_dir, key)
+        if (start, end) not in checkpoint.segments:
+            checkpoint.add_segment(start, end, scan(start, end))
+        ...
+        checkpoint.clear()
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from loguru import logger
+
+CHECKPOINT_NAME = "extraction.checkpoint.jsonl"
+
+
+class ExtractionCheckpoint:
+    """Progress log of one video's extraction in its output directory.
+    
+    Attributes:
+        path: Path of the checkpoint file.
+        key: Identity of the video and settings the checkpoint belongs to.
+        segments: Finished scan segments, mapping (start_frame, end_frame)
+            to the (timestamp, reason, score) changes found in them.
+            ``end_frame`` is None for a segment that ran to the end of the
+            video.
+        states: Scan state recorded at the end of a segment, such as the
+            adaptive threshold's rolling window, by (start_frame, end_frame).
+        frames: Metadata records of written frames, by frame_id, as
+            ``{"frame": ExtractedFrame.to_dict(), "hash": bits or None}``.
+    """
+    
+    def __init__(self, output_dir: Union[str, Path], key: str) -> None:
+        """Open the checkpoint of an output directory, resuming if it matches.
+        
+        Args:
+            output_dir: The extraction's output directory.
+            key: Identity of the video and settings, e.g. a hash of both.
+        """
+        self.path = Path(output_dir) / CHECKPOINT_NAME
+        self.key = key
+        self.segments: Dict[Tuple[int, Optional[int]], List[Tuple[float, str, float]]] = {}
+        self.states: Dict[Tuple[int, Optional[int]], Dict] = {}
+        self.frames: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        
+        if self._load():
+            logger.info(
+                f"Resuming from checkpoint: {len(self.segments)} scan segments, "
+                f"{len(self.frames)} frames"
+            )
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._append({"type": "header", "key": key})
+    
+    def _load(self) -> bool:
+        """Read an existing checkpoint for the same key.
+        
+        Returns:
+            True if the checkpoint exists and belongs to this key.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return False
+        
+        valid_bytes = 0
+        for n, line in enumerate(lines):
+            try:
+                record = json.loads(line) if line.endswith("\n") else None
+            except ValueError:
+                record = None
+            if record is None:
+                # Cut short by the interruption; later appends replace it
+                break
+            if n == 0 and (record.get("type") != "header" or record.get("key") != self.key):
+                logger.info("Discarding checkpoint of a different video or settings")
+                return False
+            if record["type"] == "segment":
+                change_list = [tuple(change) for change in record["changes"]]
+                self.segments[(record["start"], record["end"])] = change_list
+                if record.get("state") is not None:
+                    self.states[(record["start"], record["end"])] = record["state"]
+            elif record["type"] == "frame":
+                self.frames[record["frame"]["frame_id"]] = record
+            valid_bytes += len(line.encode("utf-8"))
+        
+        if valid_bytes == 0:
+            return False
+        os.truncate(self.path, valid_bytes)
+        return True
+    
+    def _append(self, record: Dict) -> None:
+        """Append one record and make sure it reaches the disk."""
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def add_segment(
+        self,
+        start_frame: int,
+        end_frame: Optional[int],
+        changes: List[Tuple[float, str, float]],
+        state: Optional[Dict] = None
+    ) -> None:
+        """Record a finished scan segment.
+        
+        Args:
+            start_frame: First frame of the segment.
+            end_frame: Frame at which the segment ends (exclusive), or None
+                for the end of the video.
+            changes: Changes found in the segment.
+            state: JSON-serializable scan state to continue the next
+                segment from. Defaults to None.
+        """
+        self.segments[(start_frame, end_frame)] = list(changes)
+        if state is not None:
+            self.states[(start_frame, end_frame)] = state
+        self._append({
+            "type": "segment",
+            "start": start_frame,
+            "end": end_frame,
+            "changes": [list(change) for change in changes],
+            "state": state,
+        })
+    
+    def add_frame(self, frame_data: Dict, frame_hash: Optional[List[int]] = None) -> None:
+        """Record a written frame.
+        
+        Args:
+            frame_data: The frame's :meth:`ExtractedFrame.to_dict` form.
+            frame_hash: The bits of the frame's perceptual hash, if
+                deduplication computed one. Defaults to None.
+        """
+        record = {"type": "frame", "frame": frame_data, "hash": frame_hash}
+        self.frames[frame_data["frame_id"]] = record
+        self._append(record)
+    
+    def add_frame_when_written(
+        self,
+        future: Future,
+        frame_data: Dict,
+        frame_hash: Optional[List[int]] = None
+    ) -> None:
+        """Record a frame once its image write succeeds.
+        
+        Args:
+            future: The frame's write future.
+            frame_data: The frame's :meth:`ExtractedFrame.to_dict` form.
+            frame_hash: The bits of the frame's perceptual hash, if any.
+        """
+        def on_done(done: Future) -> None:
+            if done.exception() is None:
+                self.add_frame(frame_data, frame_hash)
+        
+        future.add_done_callback(on_done)
+    
+    def close(self) -> None:
+        """Close the checkpoint file, keeping it for a later resume."""
+        with self._lock:
+            self._file.close()
+    
+    def clear(self) -> None:
+        """Close and delete the checkpoint once the extraction is complete."""
+        self.close()
+        self.path.unlink(missing_ok=True)
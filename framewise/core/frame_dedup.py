@@ -0,0 +1,107 @@
+"""Near-duplicate frame detection with perceptual hashes.
+
+Tutorials often return to the same screen, so frame extraction can keep
+many visually identical frames. This module hashes frames with a 64-bit
+DCT perceptual hash and keeps an index of the frames already kept, so a
+new frame within a small Hamming radius of any of them can be dropped
+before it is written, embedded and stored.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.frame_dedup import NearDuplicateIndex
+        
+        index = NearDuplicateIndex(radius=6)
+        for frame_id, frame in frames:
+            match = index.find(frame)
+            if match is None:
+                index.add(frame, frame_id)
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+import numpy as np
+
+from framewise.core.scene_scorers import PHashScorer
+
+
+_PHASH = PHashScorer()
+
+
+def perceptual_hash(frame: np.ndarray) -> np.ndarray:
+    """Compute the 64-bit perceptual hash of a frame.
+    
+    Args:
+        frame: Frame as numpy array (BGR or grayscale).
+    
+    Returns:
+        Boolean array of 64 hash bits.
+    """
+    return _PHASH.hashes(_PHASH.prepare(frame)[np.newaxis])[0]
+
+
+class NearDuplicateIndex:
+    """Index of kept frames' perceptual hashes.
+    
+    Lookups compare a hash against every kept hash in one vectorized
+    operation, which is cheap at the per-video scale of kept frames.
+    
+    Attributes:
+        radius: Maximum Hamming distance (out of 64 bits) at which two
+            frames are considered duplicates.
+    """
+    
+    def __init__(self, radius: int) -> None:
+        """Initialize an empty index.
+        
+        Args:
+            radius: Maximum Hamming distance for a duplicate match.
+        """
+        self.radius = radius
+        self._hashes = np.empty((0, 64), dtype=bool)
+        self._keys: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def find(self, frame: np.ndarray) -> Optional[Tuple[str, int]]:
+        """Find the closest kept frame within the radius.
+        
+        Args:
+            frame: Frame as numpy array (BGR or grayscale).
+        
+        Returns:
+            Tuple of (key, distance) for the closest kept frame, or None if
+            no kept frame is within ``radius``.
+        """
+        return self.find_hash(perceptual_hash(frame))
+    
+    def find_hash(self, bits: np.ndarray) -> Optional[Tuple[str, int]]:
+        """Like :meth:`find`, for a precomputed hash."""
+        if not self._keys:
+            return None
+        distances = np.count_nonzero(self._hashes != bits, axis=1)
+        best = int(np.argmin(distances))
+        if distances[best] > self.radius:
+            return None
+        return self._keys[best], int(distances[best])
+    
+    def add(self, frame: np.ndarray, key: str) -> np.ndarray:
+        """Add a kept frame to the index.
+        
+        Args:
+            frame: Frame as numpy array (BGR or grayscale).
+            key: Identifier returned by later matches (e.g. the frame ID).
+        
+        Returns:
+            The frame's hash bits.
+        """
+        bits = perceptual_hash(frame)
+        self.add_hash(bits, key)
+        return bits
+    
+    def add_hash(self, bits: np.ndarray, key: str) -> None:
+        """Like :meth:`add`, for a precomputed hash."""
+        self._hashes = np.vstack([self._hashes, bits[np.newaxis]])
+        self._keys.append(key)
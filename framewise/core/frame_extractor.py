@@ -22,16 +22,47 @@ Example:
 
 from __future__ import annotations
 
+import bisect
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple, Union
-from dataclasses import dataclass
+from typing import Deque, Iterator, List, Optional, Dict, Tuple, Union
+from dataclasses import dataclass, field
+import hashlib
 import json
+import math
 import cv2
 import numpy as np
 from PIL import Image
 from loguru import logger
 
 from framewise.core.transcript_extractor import Transcript, TranscriptSegment
+from framewise.core.video_decoder import (
+    DECODERS,
+    FFmpegSceneReader,
+    KeyframeSceneReader,
+    OpenCVSceneReader,
+    to_scene_frame,
+)
+from framewise.core.scene_scorers import SceneScorer, get_scorer
+from framewise.core.frame_dedup import NearDuplicateIndex, perceptual_hash
+from framewise.core.frame_fetcher import FetchStats, FrameFetcher
+from framewise.core.frame_writer import FrameWriter, check_writer_options
+from framewise.core.frame_shard import (
+    SHARD_NAME,
+    ShardLocation,
+    ShardWriter,
+    format_shard_ref,
+    read_shard_frame,
+)
+from framewise.core.extraction_cache import ExtractionCache, video_fingerprint
+from framewise.core.extraction_checkpoint import ExtractionCheckpoint
+from framewise.core.keyword_matcher import KeywordMatcher
+from framewise.core.candidate_selector import CandidateSelector
+from framewise.core.frame_quality import FrameQualityAssessor, sharpness_score
+from framewise.core.adaptive_threshold import AdaptiveThreshold
+from framewise.core.video_probe import PROBE_METHODS, VideoInfo, capture_info, probe_video
+from framewise.core.static_skip import StaticSegmentScanner
 
 
 @dataclass
@@ -43,13 +74,24 @@ class ExtractedFrame:
     
     Attributes:
         frame_id: Unique identifier for this frame (e.g., "frame_0001").
-        path: Path to the saved frame image file.
+        path: Path to the saved frame image file (or to the shard holding
+            it), or None if the frame was not written to disk.
         timestamp: Time in seconds when this frame appears in the video.
         transcript_segment: Associated transcript segment, if available.
         extraction_reason: Why this frame was extracted (e.g., "scene_change",
             "keyword:click").
         scene_change_score: Score indicating magnitude of scene change (0-1).
         quality_score: Quality assessment score (0-1, higher is better).
+        change_box: Region that changed from the previous analysed frame,
+            as (x, y, width, height) fractions of the frame size, if the
+            scorer localizes changes (the 'tiles' scorer). Multiply by the
+            image width and height for pixels.
+        offset: Byte offset of the encoded image inside the shard at
+            ``path``, or None for a standalone image file.
+        length: Byte length of the encoded image inside the shard, or None
+            for a standalone image file.
+        image: Decoded frame pixels (BGR), if the extractor kept them in
+            memory. Not included in :meth:`to_dict`.
     
     Example:
         >>> frame = ExtractedFrame(
@@ -64,18 +106,58 @@ class ExtractedFrame:
     """
     
     frame_id: str
-    path: Path
+    path: Optional[Path]
     timestamp: float
     transcript_segment: Optional[TranscriptSegment] = None
     extraction_reason: str = "unknown"
     scene_change_score: float = 0.0
     quality_score: float = 1.0
+    change_box: Optional[Tuple[float, float, float, float]] = None
+    offset: Optional[int] = None
+    length: Optional[int] = None
+    image: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def location(self) -> Optional[str]:
+        """Where the saved image is, as one string.
+        
+        The image path for standalone files, ``<shard>#<offset>:<length>``
+        (see :mod:`framewise.core.frame_shard`) for frames in a shard, or
+        None if the frame was not saved.
+        """
+        if self.path is None:
+            return None
+        if self.offset is None:
+            return str(self.path)
+        return format_shard_ref(self.path, self.offset, self.length)
+    
+    def load_image(self) -> np.ndarray:
+        """Return the frame pixels, reading the saved image if not in memory.
+        
+        Returns:
+            Frame as numpy array (BGR format).
+        
+        Raises:
+            FileNotFoundError: If the frame has neither pixels in memory nor
+                a readable image file or shard.
+            ValueError: If the frame's shard holds no image at its offset.
+        """
+        if self.image is not None:
+            return self.image
+        if self.path is not None and self.offset is not None:
+            return read_shard_frame(self.path, self.offset, self.length)
+        image = cv2.imread(str(self.path)) if self.path is not None else None
+        if image is None:
+            raise FileNotFoundError(f"Frame image not found: {self.path}")
+        return image
     
     def to_dict(self) -> Dict[str, Union[str, float, Dict, None]]:
         """Convert frame to dictionary format.
         
         Returns:
-            Dictionary containing all frame metadata.
+            Dictionary containing all frame metadata. Frames stored in a
+            shard also have 'offset' and 'length' entries, and frames with
+            a localized change a 'change_box' entry.
             
         Example:
             >>> frame.to_dict()
@@ -87,15 +169,76 @@ class ExtractedFrame:
                 'quality_score': 0.85
             }
         """
-        return {
+        data = {
             "frame_id": self.frame_id,
-            "path": str(self.path),
+            "path": str(self.path) if self.path is not None else None,
             "timestamp": self.timestamp,
             "transcript_segment": self.transcript_segment.to_dict() if self.transcript_segment else None,
             "extraction_reason": self.extraction_reason,
             "scene_change_score": self.scene_change_score,
             "quality_score": self.quality_score,
         }
+        if self.change_box is not None:
+            data["change_box"] = list(self.change_box)
+        if self.offset is not None:
+            data["offset"] = self.offset
+            data["length"] = self.length
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> ExtractedFrame:
+        """Reconstruct a frame from its :meth:`to_dict` form.
+        
+        Args:
+            data: Dictionary as produced by :meth:`to_dict` (e.g. one entry
+                of metadata.json).
+        
+        Returns:
+            Reconstructed ExtractedFrame, without in-memory pixels.
+        """
+        segment = data.get("transcript_segment")
+        change_box = data.get("change_box")
+        return cls(
+            frame_id=data["frame_id"],
+            path=Path(data["path"]) if data["path"] is not None else None,
+            timestamp=data["timestamp"],
+            transcript_segment=TranscriptSegment(**segment) if segment else None,
+            extraction_reason=data["extraction_reason"],
+            scene_change_score=data["scene_change_score"],
+            quality_score=data["quality_score"],
+            change_box=tuple(change_box) if change_box is not None else None,
+            offset=data.get("offset"),
+            length=data.get("length"),
+        )
+
+
+@dataclass
+class BatchExtractionResult:
+    """Outcome of extracting frames from one video in a batch.
+    
+    Attributes:
+        index: Position of the video in the batch input.
+        video_path: Path to the source video.
+        output_dir: Directory the video's frames were written to.
+        frames: Extracted frames, empty if extraction failed.
+        error: Error message if extraction failed, None on success.
+    
+    Example:
+        >>> for result in extractor.extract_batch(videos, output_root="frames"):
+        ...     if not result.ok:
+        ...         print(f"{result.video_path}: {result.error}")
+    """
+    
+    index: int
+    video_path: Path
+    output_dir: Path
+    frames: List[ExtractedFrame]
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        """Whether extraction succeeded."""
+        return self.error is None
 
 
 class FrameExtractor:
@@ -105,6 +248,7 @@ class FrameExtractor:
     from tutorial videos:
     
     - **Scene Detection**: Identifies visual transitions and changes
+    - **Keyframes**: Scene detection on encoder keyframes only, for fast scans
     - **Transcript Alignment**: Extracts frames when action keywords are mentioned
     - **Hybrid**: Combines both approaches for optimal coverage
     
@@ -148,23 +292,65 @@ class FrameExtractor:
         "button", "menu", "icon", "tab", "window", "dialog", "popup"
     ]
     
+    # Number of frames scored per vectorized scorer call
+    SCENE_BATCH_SIZE = 64
+    
     def __init__(
         self,
         strategy: str = "hybrid",
         max_frames_per_video: int = 20,
         scene_threshold: float = 0.3,
         quality_threshold: float = 0.5,
+        analysis_fps: Optional[float] = None,
+        single_pass: bool = False,
+        workers: int = 1,
+        decoder: str = "opencv",
+        keyframe_prepass: bool = False,
+        refine_boundaries: bool = False,
+        scorer: Union[str, SceneScorer] = "diff",
+        duplicate_hash_radius: Optional[int] = None,
+        seek_cost_frames: int = 60,
+        image_format: str = "jpg",
+        image_quality: Optional[int] = None,
+        save_max_size: Optional[int] = None,
+        writer_threads: int = 2,
+        writer_queue_size: int = 8,
+        save_images: bool = True,
+        keep_images: bool = False,
+        cache_dir: Optional[Union[str, Path]] = None,
+        cache_max_bytes: Optional[int] = None,
+        action_keywords: Optional[List[str]] = None,
+        coverage_window: Optional[float] = 30.0,
+        quality_mode: str = "full",
+        quality_gain: Optional[float] = None,
+        threshold_mode: str = "fixed",
+        adaptive_k: float = 3.0,
+        adaptive_window: float = 30.0,
+        min_scene_gap: float = 1.0,
+        frame_storage: str = "files",
+        probe: str = "opencv",
+        probe_cache_dir: Optional[Union[str, Path]] = None,
+        collapse_static: bool = False,
+        static_threshold: float = 0.005,
+        static_after: int = 3,
+        max_static_skip: float = 5.0,
+        resumable: bool = False,
+        checkpoint_interval: float = 300.0,
     ) -> None:
         """Initialize the frame extractor.
         
         Args:
             strategy: Extraction strategy to use. Options:
                 - 'scene': Extract frames at scene changes only
+                - 'keyframes': Extract frames at changed keyframes (I-frames)
+                  only; a fast scan for slide-style recordings. Requires ffmpeg
                 - 'transcript': Extract frames when action keywords are mentioned
                 - 'hybrid': Combine both strategies (recommended)
                 Defaults to 'hybrid'.
             max_frames_per_video: Maximum number of frames to extract from each
-                video. If more candidates are found, they will be evenly sampled.
+                video. If more candidates are found, the best candidate of
+                each ``coverage_window`` is kept and the rest of the budget
+                goes to the highest-scoring remaining candidates.
                 Defaults to 20.
             scene_threshold: Threshold for scene change detection (0-1).
                 Higher values = only major scene changes. Lower values = more
@@ -172,9 +358,186 @@ class FrameExtractor:
             quality_threshold: Minimum quality score for frames (0-1).
                 Frames below this threshold will be filtered out. Higher values
                 = stricter quality requirements. Defaults to 0.5.
+            analysis_fps: Rate (frames per second) at which frames are decoded
+                and compared during scene detection. Frames in between are
+                skipped with ``grab()`` without being decoded. Timestamps are
+                still reported in real video time. None scans every frame.
+                Defaults to None.
+            single_pass: Capture candidate frames while scanning instead of
+                seeking back to each candidate afterwards, so the video is
+                decoded only once. Defaults to False.
+            workers: Number of processes used for scene detection. Values
+                above 1 split the video into that many time ranges scanned in
+                parallel. Not used by the single-pass scan, which is
+                sequential by design. Defaults to 1.
+            decoder: Backend that decodes frames for scene detection:
+                - 'opencv': Decode with OpenCV and downscale in Python
+                - 'ffmpeg': Let ffmpeg scale to grayscale 320x240 and read
+                  raw frames from a pipe (requires the ffmpeg binary)
+                Candidate frames are always read with OpenCV. Defaults to
+                'opencv'.
+            keyframe_prepass: Compare keyframes first and scan frame by frame
+                only between keyframes that differ. Requires ffmpeg.
+                Defaults to False.
+            refine_boundaries: Bisect each change found by the sampled
+                ``analysis_fps`` scan down to the exact boundary frame, giving
+                frame-accurate timestamps while decoding only a few extra
+                frames per change. Defaults to False.
+            scorer: Scene-change scorer, by name or as a
+                :class:`~framewise.core.scene_scorers.SceneScorer` instance:
+                - 'diff': Mean absolute grayscale difference (default)
+                - 'histogram': Hue/saturation histogram distance (needs
+                  colour frames, so not usable with ffmpeg or keyframe scans)
+                - 'phash': Perceptual-hash Hamming distance
+                - 'tiles': Most changed tile of a grid, so changes confined
+                  to a small region (a dropdown, a dialog) still score high.
+                  Scene-change frames record the changed region as
+                  ``change_box``, except those found by keyframe scans
+                Scores are 0-1 for all scorers, but scene_threshold usually
+                needs tuning per scorer. Defaults to 'diff'.
+            duplicate_hash_radius: Drop frames whose 64-bit perceptual hash
+                is within this Hamming distance of a frame already kept, and
+                list them under "duplicates" in metadata.json. Around 4-8
+                catches re-visited screens. None disables deduplication.
+                Defaults to None.
+            seek_cost_frames: Estimated cost of a seek, in decoded frames.
+                When fetching candidate frames, gaps up to this many frames
+                are read through with ``grab()`` instead of seeking. About
+                the keyframe interval of the videos works well. Defaults to 60.
+            image_format: Format of saved frames: 'jpg', 'webp' or 'png'.
+                Defaults to 'jpg'.
+            image_quality: JPEG/WebP quality (0-100) or PNG compression
+                level (0-9). Defaults to the format's default (95 for JPEG).
+            save_max_size: Downscale saved frames so their longest side is
+                at most this many pixels. Analysis always uses the full
+                frame. None saves at the original resolution. Defaults to None.
+            writer_threads: Number of threads encoding and writing frames in
+                the background while decoding continues. 0 writes inline.
+                Defaults to 2.
+            writer_queue_size: Maximum number of frames waiting to be
+                written; decoding pauses while the queue is full.
+                Defaults to 8.
+            save_images: Write frame images to ``output_dir``. When False,
+                frames have no path and must be kept in memory.
+                Defaults to True.
+            keep_images: Attach the decoded pixels to each ExtractedFrame as
+                ``image``, so consumers such as
+                :meth:`~framewise.embeddings.embedder.FrameWiseEmbedder.embed_frames_batch`
+                skip reading them back from disk. Frames are then yielded
+                without waiting for their image to be written; a frame whose
+                write fails has its path reset to None. Uses about
+                width * height * 3 bytes per frame. Defaults to False.
+            cache_dir: Directory of a content-addressed extraction cache.
+                When set, re-extracting an unchanged video with the same
+                settings (and transcript) restores the cached frames into
+                ``output_dir`` instead of decoding the video. Frames
+                restored from the cache carry no in-memory pixels. Requires
+                save_images. None disables caching. Defaults to None.
+            cache_max_bytes: Size budget of the cache in bytes; least
+                recently used entries are evicted beyond it. None means
+                unlimited. Defaults to None.
+            action_keywords: Keywords and phrases that mark important
+                transcript moments, matched case-insensitively as whole
+                words. Earlier keywords win when a segment has several.
+                Thousands of keywords are fine; the list is compiled into a
+                single matcher. Defaults to ACTION_KEYWORDS.
+            coverage_window: Length in seconds of the time windows that are
+                each guaranteed a frame when candidates exceed
+                max_frames_per_video. Windows are widened on long videos so
+                there are at most max_frames_per_video of them. None selects
+                by score only. Defaults to 30.0.
+            quality_mode: How frame sharpness is measured. 'full' computes
+                the Laplacian variance of the full-resolution frame. 'fast'
+                computes it on the 320x240 grayscale analysis frame (also
+                reused for duplicate hashing), calibrated against the full
+                metric on the first frames of each video; much cheaper on
+                high-resolution video, but blind to blur of a few source
+                pixels. Defaults to 'full'.
+            quality_gain: Fixed multiplier from fast to full Laplacian
+                variance, skipping the per-video calibration of 'fast'
+                mode. Defaults to None.
+            threshold_mode: How scene changes are told apart from noise:
+                - 'fixed': Score above scene_threshold (default)
+                - 'adaptive': Score more than adaptive_k standard deviations
+                  above the mean score of the preceding adaptive_window
+                  seconds, at least min_scene_gap after the previous change.
+                  Gives a steadier number of candidates across noisy and
+                  clean footage without tuning scene_threshold, which is
+                  then only used for the first few samples.
+            adaptive_k: Standard deviations above the rolling mean for the
+                'adaptive' mode. Defaults to 3.0.
+            adaptive_window: Rolling window in seconds for the 'adaptive'
+                mode. Defaults to 30.0.
+            min_scene_gap: Minimum seconds between two scene changes in the
+                'adaptive' mode. Defaults to 1.0.
+            frame_storage: How saved frames are stored:
+                - 'files': One image file per frame (default)
+                - 'shard': All images of a video appended to a single
+                  ``frames.shard`` file in ``output_dir``; each frame's
+                  ``path`` is the shard and its ``offset`` and ``length``
+                  locate the image. Avoids one small file per frame on
+                  large corpora. See :mod:`framewise.core.frame_shard`.
+            probe: How the video's frame rate, frame count and keyframes
+                are determined:
+                - 'opencv': Container header values (default). Frame counts
+                  are often wrong for variable-frame-rate recordings, and
+                  keyframe positions are unknown
+                - 'ffprobe': Exact frame count and keyframe positions from a
+                  packet scan, used to plan parallel scan ranges and
+                  candidate seeks. Requires ffprobe
+                Either way, frame timestamps are ``frame_index / fps`` with
+                the average frame rate; on variable-frame-rate video they
+                can drift from presentation time, and with it from the
+                transcript. See :mod:`framewise.core.video_probe`.
+            probe_cache_dir: Directory caching probe results by file
+                identity, so unchanged videos are not probed again. None
+                disables caching. Defaults to None.
+            collapse_static: Skip through static stretches in scene scans.
+                After ``static_after`` consecutive samples scoring at most
+                ``static_threshold``, the scan moves ahead in doubling steps
+                (up to ``max_static_skip`` seconds) and bisects back to the
+                first change. Each static run yields one candidate: the
+                scene change that led into it, or else a 'static_segment'
+                candidate at its start, scored at ``scene_threshold``.
+                Needs the 'opencv' decoder and the fixed threshold, and
+                cannot be combined with single_pass or keyframe scans. See
+                :mod:`framewise.core.static_skip`. Defaults to False.
+            static_threshold: Largest scene change score counted as
+                unchanged by ``collapse_static``. Defaults to 0.005.
+            static_after: Consecutive unchanged samples that start a static
+                run. Defaults to 3.
+            max_static_skip: Longest jump in seconds through a static run.
+                A change shown for less than this may be missed.
+                Defaults to 5.0.
+            resumable: Checkpoint progress to
+                ``extraction.checkpoint.jsonl`` in ``output_dir`` so that an
+                interrupted extraction resumes where it stopped. The scene
+                scan is run (and recorded) in segments of
+                ``checkpoint_interval`` seconds, and each written frame is
+                recorded; a rerun with the same video and settings skips
+                recorded segments and reuses recorded frames whose image
+                still exists. Frames in a shard are not reused, and keyframe
+                and single-pass scans are not checkpointed. The checkpoint
+                is deleted once metadata.json is written. See
+                :mod:`framewise.core.extraction_checkpoint`. Defaults to False.
+            checkpoint_interval: Length in seconds of the scan segments
+                recorded by ``resumable``. Each segment starts with a seek.
+                Defaults to 300.0.
         
         Raises:
-            ValueError: If strategy is not one of 'scene', 'transcript', or 'hybrid'.
+            ValueError: If strategy is not one of 'scene', 'keyframes',
+                'transcript', or 'hybrid', if analysis_fps or workers is not
+                positive, if decoder is unknown, or if single_pass is combined
+                with the 'ffmpeg' decoder, a keyframe scan or refine_boundaries,
+                or if the scorer is unknown or needs colour frames the
+                decoder cannot provide, if the image writer settings are
+                invalid, if both save_images and keep_images are False, if
+                cache_dir is set without save_images, if quality_mode,
+                threshold_mode, frame_storage or probe is unknown, or if the
+                'adaptive' threshold is combined with a keyframe scan or
+                refine_boundaries, or if collapse_static is combined with
+                the 'ffmpeg' decoder, the 'adaptive' threshold, single_pass
+                or a keyframe scan, or if checkpoint_interval is not positive.
         
         Example:
             >>> # Strict quality, fewer frames
@@ -190,16 +553,130 @@ class FrameExtractor:
             ...     scene_threshold=0.2
             ... )
         """
-        if strategy not in ["scene", "transcript", "hybrid"]:
+        if strategy not in ["scene", "keyframes", "transcript", "hybrid"]:
             raise ValueError(
                 f"Invalid strategy '{strategy}'. "
-                "Must be 'scene', 'transcript', or 'hybrid'"
+                "Must be 'scene', 'keyframes', 'transcript', or 'hybrid'"
+            )
+        if analysis_fps is not None and analysis_fps <= 0:
+            raise ValueError(f"analysis_fps must be positive, got {analysis_fps}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if decoder not in DECODERS:
+            raise ValueError(
+                f"Invalid decoder '{decoder}'. Must be one of: {', '.join(DECODERS)}"
+            )
+        if decoder == "ffmpeg" and single_pass:
+            raise ValueError(
+                "The 'ffmpeg' decoder only produces analysis frames and "
+                "cannot be combined with single_pass"
+            )
+        if single_pass and (strategy == "keyframes" or keyframe_prepass):
+            raise ValueError("Keyframe scans cannot be combined with single_pass")
+        if single_pass and refine_boundaries:
+            raise ValueError(
+                "refine_boundaries seeks backwards and cannot be combined with single_pass"
+            )
+        if threshold_mode not in ("fixed", "adaptive"):
+            raise ValueError(
+                f"Invalid threshold_mode '{threshold_mode}'. Must be 'fixed' or 'adaptive'"
+            )
+        if threshold_mode == "adaptive" and (
+            strategy == "keyframes" or keyframe_prepass or refine_boundaries
+        ):
+            raise ValueError(
+                "The 'adaptive' threshold scores every sample against the ones before "
+                "it and cannot be combined with keyframe scans or refine_boundaries"
+            )
+        if collapse_static and (
+            decoder == "ffmpeg" or threshold_mode == "adaptive" or single_pass
+            or strategy == "keyframes" or keyframe_prepass
+        ):
+            raise ValueError(
+                "collapse_static seeks within the OpenCV scan and cannot be combined "
+                "with the 'ffmpeg' decoder, the 'adaptive' threshold, single_pass "
+                "or keyframe scans"
+            )
+        if static_after < 1:
+            raise ValueError(f"static_after must be at least 1, got {static_after}")
+        if checkpoint_interval <= 0:
+            raise ValueError(f"checkpoint_interval must be positive, got {checkpoint_interval}")
+        
+        scene_scorer = get_scorer(scorer)
+        grayscale_only = decoder == "ffmpeg" or strategy == "keyframes" or keyframe_prepass
+        if scene_scorer.requires_color and grayscale_only:
+            raise ValueError(
+                f"The '{scene_scorer.name}' scorer needs colour frames, which the "
+                "ffmpeg and keyframe scans do not provide"
             )
         
         self.strategy = strategy
         self.max_frames_per_video = max_frames_per_video
         self.scene_threshold = scene_threshold
         self.quality_threshold = quality_threshold
+        self.analysis_fps = analysis_fps
+        self.single_pass = single_pass
+        self.workers = workers
+        self.decoder = decoder
+        self.keyframe_prepass = keyframe_prepass
+        self.refine_boundaries = refine_boundaries
+        self.scorer = scene_scorer
+        self.duplicate_hash_radius = duplicate_hash_radius
+        self.seek_cost_frames = seek_cost_frames
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.save_max_size = save_max_size
+        self.writer_threads = writer_threads
+        self.writer_queue_size = writer_queue_size
+        
+        # Validate writer settings now rather than on the first extraction
+        check_writer_options(
+            image_format, image_quality, save_max_size, writer_threads, writer_queue_size
+        )
+        if not save_images and not keep_images:
+            raise ValueError(
+                "save_images=False requires keep_images=True, "
+                "otherwise extracted frames have no image"
+            )
+        if cache_dir is not None and not save_images:
+            raise ValueError("cache_dir requires save_images=True")
+        if frame_storage not in ("files", "shard"):
+            raise ValueError(
+                f"Invalid frame_storage '{frame_storage}'. Must be 'files' or 'shard'"
+            )
+        self.frame_storage = frame_storage
+        if probe not in PROBE_METHODS:
+            raise ValueError(
+                f"Invalid probe '{probe}'. Must be one of: {', '.join(PROBE_METHODS)}"
+            )
+        self.probe = probe
+        self.probe_cache_dir = probe_cache_dir
+        self.collapse_static = collapse_static
+        self.static_threshold = static_threshold
+        self.static_after = static_after
+        self.max_static_skip = max_static_skip
+        self.resumable = resumable
+        self.checkpoint_interval = checkpoint_interval
+        self.save_images = save_images
+        self.keep_images = keep_images
+        self.cache = (
+            ExtractionCache(cache_dir, cache_max_bytes) if cache_dir is not None else None
+        )
+        self.action_keywords = list(
+            action_keywords if action_keywords is not None else self.ACTION_KEYWORDS
+        )
+        self.keyword_matcher = KeywordMatcher(self.action_keywords)
+        self.coverage_window = coverage_window
+        self.quality_mode = quality_mode
+        self.quality_gain = quality_gain
+        self.threshold_mode = threshold_mode
+        self.adaptive_k = adaptive_k
+        self.adaptive_window = adaptive_window
+        self.min_scene_gap = min_scene_gap
+        # Validates the adaptive threshold settings
+        self._adaptive_threshold()
+        # Validates quality_mode
+        self._create_quality_assessor()
     
     def extract(
         self,
@@ -210,7 +687,9 @@ class FrameExtractor:
         """Extract keyframes from a video file.
         
         Processes the video using the configured strategy to identify and extract
-        important frames. Frames are saved as JPEG images with metadata.
+        important frames. Frames are saved as images (JPEG by default) with
+        metadata. Returns once every frame has been written or has failed to
+        write.
         
         Args:
             video_path: Path to the video file to process. Supports common formats
@@ -247,6 +726,53 @@ class FrameExtractor:
             8.3s: keyword:click
             15.7s: scene_change
         """
+        return list(self.iter_extract(video_path, transcript, output_dir))
+    
+    def iter_extract(
+        self,
+        video_path: Union[str, Path],
+        transcript: Optional[Transcript] = None,
+        output_dir: Union[str, Path] = "frames",
+    ) -> Iterator[ExtractedFrame]:
+        """Extract keyframes from a video file, yielding each as it is saved.
+        
+        Streaming version of :meth:`extract`: each ExtractedFrame is yielded
+        as soon as its image has been written, so downstream stages (e.g.
+        embedding) can start while the rest of the video is still being
+        processed. Images are written by a background writer pool while
+        later frames are decoded; frames whose write fails are logged and
+        skipped. With ``keep_images`` (or without ``save_images``) frames
+        carry their pixels and are yielded without waiting for the write.
+        metadata.json is written once the generator is exhausted.
+        
+        Args:
+            video_path: Path to the video file to process.
+            transcript: Optional Transcript object for transcript-based or hybrid
+                extraction. Required if strategy is 'transcript'.
+                Defaults to None.
+            output_dir: Directory where extracted frames and metadata will be saved.
+                Will be created if it doesn't exist. Defaults to "frames".
+        
+        Yields:
+            ExtractedFrame objects in timestamp order.
+        
+        Raises:
+            FileNotFoundError: If the video file doesn't exist.
+            ValueError: If strategy is 'transcript' but no transcript is provided,
+                or if the video file cannot be opened.
+        
+        Note:
+            Being a generator, nothing runs (and no error is raised) until
+            the first frame is requested. If iteration stops early, the
+            video is released but metadata.json is not written.
+        
+        Example:
+            >>> for frame in extractor.iter_extract("tutorial.mp4", transcript):
+            ...     batch.append(frame)
+            ...     if len(batch) == 8:
+            ...         embeddings.extend(embedder.embed_frames_batch(batch))
+            ...         batch = []
+        """
         video_path = Path(video_path)
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -257,96 +783,460 @@ class FrameExtractor:
         logger.info(f"Extracting frames from: {video_path.name}")
         logger.info(f"Strategy: {self.strategy}")
         
-        # Open video
-        cap = cv2.VideoCapture(str(video_path))
-        if not cap.isOpened():
-            raise ValueError(f"Failed to open video: {video_path}")
-        
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = total_frames / fps if fps > 0 else 0
-        
-        logger.info(f"Video: {duration:.1f}s, {fps:.1f} fps, {total_frames} frames")
-        
-        # Extract frames based on strategy
-        if self.strategy == "scene":
-            candidate_timestamps = self._extract_by_scene_change(cap, fps)
-        elif self.strategy == "transcript":
-            if transcript is None:
-                raise ValueError("Transcript required for 'transcript' strategy")
-            candidate_timestamps = self._extract_by_transcript(transcript)
-        elif self.strategy == "hybrid":
-            scene_timestamps = self._extract_by_scene_change(cap, fps)
-            transcript_timestamps = self._extract_by_transcript(transcript) if transcript else []
-            # Combine and deduplicate
-            candidate_timestamps = self._merge_timestamps(scene_timestamps, transcript_timestamps)
-        else:
-            raise ValueError(f"Unknown strategy: {self.strategy}")
-        
-        # Limit number of frames
-        if len(candidate_timestamps) > self.max_frames_per_video:
-            # Keep evenly distributed frames
-            step = len(candidate_timestamps) / self.max_frames_per_video
-            candidate_timestamps = [
-                candidate_timestamps[int(i * step)] 
-                for i in range(self.max_frames_per_video)
-            ]
-        
-        logger.info(f"Extracting {len(candidate_timestamps)} frames")
-        
-        # Extract and save frames
-        extracted_frames = []
-        for idx, timestamp_info in enumerate(candidate_timestamps):
-            if isinstance(timestamp_info, tuple):
-                timestamp, reason, score = timestamp_info
-            else:
-                timestamp, reason, score = timestamp_info, "unknown", 0.0
+        # Reuse a cached extraction of the same video and settings
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(video_path, self._cache_settings(transcript))
+            metadata = self.cache.get(cache_key, output_dir)
+            if metadata is not None:
+                for frame_data in metadata["frames"]:
+                    yield ExtractedFrame.from_dict(frame_data)
+                return
+        
+        shard_path = output_dir / SHARD_NAME if self.frame_storage == "shard" else None
+        writer = self._create_writer(shard_path)
+        checkpoint: Optional[ExtractionCheckpoint] = None
+        # The decoder is only opened once frames are needed; ffprobe and
+        # cached probes plan the work without it
+        cap: Optional[cv2.VideoCapture] = None
+        try:
+            if self.probe == "opencv" and self.probe_cache_dir is None:
+                cap = self._open_capture(video_path)
+            info = self._probe_video(video_path, cap)
+            fps = info.fps
+            total_frames = info.frame_count
+            duration = info.duration
+            if self.resumable:
+                checkpoint = self._open_checkpoint(video_path, transcript, output_dir, total_frames)
             
-            frame = self._extract_frame_at_timestamp(cap, timestamp, fps)
-            if frame is None:
-                continue
+            logger.info(f"Video: {duration:.1f}s, {fps:.1f} fps, {total_frames} frames")
             
-            # Check quality
-            quality = self._assess_frame_quality(frame)
-            if quality < self.quality_threshold:
-                logger.debug(f"Skipping low quality frame at {timestamp:.1f}s")
-                continue
+            if self.strategy == "transcript" and transcript is None:
+                raise ValueError("Transcript required for 'transcript' strategy")
             
-            # Save frame
-            frame_id = f"frame_{idx:04d}"
-            frame_filename = f"{frame_id}_t{timestamp:07.1f}s.jpg"
-            frame_path = output_dir / frame_filename
+            if cap is None and self._scan_needs_capture(total_frames):
+                cap = self._open_capture(video_path)
             
-            cv2.imwrite(str(frame_path), frame)
+            # Extract frames based on strategy
+            candidate_frames: Optional[List[np.ndarray]] = None
+            candidate_boxes: Optional[List[Optional[Tuple]]] = None
+            candidate_grays: Optional[List[Optional[np.ndarray]]] = None
+            if self.single_pass:
+                buffered = self._extract_single_pass(cap, fps, transcript, duration)
+                candidate_timestamps = [(t, reason, score) for t, reason, score, *_ in buffered]
+                candidate_frames = [candidate[3] for candidate in buffered]
+                candidate_boxes = [candidate[4] for candidate in buffered]
+                candidate_grays = [candidate[5] for candidate in buffered]
+            elif self.strategy == "scene":
+                candidate_timestamps = self._detect_scene_changes(
+                    cap, video_path, fps, total_frames, info.keyframes, checkpoint
+                )
+            elif self.strategy == "keyframes":
+                candidate_timestamps = self._extract_by_keyframes(video_path, fps)
+            elif self.strategy == "transcript":
+                candidate_timestamps = self._extract_by_transcript(transcript)
+            elif self.strategy == "hybrid":
+                scene_timestamps = self._detect_scene_changes(
+                    cap, video_path, fps, total_frames, info.keyframes, checkpoint
+                )
+                transcript_timestamps = (
+                    self._extract_by_transcript(transcript) if transcript else []
+                )
+                # Combine and deduplicate
+                candidate_timestamps = self._merge_timestamps(
+                    scene_timestamps, transcript_timestamps
+                )
+            else:
+                raise ValueError(f"Unknown strategy: {self.strategy}")
+            
+            # Limit number of frames
+            candidate_timestamps = self._limit_candidates(candidate_timestamps, duration)
             
-            # Find associated transcript segment
-            segment = self._find_transcript_segment(transcript, timestamp) if transcript else None
+            logger.info(f"Extracting {len(candidate_timestamps)} frames")
             
-            extracted_frame = ExtractedFrame(
-                frame_id=frame_id,
-                path=frame_path,
-                timestamp=timestamp,
-                transcript_segment=segment,
-                extraction_reason=reason,
-                scene_change_score=score,
-                quality_score=quality,
+            # Extract and save frames
+            extracted_frames = []
+            duplicates = []
+            dedup_index = (
+                NearDuplicateIndex(self.duplicate_hash_radius)
+                if self.duplicate_hash_radius is not None else None
             )
+            if cap is None:
+                cap = self._open_capture(video_path)
+            fetcher = FrameFetcher(cap, self.seek_cost_frames, info.keyframes)
+            # Scene changes compare each frame with the one this far back
+            # Keyframe scans compare keyframes, whose distance varies, so their
+            # changes get no box rather than one from a pair never compared
+            localize = self.scorer.localizes and not (
+                self.strategy == "keyframes" or self.keyframe_prepass
+            )
+            box_offset = 1 if self.refine_boundaries else self._analysis_stride(fps)
+            assessor = self._create_quality_assessor()
+            fast_quality = self.quality_mode == "fast"
+            
+            # Single-pass frames are all in memory: score them in one batch,
+            # on the scan's analysis frames where it kept them
+            qualities: Optional[np.ndarray] = None
+            if fast_quality and candidate_frames:
+                candidate_grays = [
+                    gray if gray is not None else to_scene_frame(frame)
+                    for frame, gray in zip(candidate_frames, candidate_grays)
+                ]
+                qualities = assessor.score_batch(candidate_frames, candidate_grays)
             
-            extracted_frames.append(extracted_frame)
-            logger.debug(f"Extracted: {frame_filename}")
+            pending: Deque[Tuple[Future, ExtractedFrame]] = deque()
+            background_writes: List[Tuple[Future, ExtractedFrame]] = []
+            for idx, timestamp_info in enumerate(candidate_timestamps):
+                if isinstance(timestamp_info, tuple):
+                    timestamp, reason, score = timestamp_info
+                else:
+                    timestamp, reason, score = timestamp_info, "unknown", 0.0
+                
+                frame_id = f"frame_{idx:04d}"
+                resumed = self._resumed_frame(
+                    checkpoint, frame_id, timestamp, reason, dedup_index is not None
+                )
+                if resumed is not None:
+                    extracted_frame, frame_hash = resumed
+                    if dedup_index is not None:
+                        dedup_index.add_hash(frame_hash, frame_id)
+                    # Keep frames in order behind the writes still in flight
+                    yield from self._finished_writes(pending, extracted_frames, wait=True)
+                    extracted_frames.append(extracted_frame)
+                    yield extracted_frame
+                    continue
+                
+                change_box = None
+                if candidate_frames is not None:
+                    frame = candidate_frames[idx]
+                    change_box = candidate_boxes[idx]
+                else:
+                    frame_idx = self._frame_index(timestamp, fps)
+                    before = None
+                    if localize and reason == "scene_change" and frame_idx >= box_offset:
+                        # One extra decode: the frame the change was scored against
+                        before = fetcher.fetch(frame_idx - box_offset)
+                    frame = fetcher.fetch(frame_idx)
+                    if before is not None and frame is not None:
+                        change_box = self.scorer.change_box(
+                            self.scorer.prepare(before), self.scorer.prepare(frame)
+                        )
+                if frame is None:
+                    continue
+                
+                # Check quality; fast mode shares one analysis frame with dedup
+                gray = None
+                if candidate_grays is not None:
+                    gray = candidate_grays[idx]
+                elif fast_quality:
+                    gray = to_scene_frame(frame)
+                
+                if qualities is not None:
+                    quality = float(qualities[idx])
+                else:
+                    quality = assessor.score(frame, gray)
+                if quality < self.quality_threshold:
+                    logger.debug(f"Skipping low quality frame at {timestamp:.1f}s")
+                    continue
+                
+                # Drop near-duplicates of frames already kept
+                frame_hash = None
+                if dedup_index is not None:
+                    frame_hash = perceptual_hash(gray if gray is not None else frame)
+                    match = dedup_index.find_hash(frame_hash)
+                    if match is not None:
+                        duplicate_of, distance = match
+                        logger.debug(f"Skipping duplicate of {duplicate_of} at {timestamp:.1f}s")
+                        duplicates.append({
+                            "timestamp": timestamp,
+                            "extraction_reason": reason,
+                            "duplicate_of": duplicate_of,
+                            "hash_distance": distance,
+                        })
+                        continue
+                    dedup_index.add_hash(frame_hash, frame_id)
+                
+                # Queue frame for writing
+                frame_path = None
+                future = None
+                if self.save_images:
+                    if shard_path is not None:
+                        frame_path = shard_path
+                    else:
+                        frame_filename = f"{frame_id}_t{timestamp:07.1f}s.{writer.extension}"
+                        frame_path = output_dir / frame_filename
+                    future = writer.submit(frame, frame_path)
+                
+                # Find associated transcript segment
+                segment = (
+                    self._find_transcript_segment(transcript, timestamp) if transcript else None
+                )
+                
+                extracted_frame = ExtractedFrame(
+                    frame_id=frame_id,
+                    path=frame_path,
+                    timestamp=timestamp,
+                    transcript_segment=segment,
+                    extraction_reason=reason,
+                    scene_change_score=score,
+                    quality_score=quality,
+                    change_box=change_box,
+                    image=frame if self.keep_images else None,
+                )
+                
+                if checkpoint is not None and future is not None and shard_path is None:
+                    checkpoint.add_frame_when_written(
+                        future,
+                        extracted_frame.to_dict(),
+                        frame_hash.astype(int).tolist() if frame_hash is not None else None,
+                    )
+                
+                if future is None or (self.keep_images and shard_path is None):
+                    # Pixels are in memory, so the write need not finish first;
+                    # a shard frame still waits for its location
+                    if future is not None:
+                        background_writes.append((future, extracted_frame))
+                    extracted_frames.append(extracted_frame)
+                    yield extracted_frame
+                else:
+                    pending.append((future, extracted_frame))
+                    yield from self._finished_writes(pending, extracted_frames)
+            
+            yield from self._finished_writes(pending, extracted_frames, wait=True)
+        finally:
+            if cap is not None:
+                cap.release()
+            writer.close()
+            if checkpoint is not None:
+                checkpoint.close()
+        
+        for future, extracted_frame in background_writes:
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Failed to write {extracted_frame.path}: {error}")
+                extracted_frame.path = None
+            else:
+                self._record_location(extracted_frame, future.result())
         
-        cap.release()
+        fetch_stats = fetcher.stats if candidate_frames is None else None
+        if fetch_stats is not None:
+            logger.debug(
+                f"Fetched candidates with {fetch_stats.seeks} seeks, "
+                f"{fetch_stats.grabbed} grabbed and {fetch_stats.decoded} decoded frames"
+            )
         
         # Save metadata
-        self._save_metadata(extracted_frames, output_dir)
+        self._save_metadata(
+            extracted_frames,
+            output_dir,
+            duplicates if dedup_index is not None else None,
+            fetch_stats,
+        )
+        
+        if checkpoint is not None:
+            checkpoint.clear()
+        if cache_key is not None:
+            self.cache.put(cache_key, output_dir)
         
         logger.success(f"Extracted {len(extracted_frames)} frames to {output_dir}")
-        return extracted_frames
     
-    def _extract_by_scene_change(
+    def extract_batch(
+        self,
+        video_paths: List[Union[str, Path]],
+        transcripts: Optional[List[Optional[Transcript]]] = None,
+        output_root: Union[str, Path] = "frames",
+        workers: int = 1,
+    ) -> List[BatchExtractionResult]:
+        """Extract frames from multiple videos, optionally in parallel.
+        
+        Each video is written to its own directory under ``output_root``
+        (named after the video file). A failing video is logged and
+        reported in its result without stopping the rest of the batch.
+        
+        Args:
+            video_paths: List of paths to video files to process.
+            transcripts: Optional list of transcripts aligned with
+                ``video_paths`` (entries may be None). Defaults to None.
+            output_root: Directory under which one output directory per video
+                is created. Defaults to "frames".
+            workers: Number of videos processed concurrently in separate
+                processes. 1 processes them sequentially in this process.
+                Defaults to 1.
+        
+        Returns:
+            List of BatchExtractionResult objects, one per input video in the
+            same order.
+        
+        Raises:
+            ValueError: If ``transcripts`` is not aligned with ``video_paths``.
+        
+        Example:
+            >>> extractor = FrameExtractor(strategy="scene")
+            >>> results = extractor.extract_batch(
+            ...     ["video1.mp4", "video2.mp4"],
+            ...     output_root="frames/",
+            ...     workers=4
+            ... )
+            >>> for result in results:
+            ...     print(f"{result.video_path.name}: {len(result.frames)} frames")
+            video1.mp4: 12 frames
+            video2.mp4: 18 frames
+        """
+        return sorted(
+            self.iter_extract_batch(video_paths, transcripts, output_root, workers),
+            key=lambda result: result.index,
+        )
+    
+    def iter_extract_batch(
+        self,
+        video_paths: List[Union[str, Path]],
+        transcripts: Optional[List[Optional[Transcript]]] = None,
+        output_root: Union[str, Path] = "frames",
+        workers: int = 1,
+    ) -> Iterator[BatchExtractionResult]:
+        """Extract frames from multiple videos, yielding results as they complete.
+        
+        Same as :meth:`extract_batch`, but results are yielded in completion
+        order rather than input order; use ``result.index`` to map them back.
+        
+        Args:
+            video_paths: List of paths to video files to process.
+            transcripts: Optional list of transcripts aligned with
+                ``video_paths`` (entries may be None). Defaults to None.
+            output_root: Directory under which one output directory per video
+                is created. Defaults to "frames".
+            workers: Number of videos processed concurrently in separate
+                processes. Defaults to 1.
+        
+        Yields:
+            BatchExtractionResult for each video as soon as it finishes.
+        
+        Raises:
+            ValueError: If ``transcripts`` is not aligned with ``video_paths``.
+        """
+        video_paths = [Path(path) for path in video_paths]
+        if transcripts is None:
+            transcripts = [None] * len(video_paths)
+        if len(transcripts) != len(video_paths):
+            raise ValueError(
+                f"Got {len(transcripts)} transcripts for {len(video_paths)} videos"
+            )
+        
+        output_dirs = self._batch_output_dirs(video_paths, Path(output_root))
+        jobs = list(zip(range(len(video_paths)), video_paths, transcripts, output_dirs))
+        total = len(jobs)
+        
+        def finish(
+            done: int,
+            index: int,
+            frames: List[ExtractedFrame],
+            error: Optional[str]
+        ) -> BatchExtractionResult:
+            video_path = video_paths[index]
+            if error is None:
+                logger.info(f"[{done}/{total}] {video_path.name}: {len(frames)} frames")
+            else:
+                logger.error(f"[{done}/{total}] {video_path.name} failed: {error}")
+            return BatchExtractionResult(index, video_path, output_dirs[index], frames, error)
+        
+        if workers <= 1:
+            for done, (index, video_path, transcript, output_dir) in enumerate(jobs, 1):
+                try:
+                    frames = self.extract(video_path, transcript, output_dir)
+                    yield finish(done, index, frames, None)
+                except Exception as e:
+                    yield finish(done, index, [], f"{type(e).__name__}: {e}")
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_extract_video, self, video_path, transcript, output_dir): index
+                for index, video_path, transcript, output_dir in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                try:
+                    yield finish(done, index, future.result(), None)
+                except Exception as e:
+                    yield finish(done, index, [], f"{type(e).__name__}: {e}")
+    
+    def _batch_output_dirs(self, video_paths: List[Path], output_root: Path) -> List[Path]:
+        """One output directory per video, named after the file stem.
+        
+        Stems that occur more than once get the batch index appended, plus
+        a counter if that name is itself another video's stem, so videos
+        never share a directory.
+        """
+        stems = [path.stem for path in video_paths]
+        counts = Counter(stems)
+        taken = {stem for stem in stems if counts[stem] == 1}
+        names = []
+        for index, stem in enumerate(stems):
+            name = stem
+            if counts[stem] > 1:
+                name = candidate = f"{stem}_{index}"
+                suffix = 1
+                while name in taken:
+                    name = f"{candidate}_{suffix}"
+                    suffix += 1
+                taken.add(name)
+            names.append(name)
+        return [output_root / name for name in names]
+    
+    def _detect_scene_changes(
         self,
         cap: cv2.VideoCapture,
-        fps: float
+        video_path: Path,
+        fps: float,
+        total_frames: int,
+        keyframes: Optional[List[int]] = None,
+        checkpoint: Optional[ExtractionCheckpoint] = None
+    ) -> List[Tuple[float, str, float]]:
+        """Run scene detection with the configured scan mode.
+        
+        Dispatches to the keyframe pre-pass, the parallel chunked scan or
+        the sequential scan, then optionally refines sampled changes to
+        exact boundary frames.
+        
+        Args:
+            cap: OpenCV VideoCapture object for the video.
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+            total_frames: Frame count of the video.
+            keyframes: Sorted keyframe indices, if probed. Defaults to None.
+            checkpoint: Checkpoint recording finished scan segments, to scan
+                in resumable segments. Defaults to None.
+        
+        Returns:
+            List of tuples containing (timestamp, reason, score) for each
+            detected scene change.
+        """
+        if self.keyframe_prepass:
+            return self._extract_by_keyframe_prepass(cap, video_path, fps)
+        
+        if self.workers > 1 and total_frames > 0:
+            changes = self._extract_by_scene_change_parallel(
+                video_path, fps, total_frames, keyframes, checkpoint
+            )
+        elif checkpoint is not None:
+            changes = self._extract_by_scene_change_segments(
+                cap, video_path, fps, total_frames, checkpoint
+            )
+        else:
+            changes = self._extract_by_scene_change(cap, fps, video_path=video_path)
+        
+        if self.refine_boundaries:
+            changes = self._refine_scene_changes(cap, fps, changes)
+        return changes
+    
+    def _extract_by_scene_change(
+        self,
+        cap: Optional[cv2.VideoCapture],
+        fps: float,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        video_path: Optional[Path] = None,
+        detector: Optional[AdaptiveThreshold] = None
     ) -> List[Tuple[float, str, float]]:
         """Extract frames at scene changes using visual difference detection.
         
@@ -356,42 +1246,837 @@ class FrameExtractor:
         Args:
             cap: OpenCV VideoCapture object for the video.
             fps: Frames per second of the video.
+            start_frame: First frame index whose change from the previous
+                sampled frame is scored. Defaults to 0.
+            end_frame: Frame index at which scanning stops (exclusive), or
+                None to scan to the end of the video. Defaults to None.
+            video_path: Path to the video file. Required by the 'ffmpeg'
+                decoder, which reads the file itself instead of ``cap``.
+                Defaults to None.
+            detector: Detector of the 'adaptive' threshold, fed every scored
+                sample as it is read, e.g. to continue from an earlier range.
+                Defaults to None (a new detector in 'adaptive' mode).
         
         Returns:
             List of tuples containing (timestamp, reason, score) for each
             detected scene change.
         
         Note:
-            Samples every 30 frames for efficiency. Adjust sampling rate for
-            different video types or frame rates.
+            When ``analysis_fps`` is set, only every ``fps / analysis_fps``-th
+            frame is compared with the previously sampled frame; the 'opencv'
+            decoder skips the frames in between with ``grab()``. A range that
+            starts mid-video begins one sample early so the pair straddling
+            ``start_frame`` is still scored.
         """
         timestamps = []
-        prev_frame = None
+        stride = self._analysis_stride(fps)
+        if detector is None and self.threshold_mode == "adaptive":
+            detector = self._adaptive_threshold()
+        
+        # Start on the sample just before the range (frame 0 has none)
+        first_sample = -(-start_frame // stride) * stride
+        scan_start = max(0, first_sample - stride)
+        
+        if self.collapse_static:
+            return self._extract_by_static_skip(cap, fps, scan_start, start_frame, end_frame)
+        
+        frames = self._scene_frames(cap, video_path, fps, scan_start, end_frame, stride)
+        for _, frame_idx, score in self._score_frame_stream(frames):
+            if frame_idx < start_frame:
+                continue
+            timestamp = frame_idx / fps
+            if detector is not None:
+                is_change = detector.update(timestamp, score)
+            else:
+                is_change = score > self.scene_threshold
+            if is_change:
+                timestamps.append((timestamp, "scene_change", score))
+        
+        return timestamps
+    
+    def _scan_range(
+        self,
+        cap: Optional[cv2.VideoCapture],
+        fps: float,
+        start_frame: int,
+        end_frame: Optional[int],
+        video_path: Optional[Path] = None
+    ) -> List[Tuple[float, str, float]]:
+        """Scan one range of the video on its own, e.g. in a worker process.
+        
+        With the 'adaptive' threshold, the detector first warms up on the
+        ``adaptive_window`` seconds before the range, so its rolling window
+        is full from the range's first sample on, as in a sequential scan.
+        Changes in the warm-up are not reported.
+        
+        Args:
+            cap: OpenCV VideoCapture object, or None for the 'ffmpeg' decoder.
+            fps: Frames per second of the video.
+            start_frame: First frame index whose change is reported.
+            end_frame: Frame index at which scanning stops (exclusive), or
+                None for the end of the video.
+            video_path: Path to the video file. Defaults to None.
+        
+        Returns:
+            List of tuples containing (timestamp, reason, score) for each
+            detected scene change in the range.
+        """
+        if self.threshold_mode != "adaptive" or start_frame == 0:
+            return self._extract_by_scene_change(
+                cap, fps, start_frame, end_frame, video_path=video_path
+            )
+        warmup_start = max(0, start_frame - math.ceil(self.adaptive_window * fps))
+        changes = self._extract_by_scene_change(
+            cap, fps, warmup_start, end_frame, video_path=video_path
+        )
+        return [change for change in changes if self._frame_index(change[0], fps) >= start_frame]
+    
+    def _extract_by_static_skip(
+        self,
+        cap: cv2.VideoCapture,
+        fps: float,
+        scan_start: int,
+        start_frame: int,
+        end_frame: Optional[int]
+    ) -> List[Tuple[float, str, float]]:
+        """Scan for scene changes, skipping through static runs.
+        
+        Args:
+            cap: OpenCV VideoCapture object for the video.
+            fps: Frames per second of the video.
+            scan_start: Index of the first sample read.
+            start_frame: First frame index whose change is reported.
+            end_frame: Frame index at which reporting stops (exclusive), or
+                None for the end of the video.
+        
+        Returns:
+            Scene changes plus one 'static_segment' candidate for each
+            static run starting in range that no scene change leads into,
+            as (timestamp, reason, score) tuples sorted by time.
+        """
+        stride = self._analysis_stride(fps)
+        fetcher = FrameFetcher(cap, self.seek_cost_frames, record_frames=False)
+        prepare = self.scorer.buffered_prepare()
+        buffer: Optional[np.ndarray] = None
+        
+        def fetch(frame_idx: int) -> Optional[np.ndarray]:
+            nonlocal buffer
+            buffer = fetcher.fetch(frame_idx, buffer)
+            return prepare(buffer) if buffer is not None else None
+        
+        scanner = StaticSegmentScanner(
+            fetch,
+            self._scene_change_score,
+            stride=stride,
+            static_threshold=self.static_threshold,
+            static_after=self.static_after,
+            max_step=int(self.max_static_skip * fps),
+        )
+        
+        def in_range(frame_idx: int) -> bool:
+            return frame_idx >= start_frame and (end_frame is None or frame_idx < end_frame)
+        
+        change_frames = set()
+        timestamps = []
+        for _, frame_idx, score in scanner.scan(scan_start, end_frame):
+            if in_range(frame_idx) and score > self.scene_threshold:
+                change_frames.add(frame_idx)
+                timestamps.append((frame_idx / fps, "scene_change", score))
+        
+        for run_start, _ in scanner.runs:
+            if in_range(run_start) and run_start not in change_frames:
+                timestamps.append((run_start / fps, "static_segment", self.scene_threshold))
+        
+        logger.debug(
+            f"Static skip decoded {scanner.decoded} samples, "
+            f"found {len(scanner.runs)} static runs"
+        )
+        return sorted(timestamps)
+    
+    def _score_frame_stream(
+        self,
+        frames: Iterator[Tuple[int, np.ndarray]]
+    ) -> Iterator[Tuple[int, int, float]]:
+        """Score consecutive prepared frames in vectorized batches.
+        
+        Frames are copied into a batch array of ``SCENE_BATCH_SIZE + 1``
+        frames, allocated once per scan, and each batch (plus the last
+        frame of the previous batch) is scored with a single
+        :meth:`SceneScorer.score_pairs` call.
+        
+        Args:
+            frames: Iterator of (frame_index, prepared frame) pairs. Each
+                prepared frame is copied before the next is requested, so
+                the iterator may reuse its buffers.
+        
+        Yields:
+            Tuples of (previous_frame_index, frame_index, score) for every
+            consecutive pair.
+        """
+        indices: List[int] = []
+        batch: Optional[np.ndarray] = None
+        
+        def flush() -> Iterator[Tuple[int, int, float]]:
+            scores = self.scorer.score_pairs(batch[:len(indices)])
+            for i, score in enumerate(scores):
+                yield indices[i], indices[i + 1], float(score)
+        
+        for frame_idx, prepared in frames:
+            if batch is None:
+                batch = np.empty(
+                    (self.SCENE_BATCH_SIZE + 1,) + prepared.shape, dtype=prepared.dtype
+                )
+            batch[len(indices)] = prepared
+            indices.append(frame_idx)
+            if len(indices) > self.SCENE_BATCH_SIZE:
+                yield from flush()
+                # Carry the last frame over as the left side of the next pair
+                batch[0] = batch[len(indices) - 1]
+                indices = indices[-1:]
+        
+        if len(indices) > 1:
+            yield from flush()
+    
+    def _keyframe_changes(
+        self,
+        video_path: Path,
+        fps: float
+    ) -> List[Tuple[int, int, float]]:
+        """Score visual changes between consecutive keyframes.
+        
+        Only keyframes (I-frames) are decoded, via ffmpeg's
+        ``-skip_frame nokey``.
+        
+        Args:
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+        
+        Returns:
+            List of (previous_keyframe_index, keyframe_index, score) tuples
+            for keyframe pairs whose score exceeds ``scene_threshold``.
+        """
+        changes = []
+        keyframes = (
+            (frame_idx, self.scorer.prepare(gray))
+            for frame_idx, gray in KeyframeSceneReader(video_path, fps).frames()
+        )
+        for prev_idx, frame_idx, score in self._score_frame_stream(keyframes):
+            if score > self.scene_threshold:
+                changes.append((prev_idx, frame_idx, score))
+        
+        return changes
+    
+    def _extract_by_keyframes(
+        self,
+        video_path: Path,
+        fps: float
+    ) -> List[Tuple[float, str, float]]:
+        """Extract frames at keyframes that differ from the previous keyframe.
+        
+        A fast scan for slide-style screen recordings, where every real
+        visual change starts a new encoder keyframe. Scene scoring runs on
+        the keyframes only.
+        
+        Args:
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+        
+        Returns:
+            List of tuples containing (timestamp, reason, score) for each
+            changed keyframe.
+        """
+        changes = self._keyframe_changes(video_path, fps)
+        logger.debug(f"Found {len(changes)} changed keyframes")
+        return [(frame_idx / fps, "scene_change", score) for _, frame_idx, score in changes]
+    
+    def _extract_by_keyframe_prepass(
+        self,
+        cap: cv2.VideoCapture,
+        video_path: Path,
+        fps: float
+    ) -> List[Tuple[float, str, float]]:
+        """Locate scene changes by refining changed keyframe intervals.
+        
+        Keyframes are compared first; only the intervals between two
+        keyframes that differ are then scanned frame by frame with
+        :meth:`_extract_by_scene_change` to find the exact change.
+        
+        Args:
+            cap: OpenCV VideoCapture object for the video.
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+        
+        Returns:
+            List of tuples containing (timestamp, reason, score) for each
+            detected scene change.
+        
+        Note:
+            A change that is reverted before the next keyframe is not seen
+            by the pre-pass.
+        """
+        timestamps = []
+        intervals = self._keyframe_changes(video_path, fps)
+        logger.debug(f"Refining {len(intervals)} changed keyframe intervals")
+        
+        for prev_idx, frame_idx, _ in intervals:
+            timestamps.extend(
+                self._extract_by_scene_change(
+                    cap, fps, prev_idx + 1, frame_idx + 1, video_path=video_path
+                )
+            )
+        
+        return timestamps
+    
+    def _refine_scene_changes(
+        self,
+        cap: cv2.VideoCapture,
+        fps: float,
+        changes: List[Tuple[float, str, float]]
+    ) -> List[Tuple[float, str, float]]:
+        """Bisect sampled scene changes down to the exact boundary frame.
+        
+        A change detected at analysis sample ``b`` happened somewhere in
+        ``(b - stride, b]``. That interval is bisected at full frame rate,
+        keeping the half whose endpoints still differ, until the two
+        adjacent frames of the cut are found. Probes are fetched by frame
+        index through a :class:`FrameFetcher`, and only about
+        ``log2(stride)`` of them are needed per change.
+        
+        Args:
+            cap: OpenCV VideoCapture object for the video.
+            fps: Frames per second of the video.
+            changes: Scene changes found by a sampled scan.
+        
+        Returns:
+            Scene changes with frame-accurate timestamps and the score of
+            the boundary pair. Changes whose boundary pair does not exceed
+            ``scene_threshold`` (gradual transitions) are dropped, matching
+            an exhaustive scan.
+        
+        Note:
+            Only one boundary is located per sampled interval.
+        """
+        stride = self._analysis_stride(fps)
+        if stride == 1:
+            return changes
+        
+        # Probes move forward within an interval; nearby ones are read through
+        fetcher = FrameFetcher(cap, self.seek_cost_frames, record_frames=False)
+        refined = []
+        for timestamp, reason, score in changes:
+            if reason != "scene_change":
+                # Static-run representatives have no boundary to refine
+                refined.append((timestamp, reason, score))
+                continue
+            hi = self._frame_index(timestamp, fps)
+            lo = max(0, hi - stride)
+            frames = {}
+            
+            def gray_at(frame_idx: int) -> Optional[np.ndarray]:
+                if frame_idx not in frames:
+                    frame = fetcher.fetch(frame_idx)
+                    frames[frame_idx] = self.scorer.prepare(frame) if frame is not None else None
+                return frames[frame_idx]
+            
+            if gray_at(lo) is None or gray_at(hi) is None:
+                continue
+            
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if gray_at(mid) is None:
+                    break
+                left = self._scene_change_score(gray_at(lo), gray_at(mid))
+                right = self._scene_change_score(gray_at(mid), gray_at(hi))
+                if left > self.scene_threshold or left >= right:
+                    hi = mid
+                else:
+                    lo = mid
+            
+            score = self._scene_change_score(gray_at(hi - 1), gray_at(hi)) if hi - lo == 1 else 0.0
+            if score > self.scene_threshold:
+                refined.append((hi / fps, reason, score))
+        
+        return refined
+    
+    def _scene_frames(
+        self,
+        cap: Optional[cv2.VideoCapture],
+        video_path: Optional[Path],
+        fps: float,
+        start_frame: int,
+        end_frame: Optional[int],
+        stride: int
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Read prepared analysis frames with the configured decoder.
+        
+        Args:
+            cap: OpenCV VideoCapture object (used by the 'opencv' decoder).
+            video_path: Path to the video file (used by the 'ffmpeg' decoder).
+            fps: Frames per second of the video.
+            start_frame: Index of the first frame to read (a multiple of
+                ``stride``).
+            end_frame: Index at which reading stops (exclusive), or None.
+            stride: Distance between analysed frames.
+        
+        Returns:
+            Iterator of (frame_index, prepared frame) pairs, prepared by the
+            configured scorer. A prepared frame may be overwritten once the
+            next one is requested.
+        
+        Raises:
+            ValueError: If the decoder's required input is missing.
+        """
+        if self.decoder == "ffmpeg":
+            if video_path is None:
+                raise ValueError("video_path is required for the 'ffmpeg' decoder")
+            reader = FFmpegSceneReader(video_path, fps)
+            return (
+                (frame_idx, self.scorer.prepare(gray))
+                for frame_idx, gray in reader.frames(start_frame, end_frame, stride)
+            )
+        if cap is None:
+            raise ValueError("An open VideoCapture is required for the 'opencv' decoder")
+        reader = OpenCVSceneReader(cap, prepare=self.scorer.buffered_prepare())
+        return reader.frames(start_frame, end_frame, stride)
+    
+    def _extract_by_scene_change_parallel(
+        self,
+        video_path: Path,
+        fps: float,
+        total_frames: int,
+        keyframes: Optional[List[int]] = None,
+        checkpoint: Optional[ExtractionCheckpoint] = None
+    ) -> List[Tuple[float, str, float]]:
+        """Run scene detection over time ranges in worker processes.
+        
+        Splits the video into ``workers`` contiguous frame ranges and scans
+        each one with its own VideoCapture in a separate process. Each range
+        starts one sample before its first frame, so pairs on the range
+        boundaries are scored exactly as in a sequential scan, and the
+        per-range results are concatenated in order.
+        
+        Args:
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+            total_frames: Frame count of the video. The last range always
+                runs to the end of the stream, so an inaccurate count only
+                affects load balancing.
+            keyframes: Sorted keyframe indices, if probed. Each range then
+                starts right after the keyframe nearest its even split, so
+                its initial seek decodes no frames before the range.
+                Defaults to None.
+            checkpoint: Checkpoint recording finished ranges. The video is
+                then split into ranges of ``checkpoint_interval`` seconds,
+                ranges already recorded are not scanned again, and each
+                range is recorded as it finishes. Defaults to None.
+        
+        Returns:
+            List of tuples containing (timestamp, reason, score) for each
+            detected scene change, identical to :meth:`_extract_by_scene_change`.
+            With the 'adaptive' threshold, each range warms its detector up on
+            the window before it (see :meth:`_scan_range`) instead of
+            receiving the previous range's state. Results then match
+            the sequential scan except for detections within
+            ``min_scene_gap`` of a range boundary, where the gap is applied
+            again after stitching.
+        """
+        if checkpoint is not None:
+            chunk = max(1, int(self.checkpoint_interval * fps))
+        else:
+            chunk = -(-total_frames // min(self.workers, total_frames))
+        starts = list(range(0, total_frames, chunk))
+        if keyframes:
+            # The range scan seeks to the sample before its start
+            snapped = set()
+            for start in starts[1:]:
+                i = bisect.bisect_left(keyframes, start)
+                nearest = min(keyframes[max(i - 1, 0):i + 1], key=lambda k: abs(k - start))
+                snapped.add(nearest + self._analysis_stride(fps))
+            starts = sorted({0} | {start for start in snapped if start < total_frames})
+        bounds = [
+            (start, starts[i + 1] if i < len(starts) - 1 else None)
+            for i, start in enumerate(starts)
+        ]
+        results = dict(checkpoint.segments) if checkpoint is not None else {}
+        missing = [bound for bound in bounds if bound not in results]
+        logger.debug(f"Scanning {len(missing)} of {len(bounds)} ranges in parallel")
+        
+        if missing:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                futures = {
+                    pool.submit(_scan_scene_range, self, str(video_path), fps, *bound): bound
+                    for bound in missing
+                }
+                for future in as_completed(futures):
+                    bound = futures[future]
+                    results[bound] = future.result()
+                    if checkpoint is not None:
+                        checkpoint.add_segment(*bound, results[bound])
+        
+        changes = [change for bound in bounds for change in results[bound]]
+        if self.threshold_mode == "adaptive":
+            # Each range only knows its own detections; keep the gap across
+            # range boundaries too
+            spaced = []
+            for change in changes:
+                if not spaced or change[0] - spaced[-1][0] >= self.min_scene_gap:
+                    spaced.append(change)
+            changes = spaced
+        return changes
+    
+    def _probe_video(
+        self,
+        video_path: Path,
+        cap: Optional[cv2.VideoCapture] = None
+    ) -> VideoInfo:
+        """Probe a video with the configured probe method.
+        
+        Args:
+            video_path: Path to the video file.
+            cap: The video's opened VideoCapture, if any. Its header values
+                are used directly when probing with OpenCV without a cache.
+                Defaults to None.
+        
+        Returns:
+            The video's frame rate, duration, frame count and keyframes.
+        """
+        if self.probe == "opencv" and self.probe_cache_dir is None and cap is not None:
+            return capture_info(cap)
+        return probe_video(video_path, self.probe, self.probe_cache_dir)
+    
+    @staticmethod
+    def _open_capture(video_path: Path) -> cv2.VideoCapture:
+        """Open a video with OpenCV.
+        
+        Raises:
+            ValueError: If the video cannot be opened.
+        """
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video: {video_path}")
+        return cap
+    
+    def _scan_needs_capture(self, total_frames: int) -> bool:
+        """Whether finding candidates decodes frames in this process.
+        
+        Transcript and keyframe candidates, ffmpeg-decoded scans and
+        parallel scans (whose workers open their own capture) need no
+        OpenCV capture here; single-pass capture, the OpenCV sequential
+        scan, the keyframe pre-pass and boundary refinement do.
+        
+        Args:
+            total_frames: Frame count of the video.
+        """
+        if self.single_pass:
+            return True
+        if self.strategy not in ("scene", "hybrid"):
+            return False
+        if self.keyframe_prepass or self.refine_boundaries:
+            return True
+        parallel = self.workers > 1 and total_frames > 0
+        return self.decoder == "opencv" and not parallel
+    
+    def _extract_by_scene_change_segments(
+        self,
+        cap: Optional[cv2.VideoCapture],
+        video_path: Path,
+        fps: float,
+        total_frames: int,
+        checkpoint: ExtractionCheckpoint
+    ) -> List[Tuple[float, str, float]]:
+        """Run the sequential scan in recorded segments.
+        
+        The video is scanned in consecutive ranges of ``checkpoint_interval``
+        seconds with :meth:`_extract_by_scene_change`, which scores range
+        boundaries exactly, so the result equals one uninterrupted scan.
+        Each finished range is recorded in the checkpoint, and ranges
+        already recorded by an earlier run are not scanned again.
+        
+        Args:
+            cap: OpenCV VideoCapture object for the video.
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+            total_frames: Frame count of the video. The last segment runs to
+                the end of the stream.
+            checkpoint: Checkpoint recording finished segments.
+        
+        Returns:
+            List of tuples containing (timestamp, reason, score) for each
+            detected scene change, identical to :meth:`_extract_by_scene_change`.
+        """
+        segment = max(1, int(self.checkpoint_interval * fps))
+        starts = list(range(0, max(total_frames, 1), segment))
+        # The adaptive detector carries over from segment to segment; its
+        # state is recorded with each segment so a resumed scan continues it
+        detector = self._adaptive_threshold() if self.threshold_mode == "adaptive" else None
+        
+        changes = []
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i < len(starts) - 1 else None
+            if (start, end) in checkpoint.segments:
+                if detector is not None and (start, end) in checkpoint.states:
+                    detector.load_state(checkpoint.states[(start, end)])
+            else:
+                found = self._extract_by_scene_change(
+                    cap, fps, start, end, video_path=video_path, detector=detector
+                )
+                state = detector.state() if detector is not None else None
+                checkpoint.add_segment(start, end, found, state)
+            changes.extend(checkpoint.segments[(start, end)])
+        return changes
+    
+    def _open_checkpoint(
+        self,
+        video_path: Path,
+        transcript: Optional[Transcript],
+        output_dir: Path,
+        total_frames: int
+    ) -> ExtractionCheckpoint:
+        """Open the resumable checkpoint of an extraction.
+        
+        The checkpoint key covers the video content, every setting that
+        affects the result and the scan segment layout, so a checkpoint is
+        only resumed by an identical extraction.
+        """
+        payload = json.dumps({
+            "video": video_fingerprint(video_path),
+            "settings": self._cache_settings(transcript),
+            "segments": [self.checkpoint_interval, self.workers, total_frames],
+        }, sort_keys=True)
+        return ExtractionCheckpoint(output_dir, hashlib.sha256(payload.encode()).hexdigest())
+    
+    def _resumed_frame(
+        self,
+        checkpoint: Optional[ExtractionCheckpoint],
+        frame_id: str,
+        timestamp: float,
+        reason: str,
+        needs_hash: bool
+    ) -> Optional[Tuple[ExtractedFrame, Optional[np.ndarray]]]:
+        """Reuse a frame written by an interrupted run of the same extraction.
+        
+        Args:
+            checkpoint: The extraction's checkpoint, or None.
+            frame_id: ID of the candidate frame.
+            timestamp: Timestamp of the candidate.
+            reason: Extraction reason of the candidate.
+            needs_hash: Whether deduplication needs the frame's hash.
+        
+        Returns:
+            The recorded frame and its perceptual hash, or None if the
+            candidate has no usable record and must be extracted.
+        """
+        if checkpoint is None or frame_id not in checkpoint.frames:
+            return None
+        record = checkpoint.frames[frame_id]
+        frame = ExtractedFrame.from_dict(record["frame"])
+        if (
+            frame.timestamp != timestamp
+            or frame.extraction_reason != reason
+            or frame.path is None
+            or frame.offset is not None
+            or not frame.path.exists()
+            or (needs_hash and record["hash"] is None)
+        ):
+            return None
+        if self.keep_images:
+            try:
+                frame.image = frame.load_image()
+            except FileNotFoundError:
+                return None
+        frame_hash = np.array(record["hash"], dtype=bool) if record["hash"] is not None else None
+        return frame, frame_hash
+    
+    def _analysis_stride(self, fps: float) -> int:
+        """Number of video frames between two analysed frames.
+        
+        Args:
+            fps: Frames per second of the video.
+        
+        Returns:
+            Sampling stride of at least 1 (1 means every frame is analysed).
+        """
+        if self.analysis_fps is None or fps <= 0:
+            return 1
+        return max(1, int(round(fps / self.analysis_fps)))
+    
+    def _extract_single_pass(
+        self,
+        cap: cv2.VideoCapture,
+        fps: float,
+        transcript: Optional[Transcript] = None,
+        duration: float = 0.0,
+        merge_window: float = 2.0
+    ) -> List[Tuple[
+        float, str, float, np.ndarray,
+        Optional[Tuple[float, float, float, float]], Optional[np.ndarray]
+    ]]:
+        """Find candidates and capture their frames in one forward decode.
+        
+        Runs scene detection (for 'scene' and 'hybrid') and resolves
+        transcript timestamps in the same sequential pass over the video,
+        keeping the frame of each candidate as it goes by. The video is
+        never decoded twice and no backward seek is issued.
+        
+        Candidates are merged online with the same rule as
+        :meth:`_merge_timestamps` (hybrid strategy only), and each merged
+        candidate is offered to the same selector :meth:`_limit_candidates`
+        uses. The selector only holds the frames of candidates that can
+        still be selected, so memory stays O(max_frames_per_video).
+        
+        Args:
+            cap: OpenCV VideoCapture object for the video.
+            fps: Frames per second of the video.
+            transcript: Optional transcript used for keyword candidates.
+            duration: Video duration in seconds, for coverage windows.
+                Defaults to 0.0 (no coverage windows).
+            merge_window: Time window in seconds for merging nearby
+                candidates. Defaults to 2.0 seconds.
+        
+        Returns:
+            List of (timestamp, reason, score, frame, change_box, gray)
+            tuples sorted by time, at most ``max_frames_per_video`` of them.
+            The selection is the same as the two-pass path's. ``change_box``
+            is None unless the scorer localizes scene changes. ``gray`` is
+            the scan's grayscale analysis frame of a sampled candidate,
+            kept for the 'fast' quality mode when the scorer works on those
+            frames, and None otherwise.
+        """
+        detect_scenes = self.strategy in ("scene", "hybrid")
+        merge = self.strategy == "hybrid"
+        
+        # Transcript candidates are known up front; map them to frame indices
+        pending: Dict[int, List[Tuple[float, str, float]]] = {}
+        if transcript is not None and self.strategy in ("transcript", "hybrid"):
+            for timestamp, reason, score in self._extract_by_transcript(transcript):
+                frame_idx = self._frame_index(timestamp, fps)
+                pending.setdefault(frame_idx, []).append((timestamp, reason, score))
+        last_target = max(pending) if pending else -1
+        
+        selector = self._candidate_selector(duration)
+        # The latest candidate stays open while later ones may merge into it
+        last: Optional[
+            Tuple[float, str, float, np.ndarray, Optional[Tuple], Optional[np.ndarray]]
+        ] = None
+        
+        def add_candidate(
+            timestamp: float,
+            reason: str,
+            score: float,
+            frame: np.ndarray,
+            change_box: Optional[Tuple] = None,
+            gray: Optional[np.ndarray] = None
+        ) -> None:
+            nonlocal last
+            if merge and last is not None and abs(last[0] - timestamp) < merge_window:
+                # Keep the one with higher score
+                if score <= last[2]:
+                    return
+            elif last is not None:
+                selector.add(last[0], last[2], last)
+            # The analysis frame buffer is reused by the scan; keep a copy
+            gray = gray.copy() if gray is not None else None
+            last = (timestamp, reason, score, frame, change_box, gray)
+        
+        stride = self._analysis_stride(fps)
+        # Two converters used in turn: one holds the previous sample's
+        # analysis frame while the other prepares the current one
+        preparers = (self.scorer.buffered_prepare(), self.scorer.buffered_prepare())
+        adaptive = self._adaptive_threshold() if self.threshold_mode == "adaptive" else None
+        # Fast quality scoring reuses the scan's grayscale analysis frames
+        keep_grays = self.quality_mode == "fast" and self.scorer.scene_frames
+        prev_prepared = None
+        n_samples = 0
         frame_idx = 0
         
         cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
         
-        while True:
+        while detect_scenes or frame_idx <= last_target:
+            sample = frame_idx % stride == 0 and detect_scenes
+            if not sample and frame_idx not in pending:
+                if not cap.grab():
+                    break
+                frame_idx += 1
+                continue
+            
             ret, frame = cap.read()
             if not ret:
                 break
             
-            if prev_frame is not None:
-                # Calculate scene change score
-                score = self._calculate_scene_change(prev_frame, frame)
-                
-                if score > self.scene_threshold:
-                    timestamp = frame_idx / fps
-                    timestamps.append((timestamp, "scene_change", score))
+            gray = None
+            if sample:
+                prepared = preparers[n_samples % 2](frame)
+                n_samples += 1
+                if keep_grays:
+                    gray = prepared
+                if prev_prepared is not None:
+                    score = self._scene_change_score(prev_prepared, prepared)
+                    if adaptive is not None:
+                        is_change = adaptive.update(frame_idx / fps, score)
+                    else:
+                        is_change = score > self.scene_threshold
+                    if is_change:
+                        change_box = self.scorer.change_box(prev_prepared, prepared)
+                        add_candidate(
+                            frame_idx / fps, "scene_change", score, frame, change_box, gray
+                        )
+                prev_prepared = prepared
             
-            prev_frame = frame
-            frame_idx += 1
+            for timestamp, reason, score in pending.get(frame_idx, []):
+                add_candidate(timestamp, reason, score, frame, gray=gray)
             
-            # Sample every N frames for efficiency
-            if frame_idx % 30 == 0:  # Check every 30 frames (~0.5s at 60fps)
-                continue
+            frame_idx += 1
         
-        return timestamps
+        if last is not None:
+            selector.add(last[0], last[2], last)
+        if len(selector) > self.max_frames_per_video:
+            logger.debug(f"Selected {self.max_frames_per_video} of {len(selector)} candidates")
+        return selector.selected()
+    
+    def _limit_candidates(self, candidates: List[tuple], duration: float) -> List[tuple]:
+        """Select the best candidates within ``max_frames_per_video``.
+        
+        Runs before any candidate frame is decoded, so dropped candidates
+        are never decoded or quality-checked.
+        
+        Args:
+            candidates: Candidate tuples (timestamp, reason, score, ...)
+                sorted by timestamp.
+            duration: Video duration in seconds, for coverage windows.
+        
+        Returns:
+            The candidates unchanged if within the limit, otherwise the
+            best of each coverage window plus the highest-scoring others,
+            sorted by timestamp.
+        """
+        if len(candidates) <= self.max_frames_per_video:
+            return candidates
+        
+        selector = self._candidate_selector(duration)
+        for candidate in candidates:
+            selector.add(candidate[0], candidate[2], candidate)
+        return selector.selected()
+    
+    def _adaptive_threshold(self) -> AdaptiveThreshold:
+        """Create the per-video detector for the 'adaptive' threshold mode."""
+        return AdaptiveThreshold(
+            k=self.adaptive_k,
+            window=self.adaptive_window,
+            min_gap=self.min_scene_gap,
+            fallback=self.scene_threshold,
+        )
+    
+    def _create_quality_assessor(self) -> FrameQualityAssessor:
+        """Create the per-video frame quality assessor."""
+        return FrameQualityAssessor(mode=self.quality_mode, gain=self.quality_gain)
+    
+    def _candidate_selector(self, duration: float) -> CandidateSelector:
+        """Create the selector enforcing the frame budget and coverage."""
+        return CandidateSelector(
+            budget=self.max_frames_per_video,
+            duration=duration,
+            window=self.coverage_window,
+        )
     
     def _extract_by_transcript(
         self,
@@ -412,20 +2097,18 @@ class FrameExtractor:
         
         Note:
             Only extracts one frame per segment, even if multiple keywords
-            are present.
+            are present; the reason names the keyword listed first. Keywords
+            only match whole words ("tab" does not match "table").
         """
         timestamps = []
         
         for segment in transcript.segments:
-            text_lower = segment.text.lower()
-            
-            # Check for action keywords
-            for keyword in self.ACTION_KEYWORDS:
-                if keyword in text_lower:
-                    # Extract at the middle of the segment
-                    timestamp = (segment.start + segment.end) / 2
-                    timestamps.append((timestamp, f"keyword:{keyword}", 1.0))
-                    break  # One frame per segment
+            # One pass over the segment finds every action keyword
+            keyword = self.keyword_matcher.first(segment.text)
+            if keyword is not None:
+                # Extract at the middle of the segment
+                timestamp = (segment.start + segment.end) / 2
+                timestamps.append((timestamp, f"keyword:{keyword}", 1.0))
         
         return timestamps
     
@@ -471,6 +2154,23 @@ class FrameExtractor:
         
         return merged
     
+    @staticmethod
+    def _frame_index(timestamp: float, fps: float) -> int:
+        """Return the index of the frame shown at a timestamp.
+        
+        Scans report frame ``i`` at ``i / fps``, which does not always
+        multiply back to ``i`` exactly (``123 / 30 * 30`` is just below
+        123), so a tiny tolerance is allowed before rounding down.
+        
+        Args:
+            timestamp: Time in seconds.
+            fps: Frames per second of the video.
+        
+        Returns:
+            Frame index.
+        """
+        return int(timestamp * fps + 1e-6)
+    
     def _extract_frame_at_timestamp(
         self,
         cap: cv2.VideoCapture,
@@ -487,7 +2187,7 @@ class FrameExtractor:
         Returns:
             Frame as numpy array (BGR format), or None if extraction fails.
         """
-        frame_number = int(timestamp * fps)
+        frame_number = self._frame_index(timestamp, fps)
         cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
         
         ret, frame = cap.read()
@@ -503,9 +2203,10 @@ class FrameExtractor:
     ) -> float:
         """Calculate scene change score between two frames.
         
-        Computes the visual difference between consecutive frames using
-        grayscale conversion and absolute difference. Higher scores indicate
-        more significant visual changes.
+        Computes the visual difference between consecutive frames with the
+        configured scorer (by default, the mean absolute difference of the
+        grayscale frames). Higher scores indicate more significant visual
+        changes.
         
         Args:
             frame1: First frame as numpy array (BGR format).
@@ -521,21 +2222,21 @@ class FrameExtractor:
             Frames are resized to 320x240 for faster computation without
             significant loss in change detection accuracy.
         """
-        # Convert to grayscale
-        gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
-        
-        # Resize for faster computation
-        gray1 = cv2.resize(gray1, (320, 240))
-        gray2 = cv2.resize(gray2, (320, 240))
-        
-        # Calculate absolute difference
-        diff = cv2.absdiff(gray1, gray2)
+        return self._scene_change_score(
+            self.scorer.prepare(frame1), self.scorer.prepare(frame2)
+        )
+    
+    def _scene_change_score(self, prepared1: np.ndarray, prepared2: np.ndarray) -> float:
+        """Score the change between two frames prepared by the scorer.
         
-        # Calculate mean difference (normalized to 0-1)
-        score = np.mean(diff) / 255.0
+        Args:
+            prepared1: First analysis frame (see :meth:`SceneScorer.prepare`).
+            prepared2: Second analysis frame of the same shape.
         
-        return score
+        Returns:
+            Scene change score normalized to 0-1.
+        """
+        return self.scorer.score(prepared1, prepared2)
     
     def _assess_frame_quality(self, frame: np.ndarray) -> float:
         """Assess frame quality using blur detection.
@@ -558,18 +2259,12 @@ class FrameExtractor:
             - <100 = blurry
             - 100-500 = acceptable
             - >500 = sharp
+            
+            This is the 'full' quality mode; see
+            :class:`~framewise.core.frame_quality.FrameQualityAssessor` for
+            the downscaled 'fast' mode.
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Calculate Laplacian variance (blur detection)
-        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-        
-        # Normalize to 0-1 range (higher = sharper)
-        # Typical values: <100 = blurry, >500 = sharp
-        quality = min(laplacian_var / 500.0, 1.0)
-        
-        return quality
+        return sharpness_score(frame)
     
     def _find_transcript_segment(
         self,
@@ -588,28 +2283,113 @@ class FrameExtractor:
         Note:
             First tries to find a segment that contains the timestamp.
             If none found, returns the closest segment within 2 seconds.
+            Lookups use the transcript's interval index, so they take
+            O(log n) in the number of segments.
         """
-        # Try to find segment containing the timestamp
-        for segment in transcript.segments:
-            if segment.start <= timestamp <= segment.end:
-                return segment
+        return transcript.index.lookup(timestamp, tolerance=2.0)
+    
+    def _cache_settings(self, transcript: Optional[Transcript]) -> Dict:
+        """Settings that determine the extraction result, for the cache key.
         
-        # Find closest segment if not within any
-        closest = min(
-            transcript.segments,
-            key=lambda s: min(abs(s.start - timestamp), abs(s.end - timestamp))
-        )
+        Settings that only affect speed (workers, seek cost, writer threads)
+        are left out so they do not invalidate cached results.
+        """
+        return {
+            "strategy": self.strategy,
+            "max_frames_per_video": self.max_frames_per_video,
+            "scene_threshold": self.scene_threshold,
+            "threshold_mode": self.threshold_mode,
+            "adaptive_k": self.adaptive_k,
+            "adaptive_window": self.adaptive_window,
+            "min_scene_gap": self.min_scene_gap,
+            "quality_threshold": self.quality_threshold,
+            "quality_mode": self.quality_mode,
+            "quality_gain": self.quality_gain,
+            "analysis_fps": self.analysis_fps,
+            "single_pass": self.single_pass,
+            "coverage_window": self.coverage_window,
+            "decoder": self.decoder,
+            "keyframe_prepass": self.keyframe_prepass,
+            "refine_boundaries": self.refine_boundaries,
+            "scorer": self.scorer.name,
+            "scorer_settings": self.scorer.settings,
+            "duplicate_hash_radius": self.duplicate_hash_radius,
+            "image_format": self.image_format,
+            "image_quality": self.image_quality,
+            "save_max_size": self.save_max_size,
+            "frame_storage": self.frame_storage,
+            "probe": self.probe,
+            "collapse_static": self.collapse_static,
+            "static_threshold": self.static_threshold,
+            "static_after": self.static_after,
+            "max_static_skip": self.max_static_skip,
+            "action_keywords": self.keyword_matcher.keywords,
+            "transcript": (
+                [segment.to_dict() for segment in transcript.segments]
+                if transcript is not None else None
+            ),
+        }
+    
+    def _create_writer(self, shard_path: Optional[Path] = None) -> FrameWriter:
+        """Create the image writer for one extraction.
         
-        # Only return if reasonably close (within 2 seconds)
-        if min(abs(closest.start - timestamp), abs(closest.end - timestamp)) < 2.0:
-            return closest
+        Args:
+            shard_path: Shard to append frames to, or None to write one
+                file per frame. Defaults to None.
+        """
+        options = dict(
+            image_format=self.image_format,
+            quality=self.image_quality,
+            max_size=self.save_max_size,
+            threads=self.writer_threads,
+            queue_size=self.writer_queue_size,
+        )
+        if shard_path is not None:
+            return ShardWriter(shard_path, **options)
+        return FrameWriter(**options)
+    
+    @staticmethod
+    def _record_location(frame: ExtractedFrame, written: Union[Path, ShardLocation]) -> None:
+        """Store where a finished write put the frame inside its shard."""
+        if isinstance(written, ShardLocation):
+            frame.offset, frame.length = written
+    
+    def _finished_writes(
+        self,
+        pending: Deque[Tuple[Future, ExtractedFrame]],
+        written: List[ExtractedFrame],
+        wait: bool = False
+    ) -> Iterator[ExtractedFrame]:
+        """Yield queued frames whose image has been written, in order.
         
-        return None
+        Args:
+            pending: Queued (write future, frame) pairs in candidate order.
+                Finished entries are removed from the front.
+            written: List the successfully written frames are appended to.
+            wait: Wait for every pending write instead of stopping at the
+                first unfinished one. Defaults to False.
+        
+        Yields:
+            Frames whose image was written successfully. Frames whose write
+            failed are logged and dropped.
+        """
+        while pending and (wait or pending[0][0].done()):
+            future, frame = pending.popleft()
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Failed to write {frame.path}: {error}")
+                continue
+            self._record_location(frame, future.result())
+            written.append(frame)
+            logger.debug(f"Extracted: {frame.path.name}")
+            yield frame
     
     def _save_metadata(
         self,
         frames: List[ExtractedFrame],
-        output_dir: Path
+        output_dir: Path,
+        duplicates: Optional[List[Dict]] = None,
+        fetch_stats: Optional[FetchStats] = None
     ) -> None:
         """Save frame metadata to JSON file.
         
@@ -619,6 +2399,12 @@ class FrameExtractor:
         Args:
             frames: List of extracted frames.
             output_dir: Directory where metadata.json will be saved.
+            duplicates: Candidates dropped as near-duplicates, each with the
+                frame ID it duplicates. Omitted from the file when None.
+                Defaults to None.
+            fetch_stats: Seek and decode counters from fetching the
+                candidate frames. Omitted from the file when None.
+                Defaults to None.
         
         Raises:
             IOError: If the metadata file cannot be written.
@@ -627,9 +2413,51 @@ class FrameExtractor:
             "total_frames": len(frames),
             "frames": [frame.to_dict() for frame in frames]
         }
+        if duplicates is not None:
+            metadata["duplicates"] = duplicates
+        if fetch_stats is not None:
+            metadata["fetch_stats"] = fetch_stats.to_dict()
         
         metadata_path = output_dir / "metadata.json"
         with open(metadata_path, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
         
         logger.debug(f"Saved metadata to {metadata_path}")
+
+
+def _extract_video(
+    extractor: FrameExtractor,
+    video_path: Path,
+    transcript: Optional[Transcript],
+    output_dir: Path
+) -> List[ExtractedFrame]:
+    """Extract one video of a batch in a worker process.
+    
+    Module-level so it can be pickled by ``ProcessPoolExecutor``.
+    """
+    return extractor.extract(video_path, transcript, output_dir)
+
+
+def _scan_scene_range(
+    extractor: FrameExtractor,
+    video_path: str,
+    fps: float,
+    start_frame: int,
+    end_frame: Optional[int]
+) -> List[Tuple[float, str, float]]:
+    """Scan one frame range for scene changes in a worker process.
+    
+    Module-level so it can be pickled by ``ProcessPoolExecutor``.
+    """
+    if extractor.decoder == "ffmpeg":
+        return extractor._scan_range(
+            None, fps, start_frame, end_frame, video_path=Path(video_path)
+        )
+    
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"Failed to open video: {video_path}")
+    try:
+        return extractor._scan_range(cap, fps, start_frame, end_frame)
+    finally:
+        cap.release()
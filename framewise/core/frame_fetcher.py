@@ -0,0 +1,179 @@
+"""Seek-minimizing retrieval of candidate frames from a video.
+
+Seeking with ``cap.set(CAP_PROP_POS_FRAMES, ...)`` makes OpenCV jump to the
+previous keyframe and decode forward to the target, so fetching candidates
+that are only a few frames apart with one seek each decodes the same
+stretch of video again and again. :class:`FrameFetcher` reads candidates in
+increasing order and skips short gaps with ``grab()``, seeking only when the
+gap is long enough that a seek is cheaper.
+
+Given the video's keyframe positions (see
+:func:`~framewise.core.video_probe.probe_video`), the choice is exact: a
+seek decodes from the last keyframe at or before the target, so it only
+pays off when that keyframe lies well past the current position.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.frame_fetcher import FrameFetcher
+        
+        fetcher = FrameFetcher(cap, seek_cost_frames=60)
+        for frame_idx, frame in fetcher.fetch_many([300, 310, 5000]):
+            ...
+        print(fetcher.stats.to_dict())
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import bisect
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import cv2
+import numpy as np
+
+# Fixed cost of a seek (demuxer reset, decoder flush), in frames decoded
+SEEK_OVERHEAD_FRAMES = 8
+
+
+@dataclass
+class FetchStats:
+    """Counters describing how candidate frames were fetched.
+    
+    Attributes:
+        seeks: Number of ``cap.set`` seeks issued.
+        grabbed: Number of frames skipped with ``grab()``.
+        decoded: Number of frames decoded with ``read()``.
+        per_frame: One entry per fetched frame with its index, whether it
+            needed a seek, and how many frames were grabbed to reach it.
+    """
+    
+    seeks: int = 0
+    grabbed: int = 0
+    decoded: int = 0
+    per_frame: List[Dict[str, Union[int, bool]]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Union[int, List]]:
+        """Convert stats to dictionary format."""
+        return {
+            "seeks": self.seeks,
+            "grabbed": self.grabbed,
+            "decoded": self.decoded,
+            "per_frame": self.per_frame,
+        }
+
+
+class FrameFetcher:
+    """Fetch frames by index, reading forward instead of seeking when cheaper.
+    
+    Attributes:
+        cap: The VideoCapture frames are read from.
+        seek_cost_frames: Estimated cost of a seek, in frames decoded. Gaps
+            up to this many frames are read through with ``grab()``; longer
+            gaps (and any backward jump) use a seek. Only used when the
+            keyframe positions are unknown.
+        keyframes: Sorted keyframe indices of the video, or None.
+        record_frames: Whether ``stats.per_frame`` gets an entry per fetch.
+        stats: Seek and decode counters.
+    """
+    
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        seek_cost_frames: int = 60,
+        keyframes: Optional[Sequence[int]] = None,
+        record_frames: bool = True
+    ) -> None:
+        """Initialize the fetcher.
+        
+        Args:
+            cap: Opened OpenCV VideoCapture object. Its current position is
+                taken as the starting point.
+            seek_cost_frames: Estimated cost of a seek, in frames. A good
+                value is about the video's keyframe interval. Defaults to 60.
+            keyframes: Sorted keyframe indices of the video. When given, a
+                seek is issued only if the keyframe it would decode from is
+                more than ``SEEK_OVERHEAD_FRAMES`` past the current
+                position. Defaults to None.
+            record_frames: Record an entry per fetched frame in
+                ``stats.per_frame``. Disable for long scans. Defaults to True.
+        """
+        self.cap = cap
+        self.seek_cost_frames = seek_cost_frames
+        self.keyframes = list(keyframes) if keyframes else None
+        self.record_frames = record_frames
+        self.stats = FetchStats()
+        self._position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    
+    def fetch(
+        self,
+        frame_idx: int,
+        buffer: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """Fetch a single frame.
+        
+        Args:
+            frame_idx: Index of the frame to read.
+            buffer: Array to decode into, e.g. the frame returned by the
+                previous call. Defaults to None (a new array).
+        
+        Returns:
+            Frame as numpy array (BGR format), or None if it cannot be read.
+        """
+        gap = frame_idx - self._position
+        seeked = self._should_seek(frame_idx, gap)
+        grabbed = 0
+        ret = True
+        
+        if seeked:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            self.stats.seeks += 1
+        else:
+            for _ in range(gap):
+                ret = self.cap.grab()
+                if not ret:
+                    break
+                grabbed += 1
+            self.stats.grabbed += grabbed
+        
+        frame = None
+        if ret:
+            ret, frame = self.cap.read(buffer)
+        if self.record_frames:
+            self.stats.per_frame.append(
+                {"frame_index": frame_idx, "seek": seeked, "grabbed": grabbed}
+            )
+        if not ret:
+            # Position is unknown after a failed read; force a seek next time
+            self._position = -1
+            return None
+        
+        self.stats.decoded += 1
+        self._position = frame_idx + 1
+        return frame
+    
+    def _should_seek(self, frame_idx: int, gap: int) -> bool:
+        """Whether seeking to a frame is cheaper than reading forward to it."""
+        if gap < 0 or self._position < 0:
+            return True
+        if self.keyframes is None:
+            return gap > self.seek_cost_frames
+        # A seek decodes from the last keyframe at or before the target
+        i = bisect.bisect_right(self.keyframes, frame_idx)
+        if i == 0:
+            return False
+        return self.keyframes[i - 1] - self._position > SEEK_OVERHEAD_FRAMES
+    
+    def fetch_many(
+        self,
+        frame_indices: Iterable[int]
+    ) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """Fetch several frames in increasing index order.
+        
+        Args:
+            frame_indices: Frame indices to read, in any order.
+        
+        Yields:
+            Tuples of (frame_index, frame or None), sorted by index.
+        """
+        for frame_idx in sorted(set(frame_indices)):
+            yield frame_idx, self.fetch(frame_idx)
@@ -0,0 +1,259 @@
+"""Packed shard storage for extracted frame images.
+
+Writing one image file per frame leaves millions of small files across a
+large corpus, which wastes inodes, slows backups and turns batch embedding
+into many small random reads. In shard storage, the encoded images of a
+video are appended to a single ``frames.shard`` file instead. Each frame is
+then located by the shard path plus its byte offset and length, which are
+recorded in metadata.json next to the other frame fields.
+
+A shard is a plain concatenation of encoded images (JPEG, WebP or PNG), so
+any frame can be cut out with ``dd`` or a few lines of Python. Readers map
+the shard into memory with ``mmap`` and decode frames straight from the
+mapping, without a copy.
+
+A frame's location is written as a single string, e.g. in the
+``frame_path`` of an embedding, as ``<shard path>#<offset>:<length>``.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.frame_shard import ShardReader
+        
+        with ShardReader("frames/frames.shard") as reader:
+            image = reader.decode(offset, length)
+        
+        image = load_shard_ref("frames/frames.shard#1024:53310")
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple, Union
+import cv2
+import numpy as np
+
+from framewise.core.frame_writer import FrameWriter
+
+SHARD_NAME = "frames.shard"
+
+_SHARD_REF = re.compile(r"^(?P<path>.+\.shard)#(?P<offset>\d+):(?P<length>\d+)$")
+
+# Shards kept mapped by load_shard_ref
+_OPEN_SHARDS = 16
+
+
+class ShardLocation(NamedTuple):
+    """Byte range of one encoded frame inside a shard."""
+    
+    offset: int
+    length: int
+
+
+def format_shard_ref(path: Union[str, Path], offset: int, length: int) -> str:
+    """Format a frame location as ``<shard path>#<offset>:<length>``."""
+    return f"{path}#{offset}:{length}"
+
+
+def parse_shard_ref(ref: str) -> Optional[Tuple[Path, ShardLocation]]:
+    """Parse a string made by :func:`format_shard_ref`.
+    
+    Args:
+        ref: Frame location string.
+    
+    Returns:
+        The shard path and frame location, or None if ``ref`` is not a
+        shard reference (e.g. a plain image path).
+    """
+    match = _SHARD_REF.match(ref)
+    if match is None:
+        return None
+    return Path(match["path"]), ShardLocation(int(match["offset"]), int(match["length"]))
+
+
+class ShardWriter(FrameWriter):
+    """Encode frames on the writer pool and append them to one shard file.
+    
+    Frames are appended in the order their encoding finishes; the
+    :class:`ShardLocation` each write returns is what locates the frame.
+    Each frame is flushed to :attr:`shard_path` before its write returns,
+    so frames can be read back while the extraction is still running. An
+    existing shard is unlinked rather than truncated before the first
+    write, so readers that still map it (or a cache entry linked to it)
+    keep the old contents. No file is created if nothing was written.
+    
+    Attributes:
+        shard_path: Path of the shard file.
+    """
+    
+    def __init__(self, shard_path: Union[str, Path], **kwargs) -> None:
+        """Initialize the writer.
+        
+        Args:
+            shard_path: Path of the shard file to create.
+            **kwargs: Encoding and threading options of
+                :class:`~framewise.core.frame_writer.FrameWriter`.
+        """
+        super().__init__(**kwargs)
+        self.shard_path = Path(shard_path)
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def write(self, frame: np.ndarray, path: Union[str, Path, None] = None) -> ShardLocation:
+        """Encode a frame and append it to the shard.
+        
+        Args:
+            frame: Frame as numpy array (BGR format).
+            path: Ignored; all frames go to :attr:`shard_path`.
+        
+        Returns:
+            Where the encoded frame was written.
+        
+        Raises:
+            IOError: If the frame cannot be encoded or written.
+        """
+        data = self.encode(frame)
+        with self._lock:
+            if self._file is None:
+                self.shard_path.unlink(missing_ok=True)
+                self._file = open(self.shard_path, "wb")
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+        return ShardLocation(offset, len(data))
+    
+    def close(self) -> None:
+        """Wait for all queued writes, then close the shard."""
+        super().close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ShardReader:
+    """Read and decode frames from a memory-mapped shard.
+    
+    Attributes:
+        path: Path of the shard file.
+    """
+    
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Map a shard into memory.
+        
+        Args:
+            path: Path of the shard file.
+        
+        Raises:
+            FileNotFoundError: If the shard doesn't exist.
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def __enter__(self) -> "ShardReader":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        """Size of the shard in bytes."""
+        return len(self._map)
+    
+    def read(self, offset: int, length: int) -> memoryview:
+        """Return the encoded bytes of one frame, without copying.
+        
+        Raises:
+            ValueError: If the range lies outside the shard.
+        """
+        if offset < 0 or offset + length > len(self._map):
+            raise ValueError(
+                f"Frame at {offset}:{length} lies outside {self.path} ({len(self._map)} bytes)"
+            )
+        return memoryview(self._map)[offset:offset + length]
+    
+    def decode(self, offset: int, length: int) -> np.ndarray:
+        """Decode one frame.
+        
+        Args:
+            offset: Byte offset of the encoded frame.
+            length: Length in bytes of the encoded frame.
+        
+        Returns:
+            Frame as numpy array (BGR format).
+        
+        Raises:
+            ValueError: If the range lies outside the shard or does not hold
+                a decodable image.
+        """
+        data = self.read(offset, length)
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        data.release()
+        if image is None:
+            raise ValueError(f"No decodable image at {offset}:{length} in {self.path}")
+        return image
+    
+    def close(self) -> None:
+        """Unmap the shard."""
+        self._map.close()
+
+
+_readers: "OrderedDict[Tuple, ShardReader]" = OrderedDict()
+_readers_lock = threading.Lock()
+
+
+def read_shard_frame(path: Union[str, Path], offset: int, length: int) -> np.ndarray:
+    """Decode a frame from a shard, reusing recently opened mappings.
+    
+    Up to 16 shards stay mapped. A shard replaced on disk (by a new
+    extraction) or grown since it was mapped is mapped again.
+    
+    Args:
+        path: Path of the shard file.
+        offset: Byte offset of the encoded frame.
+        length: Length in bytes of the encoded frame.
+    
+    Returns:
+        Frame as numpy array (BGR format).
+    
+    Raises:
+        FileNotFoundError: If the shard doesn't exist.
+        ValueError: If no image can be decoded at that location.
+    """
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = ShardReader(path)
+            _readers[key] = reader
+            if len(_readers) > _OPEN_SHARDS:
+                # Drop the reference only; in-flight decodes keep their map
+                _readers.popitem(last=False)
+        _readers.move_to_end(key)
+    return reader.decode(offset, length)
+
+
+def load_shard_ref(ref: str) -> np.ndarray:
+    """Decode the frame a :func:`format_shard_ref` string points to.
+    
+    Args:
+        ref: Frame location string.
+    
+    Returns:
+        Frame as numpy array (BGR format).
+    
+    Raises:
+        ValueError: If ``ref`` is not a shard reference or holds no image.
+        FileNotFoundError: If the shard doesn't exist.
+    """
+    parsed = parse_shard_ref(ref)
+    if parsed is None:
+        raise ValueError(f"Not a shard reference: {ref}")
+    path, location = parsed
+    return read_shard_frame(path, location.offset, location.length)
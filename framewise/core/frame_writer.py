@@ -0,0 +1,234 @@
+"""Background encoding and writing of extracted frame images.
+
+Encoding a full-resolution frame and writing it to disk takes longer than
+decoding it, so doing both inline stalls the extraction loop. OpenCV
+releases the GIL while encoding, which lets :class:`FrameWriter` encode and
+write frames on a small thread pool while the caller keeps decoding. The
+number of frames waiting to be written is bounded, so memory stays flat
+when the disk is slower than the decoder.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.frame_writer import FrameWriter
+        
+        with FrameWriter(image_format="webp", quality=80, max_size=1280) as writer:
+            for path, frame in frames:
+                writer.submit(frame, path)
+        # Every write has finished (or failed) here
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Union
+import cv2
+import numpy as np
+
+# Supported formats and their default quality (PNG: compression level 0-9)
+IMAGE_FORMATS = {"jpg": 95, "webp": 90, "png": 3}
+_MAX_QUALITY = {"jpg": 100, "webp": 100, "png": 9}
+
+_QUALITY_FLAGS = {
+    "jpg": cv2.IMWRITE_JPEG_QUALITY,
+    "webp": cv2.IMWRITE_WEBP_QUALITY,
+    "png": cv2.IMWRITE_PNG_COMPRESSION,
+}
+
+
+def check_writer_options(
+    image_format: str = "jpg",
+    quality: Optional[int] = None,
+    max_size: Optional[int] = None,
+    threads: int = 2,
+    queue_size: int = 8,
+) -> None:
+    """Validate :class:`FrameWriter` options without creating a writer.
+    
+    Args:
+        image_format: Output format: 'jpg', 'webp' or 'png'.
+        quality: JPEG/WebP quality (0-100) or PNG compression level (0-9),
+            or None for the format's default.
+        max_size: Longest side frames are downscaled to, or None.
+        threads: Number of writer threads.
+        queue_size: Maximum number of frames waiting to be written.
+    
+    Raises:
+        ValueError: If the format is unknown, quality is out of range for
+            the format, threads is negative, or queue_size or max_size is
+            not positive.
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(
+            f"Invalid image_format '{image_format}'. "
+            f"Must be one of: {', '.join(IMAGE_FORMATS)}"
+        )
+    if quality is not None and not 0 <= quality <= _MAX_QUALITY[image_format]:
+        raise ValueError(
+            f"quality for '{image_format}' must be between 0 and "
+            f"{_MAX_QUALITY[image_format]}, got {quality}"
+        )
+    if threads < 0:
+        raise ValueError(f"threads must not be negative, got {threads}")
+    if queue_size < 1:
+        raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+    if max_size is not None and max_size < 1:
+        raise ValueError(f"max_size must be positive, got {max_size}")
+
+
+class FrameWriter:
+    """Encode and write frame images on a bounded thread pool.
+    
+    Attributes:
+        image_format: Output format ('jpg', 'webp' or 'png').
+        quality: JPEG/WebP quality (0-100) or PNG compression level (0-9).
+        max_size: Longest side, in pixels, frames are downscaled to before
+            encoding, or None to keep the original resolution.
+        threads: Number of writer threads. 0 writes inline in the caller.
+        queue_size: Maximum number of submitted frames not yet written;
+            :meth:`submit` blocks while the queue is full.
+    """
+    
+    def __init__(
+        self,
+        image_format: str = "jpg",
+        quality: Optional[int] = None,
+        max_size: Optional[int] = None,
+        threads: int = 2,
+        queue_size: int = 8,
+    ) -> None:
+        """Initialize the writer.
+        
+        Args:
+            image_format: Output format: 'jpg', 'webp' or 'png'.
+                Defaults to 'jpg'.
+            quality: JPEG/WebP quality (0-100) or PNG compression level
+                (0-9). Defaults to 95 for JPEG, 90 for WebP and 3 for PNG.
+            max_size: Downscale frames so their longest side is at most this
+                many pixels. None keeps the original resolution.
+                Defaults to None.
+            threads: Number of writer threads. 0 encodes and writes inline
+                in :meth:`submit`. Defaults to 2.
+            queue_size: Maximum number of frames waiting to be written.
+                Defaults to 8.
+        
+        Raises:
+            ValueError: If the format is unknown, quality is out of range for
+                the format, threads is negative, or queue_size or max_size is
+                not positive.
+        """
+        check_writer_options(image_format, quality, max_size, threads, queue_size)
+        
+        self.image_format = image_format
+        self.quality = IMAGE_FORMATS[image_format] if quality is None else quality
+        self.max_size = max_size
+        self.threads = threads
+        self.queue_size = queue_size
+        
+        self._params: List[int] = [_QUALITY_FLAGS[image_format], self.quality]
+        self._executor = (
+            ThreadPoolExecutor(max_workers=threads, thread_name_prefix="frame-writer")
+            if threads > 0 else None
+        )
+        self._slots = threading.BoundedSemaphore(queue_size)
+    
+    @property
+    def extension(self) -> str:
+        """File extension (without dot) of written images."""
+        return self.image_format
+    
+    def __enter__(self) -> "FrameWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def resize(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a frame to ``max_size`` (a no-op if it already fits)."""
+        if self.max_size is None:
+            return frame
+        height, width = frame.shape[:2]
+        scale = self.max_size / max(height, width)
+        if scale >= 1:
+            return frame
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
+    def write(self, frame: np.ndarray, path: Union[str, Path]) -> Path:
+        """Encode and write a frame synchronously.
+        
+        Args:
+            frame: Frame as numpy array (BGR format).
+            path: Destination file path.
+        
+        Returns:
+            The path written.
+        
+        Raises:
+            IOError: If the frame cannot be encoded or written.
+        """
+        path = Path(path)
+        # Replace rather than overwrite: the old file may be hard-linked
+        # into the extraction cache
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            temp_path.write_bytes(self.encode(frame))
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return path
+    
+    def encode(self, frame: np.ndarray) -> bytes:
+        """Resize and encode a frame in the configured format.
+        
+        Args:
+            frame: Frame as numpy array (BGR format).
+        
+        Returns:
+            The encoded image.
+        
+        Raises:
+            IOError: If the frame cannot be encoded.
+        """
+        ok, encoded = cv2.imencode(f".{self.extension}", self.resize(frame), self._params)
+        if not ok:
+            raise IOError(f"Failed to encode frame as {self.image_format}")
+        return encoded.tobytes()
+    
+    def submit(self, frame: np.ndarray, path: Union[str, Path]) -> Future:
+        """Queue a frame for writing, blocking while the queue is full.
+        
+        The caller must not modify ``frame`` until the write has finished.
+        
+        Args:
+            frame: Frame as numpy array (BGR format).
+            path: Destination file path.
+        
+        Returns:
+            Future resolving to the written path, or raising the write error.
+        """
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(self.write(frame, path))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self.write, frame, path)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+    
+    def close(self) -> None:
+        """Wait for all queued writes to finish and stop the threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,147 @@
+"""Compiled whole-word keyword matching for transcript-driven frame selection.
+
+Testing every keyword against every segment with ``keyword in text`` costs
+one scan per keyword and also matches inside words ("tab" in "table").
+:class:`KeywordMatcher` compiles the whole vocabulary into one regular
+expression, so each segment is scanned once whatever the vocabulary size,
+and only whole words or phrases match.
+
+The expression is built from a trie of the keywords, so keywords that share
+a prefix share the work of matching it. This keeps matching fast for
+vocabularies of thousands of domain verbs, where a flat alternation would
+try every keyword at every position.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.keyword_matcher import KeywordMatcher
+        
+        matcher = KeywordMatcher(["click", "tab", "log in"])
+        matcher.findall("Log in, then click the Tab key")  # ['log in', 'click', 'tab']
+        matcher.findall("Open the table")                   # []
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class KeywordMatcher:
+    """Match a vocabulary of whole-word keywords in one pass.
+    
+    Matching is case-insensitive. Keywords may be phrases and may contain
+    punctuation; a keyword only matches where it is not directly preceded
+    or followed by a letter, digit or underscore.
+    
+    Attributes:
+        keywords: Normalized (lowercase, deduplicated) keywords in priority
+            order.
+        pattern: The compiled regular expression.
+    """
+    
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """Compile the matcher.
+        
+        Args:
+            keywords: Keywords or phrases to match. Earlier keywords take
+                priority in :meth:`first`.
+        """
+        self.keywords: List[str] = list(dict.fromkeys(
+            keyword.strip().lower() for keyword in keywords if keyword.strip()
+        ))
+        self._rank: Dict[str, int] = {keyword: i for i, keyword in enumerate(self.keywords)}
+        body = _trie_pattern(self.keywords) if self.keywords else "(?!)"
+        self.pattern = re.compile(rf"(?<!\w){body}(?!\w)")
+    
+    def __len__(self) -> int:
+        return len(self.keywords)
+    
+    def findall(self, text: str) -> List[str]:
+        """Find every keyword in a text.
+        
+        Matches do not overlap, and where several keywords match at the same
+        position the longest wins, so "open menu" hides "open" in it.
+        
+        Args:
+            text: Text to search.
+        
+        Returns:
+            Keywords found, each once, in order of first occurrence.
+        """
+        return list(dict.fromkeys(self.pattern.findall(text.lower())))
+    
+    def first(self, text: str) -> Optional[str]:
+        """Find the highest-priority keyword in a text.
+        
+        Unlike :meth:`findall`, this considers every keyword that matches,
+        including ones inside or overlapping a longer match, so an earlier
+        "open" wins over a later "open menu".
+        
+        Args:
+            text: Text to search.
+        
+        Returns:
+            The matching keyword that comes first in :attr:`keywords`, or
+            None if no keyword matches.
+        """
+        best = None
+        for keyword in self._all_matches(text.lower()):
+            rank = self._rank[keyword]
+            if best is None or rank < self._rank[best]:
+                best = keyword
+                if rank == 0:
+                    break
+        return best
+    
+    def _all_matches(self, text: str) -> Iterator[str]:
+        """Yield every keyword occurrence, overlapping ones included.
+        
+        The pattern returns the longest keyword at each position, so the
+        search restarts one character after each match start, and the
+        keywords that are whole-word prefixes of each match are yielded too.
+        """
+        pos = 0
+        while True:
+            match = self.pattern.search(text, pos)
+            if match is None:
+                return
+            matched = match.group()
+            for end in range(1, len(matched)):
+                if not _WORD_CHAR.match(matched, end) and matched[:end] in self._rank:
+                    yield matched[:end]
+            yield matched
+            pos = match.start() + 1
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Build a regular expression matching any of ``words`` from a trie.
+    
+    Longer keywords are tried before their prefixes, so "table" wins over
+    "tab" where both would match.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a keyword
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict) -> str:
+    """Regular expression for the suffixes below one trie node."""
+    branches = [
+        re.escape(char) + _node_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    is_end = "" in node
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if is_end else group
@@ -0,0 +1,195 @@
+"""Scene scanning that skips through long static stretches.
+
+Tutorial and lecture recordings often stay on one screen for minutes while
+the narrator talks, and a dense scan decodes and compares every sampled
+frame of those stretches for nothing. :class:`StaticSegmentScanner` scans
+densely until ``static_after`` consecutive samples barely differ, which
+marks the start of a static run. From there it moves ahead in steps that
+double after every unchanged comparison, up to ``max_step`` frames. When a
+comparison shows a change, the jumped-over interval is bisected back down
+to the first changed sample, and dense scanning resumes from there. A
+static run of ``n`` frames therefore costs about ``n / max_step`` decoded
+samples plus two ``log2(max_step)`` terms (ramping up and locating the
+end), instead of ``n / stride``.
+
+Each static run is reported once, so the caller can represent it by a
+single frame however long it lasts.
+
+A change that appears and disappears again within one jump (a popup shown
+for less than ``max_step`` frames) is not seen; keep ``max_step`` below
+the shortest change that must not be missed.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.static_skip import StaticSegmentScanner
+        
+        scanner = StaticSegmentScanner(fetch, score, stride=1, max_step=150)
+        for prev_idx, frame_idx, score in scanner.scan():
+            ...
+        print(scanner.runs, scanner.decoded)
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterator, List, Optional, Tuple
+import numpy as np
+
+
+class StaticSegmentScanner:
+    """Score consecutive samples, skipping exponentially through static runs.
+    
+    Attributes:
+        fetch: Function returning the analysis frame at a frame index, or
+            None past the end of the video. The returned array may be
+            reused by the next call.
+        score: Function scoring the change between two analysis frames.
+        stride: Distance between samples in dense scanning.
+        static_threshold: Scores at or below this count as unchanged.
+        static_after: Number of consecutive unchanged comparisons that start
+            a static run.
+        max_step: Longest jump in frames (a multiple of ``stride``).
+        runs: ``[start, end]`` frame indices of every static run found,
+            from the first frame of the run to the last sample known to be
+            unchanged.
+        decoded: Number of frames fetched, including bisection.
+    """
+    
+    def __init__(
+        self,
+        fetch: Callable[[int], Optional[np.ndarray]],
+        score: Callable[[np.ndarray, np.ndarray], float],
+        stride: int = 1,
+        static_threshold: float = 0.005,
+        static_after: int = 3,
+        max_step: int = 150
+    ) -> None:
+        """Initialize the scanner.
+        
+        Args:
+            fetch: Function returning the analysis frame at a frame index.
+            score: Function scoring two analysis frames.
+            stride: Distance between samples in dense scanning.
+                Defaults to 1.
+            static_threshold: Largest score counted as unchanged.
+                Defaults to 0.005.
+            static_after: Unchanged comparisons that start a static run.
+                Defaults to 3.
+            max_step: Longest jump in frames; rounded down to a multiple of
+                ``stride``. Defaults to 150.
+        
+        Raises:
+            ValueError: If static_after is below 1.
+        """
+        if static_after < 1:
+            raise ValueError(f"static_after must be at least 1, got {static_after}")
+        
+        self.fetch = fetch
+        self.score = score
+        self.stride = stride
+        self.static_threshold = static_threshold
+        self.static_after = static_after
+        self.max_step = max(stride, max_step // stride * stride)
+        self.runs: List[List[int]] = []
+        self.decoded = 0
+    
+    def scan(
+        self,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, float]]:
+        """Score samples from ``start_frame`` on.
+        
+        Args:
+            start_frame: Index of the first sample. Defaults to 0.
+            end_frame: Index at which scanning stops (exclusive), or None to
+                scan to the end of the video. A run still being confirmed
+                there is followed past ``end_frame`` until it is confirmed
+                or broken, so that a chunked scan reports it from the chunk
+                it starts in. Defaults to None.
+        
+        Yields:
+            Tuples of (previous_index, frame_index, score) for every
+            comparison made. Comparisons inside a run span a jump; the one
+            ending a run spans a single stride.
+        """
+        prev = self._fetch(start_frame)
+        if prev is None:
+            return
+        prev_idx = start_frame
+        static_count = 0
+        run_start = prev_idx
+        step = self.stride
+        
+        while True:
+            if end_frame is not None and prev_idx + self.stride >= end_frame:
+                # Follow a run starting in range until it is confirmed or broken
+                confirming = 0 < static_count < self.static_after and run_start < end_frame
+                if not confirming:
+                    return
+            
+            frame_idx = prev_idx + step
+            current = self._fetch(frame_idx)
+            if current is None:
+                if step == self.stride:
+                    return
+                # The video ended inside the jump: approach the end in smaller steps
+                step = max(self.stride, step // 2 // self.stride * self.stride)
+                continue
+            
+            score = self.score(prev, current)
+            if step > self.stride and score > self.static_threshold:
+                prev_idx, prev, frame_idx, current = self._bisect(
+                    prev_idx, prev, frame_idx, current
+                )
+                score = self.score(prev, current)
+            yield prev_idx, frame_idx, score
+            
+            if score <= self.static_threshold:
+                if static_count == 0:
+                    run_start = prev_idx
+                static_count += 1
+                if static_count == self.static_after:
+                    self.runs.append([run_start, frame_idx])
+                elif static_count > self.static_after:
+                    self.runs[-1][1] = frame_idx
+            else:
+                static_count = 0
+            
+            if static_count >= self.static_after:
+                step = min(step * 2, self.max_step)
+            else:
+                step = self.stride
+            prev_idx, prev = frame_idx, current
+    
+    def _fetch(self, frame_idx: int) -> Optional[np.ndarray]:
+        """Fetch an analysis frame and keep a copy of it."""
+        frame = self.fetch(frame_idx)
+        if frame is None:
+            return None
+        self.decoded += 1
+        return frame.copy()
+    
+    def _bisect(
+        self,
+        lo: int,
+        lo_frame: np.ndarray,
+        hi: int,
+        hi_frame: np.ndarray
+    ) -> Tuple[int, np.ndarray, int, np.ndarray]:
+        """Narrow a changed jump down to one stride.
+        
+        Returns:
+            The last unchanged and first changed sample in ``(lo, hi]``, as
+            (lo, lo_frame, hi, hi_frame).
+        """
+        while hi - lo > self.stride:
+            mid = lo + (hi - lo) // self.stride // 2 * self.stride
+            mid_frame = self._fetch(mid)
+            if mid_frame is None:
+                break
+            if self.score(lo_frame, mid_frame) > self.static_threshold:
+                hi, hi_frame = mid, mid_frame
+            else:
+                lo, lo_frame = mid, mid_frame
+        return lo, lo_frame, hi, hi_frame
@@ -19,10 +19,12 @@ Example:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Dict, List, Union
-from dataclasses import dataclass
+from typing import ClassVar, Optional, Dict, List, Tuple, Union
+from dataclasses import dataclass, field
 import json
 
+from framewise.core.transcript_index import TranscriptIndex
+
 
 @dataclass
 class TranscriptSegment:
@@ -46,6 +48,14 @@ class TranscriptSegment:
     end: float
     text: str
     
+    # Edits to any segment's fields, so transcript indexes can tell they are stale
+    _edits: ClassVar[int] = 0
+    
+    def __setattr__(self, name: str, value: object) -> None:
+        if hasattr(self, name):
+            TranscriptSegment._edits += 1
+        super().__setattr__(name, value)
+    
     def to_dict(self) -> Dict[str, Union[float, str]]:
         """Convert segment to dictionary format.
         
@@ -64,6 +74,27 @@ class TranscriptSegment:
         }
 
 
+class _SegmentList(list):
+    """List of segments that counts its in-place changes."""
+    
+    version = 0
+
+
+def _counting(method):
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+for _name in (
+    "__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+    "insert", "pop", "remove", "clear", "sort", "reverse",
+):
+    setattr(_SegmentList, _name, _counting(getattr(list, _name)))
+
+
 @dataclass
 class Transcript:
     """Complete transcript with metadata and segments.
@@ -92,6 +123,36 @@ class Transcript:
     language: str
     segments: List[TranscriptSegment]
     full_text: str
+    _index: Optional[TranscriptIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _index_key: Optional[Tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == "segments":
+            # Track in-place changes, and drop the index of the old list
+            value = value if isinstance(value, _SegmentList) else _SegmentList(value)
+            super().__setattr__("_index", None)
+        super().__setattr__(name, value)
+    
+    @property
+    def index(self) -> TranscriptIndex:
+        """Interval index over the segments for fast lookup by time.
+        
+        Built on first use and rebuilt if ``segments`` is replaced or
+        changed in place, or any segment's fields are edited.
+        
+        Example:
+            >>> transcript.index.lookup(12.5)
+            TranscriptSegment(start=11.0, end=14.2, text='Click export')
+        """
+        key = (self.segments.version, TranscriptSegment._edits)
+        if self._index is None or self._index_key != key:
+            self._index = TranscriptIndex(self.segments)
+            self._index_key = key
+        return self._index
     
     def to_dict(self) -> Dict[str, Union[str, List[Dict]]]:
         """Convert transcript to dictionary format.
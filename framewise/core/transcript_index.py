@@ -0,0 +1,158 @@
+"""Interval index for fast transcript segment lookup by time.
+
+Looking up the segment spoken at a timestamp by scanning every segment is
+O(n) per lookup, which adds up when thousands of frames are matched against
+a multi-hour transcript. :class:`TranscriptIndex` sorts the segments once
+into NumPy start/end arrays and answers point, nearest-segment and time-range
+queries with binary search.
+
+Segments may overlap. A running maximum of segment end times tells where
+the segments that can still contain a time begin, so lookups stay
+O(log n) when segments do not overlap (as with Whisper output).
+
+Example:
+    Basic usage::
+        
+        index = transcript.index
+        segment = index.find(12.5)                   # segment containing 12.5s
+        segment = index.lookup(12.5, tolerance=2.0)  # or the nearest within 2s
+        segments = index.overlapping(10.0, 20.0)     # everything said in 10-20s
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence
+import numpy as np
+
+if TYPE_CHECKING:
+    from framewise.core.transcript_extractor import TranscriptSegment
+
+
+class TranscriptIndex:
+    """Sorted interval index over transcript segments.
+    
+    Attributes:
+        segments: The indexed segments, sorted by start time (ties keep
+            their original order).
+        starts: Segment start times, sorted ascending.
+        ends: Segment end times, in the same order as ``starts``.
+    """
+    
+    def __init__(self, segments: Sequence[TranscriptSegment]) -> None:
+        """Build the index.
+        
+        Args:
+            segments: Transcript segments, in any order.
+        """
+        order = np.argsort([segment.start for segment in segments], kind="stable")
+        self.segments: List[TranscriptSegment] = [segments[i] for i in order]
+        self.starts = np.array([s.start for s in self.segments], dtype=np.float64)
+        self.ends = np.array([s.end for s in self.segments], dtype=np.float64)
+        
+        # Running max of end times (non-decreasing, so it can be bisected),
+        # and which segment reached it
+        self._max_ends = np.maximum.accumulate(self.ends)
+        is_new_max = np.ones(len(self.ends), dtype=bool)
+        is_new_max[1:] = self.ends[1:] > self._max_ends[:-1]
+        self._max_end_owner = np.maximum.accumulate(
+            np.where(is_new_max, np.arange(len(self.ends)), 0)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.segments)
+    
+    def find(self, timestamp: float) -> Optional[TranscriptSegment]:
+        """Find the earliest segment containing a timestamp.
+        
+        Args:
+            timestamp: Time in seconds.
+        
+        Returns:
+            The earliest-starting segment with ``start <= timestamp <= end``,
+            or None if no segment contains it.
+        """
+        for i in self._overlapping_indices(timestamp, timestamp):
+            return self.segments[i]
+        return None
+    
+    def nearest(
+        self,
+        timestamp: float,
+        tolerance: float = float("inf")
+    ) -> Optional[TranscriptSegment]:
+        """Find the segment closest to a timestamp.
+        
+        The distance to a segment is 0 inside it, otherwise the distance to
+        its nearer end. Ties go to the earlier segment.
+        
+        Args:
+            timestamp: Time in seconds.
+            tolerance: Only return segments strictly closer than this many
+                seconds. Defaults to no limit.
+        
+        Returns:
+            The closest segment, or None if the index is empty or no segment
+            is within ``tolerance``.
+        """
+        containing = self.find(timestamp)
+        if containing is not None:
+            return containing if tolerance > 0 else None
+        
+        n_started = int(np.searchsorted(self.starts, timestamp, side="right"))
+        best = None
+        best_distance = tolerance
+        # Of the segments started by now, the one ending last is closest
+        if n_started > 0:
+            before = int(self._max_end_owner[n_started - 1])
+            distance = timestamp - self.ends[before]
+            if distance < best_distance:
+                best, best_distance = before, distance
+        # Of the segments not started yet, the first to start is closest
+        if n_started < len(self.segments):
+            distance = self.starts[n_started] - timestamp
+            if distance < best_distance:
+                best = n_started
+        
+        return self.segments[best] if best is not None else None
+    
+    def lookup(
+        self,
+        timestamp: float,
+        tolerance: float = 2.0
+    ) -> Optional[TranscriptSegment]:
+        """Find the segment containing a timestamp, or the nearest one.
+        
+        Args:
+            timestamp: Time in seconds.
+            tolerance: Maximum distance (exclusive) in seconds to the
+                nearest segment when none contains the timestamp.
+                Defaults to 2.0.
+        
+        Returns:
+            The containing segment, else the nearest segment within
+            ``tolerance``, else None.
+        """
+        return self.find(timestamp) or self.nearest(timestamp, tolerance)
+    
+    def overlapping(self, start: float, end: float) -> List[TranscriptSegment]:
+        """Find all segments overlapping a time range.
+        
+        Args:
+            start: Range start in seconds.
+            end: Range end in seconds (inclusive).
+        
+        Returns:
+            Segments with ``segment.start <= end`` and ``segment.end >= start``,
+            sorted by start time.
+        """
+        return [self.segments[i] for i in self._overlapping_indices(start, end)]
+    
+    def _overlapping_indices(self, start: float, end: float) -> Iterator[int]:
+        """Yield sorted-order indices of segments overlapping [start, end]."""
+        # Segments before `first` all end before `start`; segments from
+        # `stop` on all begin after `end`
+        first = int(np.searchsorted(self._max_ends, start, side="left"))
+        stop = int(np.searchsorted(self.starts, end, side="right"))
+        for i in range(first, stop):
+            if self.ends[i] >= start:
+                yield i
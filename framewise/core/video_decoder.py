@@ -0,0 +1,394 @@
+"""Decoder backends that feed downscaled grayscale frames to scene detection.
+
+Scene detection only needs small grayscale images, so the decoder used for
+the scan is pluggable. Two backends are provided:
+
+- **opencv** (default): Decodes with ``cv2.VideoCapture`` and converts each
+  analysed frame to grayscale and resizes it in Python.
+- **ffmpeg**: Runs ``ffmpeg`` with ``scale`` and ``format=gray`` filters and
+  reads fixed-size raw frames straight from a pipe, so full-resolution
+  colour data never reaches Python.
+
+:class:`KeyframeSceneReader` uses the same pipe but decodes only the
+keyframes (I-frames) of the video, for fast coarse scans.
+
+Both backends yield ``(frame_index, gray_frame)`` pairs where ``gray_frame``
+is a ``uint8`` array of shape ``(height, width)``.
+
+Example:
+    Basic usage::
+        
+        from framewise.core.video_decoder import FFmpegSceneReader
+        
+        reader = FFmpegSceneReader("video.mp4", fps=30.0)
+        for frame_idx, gray in reader.frames(stride=15):
+            print(frame_idx, gray.shape)
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+import cv2
+import numpy as np
+
+# Size (width, height) of the frames compared during scene detection
+SCENE_FRAME_SIZE = (320, 240)
+
+DECODERS = ("opencv", "ffmpeg")
+
+
+def to_scene_frame(
+    frame: np.ndarray,
+    size: Tuple[int, int] = SCENE_FRAME_SIZE
+) -> np.ndarray:
+    """Convert a BGR frame to the downscaled grayscale analysis frame.
+    
+    Args:
+        frame: Frame as numpy array (BGR format).
+        size: Target (width, height). Defaults to 320x240.
+    
+    Returns:
+        Grayscale ``uint8`` array of shape ``(height, width)``.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, size)
+
+
+class SceneFrameConverter:
+    """Convert frames to analysis frames without allocating per frame.
+    
+    Produces the same result as :func:`to_scene_frame`, but the grayscale
+    image and the downscaled output are written into buffers allocated on
+    the first call and reused afterwards. At 4K the grayscale image alone
+    is 8 MB, so a scan over thousands of frames otherwise churns through
+    gigabytes of short-lived arrays.
+    
+    The returned array is overwritten by the next call; copy it (or use
+    two converters in turn) to keep it.
+    
+    Attributes:
+        size: Output frame size as (width, height).
+    """
+    
+    def __init__(self, size: Tuple[int, int] = SCENE_FRAME_SIZE) -> None:
+        """Initialize the converter.
+        
+        Args:
+            size: Output frame size as (width, height). Defaults to 320x240.
+        """
+        self.size = size
+        self._gray: Optional[np.ndarray] = None
+        self._out = np.empty((size[1], size[0]), dtype=np.uint8)
+    
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR or grayscale frame into the output buffer.
+        
+        Args:
+            frame: Frame as numpy array (BGR or grayscale).
+        
+        Returns:
+            The reused grayscale ``uint8`` output buffer.
+        """
+        gray = frame
+        if frame.ndim == 3:
+            if self._gray is None or self._gray.shape != frame.shape[:2]:
+                self._gray = np.empty(frame.shape[:2], dtype=np.uint8)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        return cv2.resize(gray, self.size, dst=self._out)
+
+
+class OpenCVSceneReader:
+    """Read analysis frames from an OpenCV VideoCapture.
+    
+    Frames between samples are skipped with ``grab()``; sampled frames are
+    decoded with ``read()`` and converted with ``prepare``. Every frame is
+    decoded into the same buffer, so ``prepare`` must return a new array
+    or a buffer of its own, never its input.
+    
+    Attributes:
+        cap: The VideoCapture being read.
+        size: Output frame size as (width, height).
+        prepare: Function converting a decoded BGR frame to an analysis frame.
+    """
+    
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        size: Tuple[int, int] = SCENE_FRAME_SIZE,
+        prepare: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    ) -> None:
+        """Initialize the reader.
+        
+        Args:
+            cap: Opened OpenCV VideoCapture object.
+            size: Output frame size as (width, height). Defaults to 320x240.
+            prepare: Function converting a decoded BGR frame to an analysis
+                frame, e.g. a scene scorer's ``prepare``. Defaults to
+                :func:`to_scene_frame` at ``size``.
+        """
+        self.cap = cap
+        self.size = size
+        self.prepare = prepare or (lambda frame: to_scene_frame(frame, self.size))
+    
+    def frames(
+        self,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        stride: int = 1
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield every ``stride``-th frame from ``start_frame`` on.
+        
+        Args:
+            start_frame: Index of the first frame to yield. Must be a
+                multiple of ``stride``. Defaults to 0.
+            end_frame: Index at which reading stops (exclusive), or None
+                to read to the end of the video. Defaults to None.
+            stride: Distance between yielded frames. Defaults to 1.
+        
+        Yields:
+            Tuples of (frame_index, grayscale analysis frame).
+        """
+        frame_idx = start_frame
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        
+        # Decode buffer, allocated by the first read and reused afterwards
+        frame = None
+        while end_frame is None or frame_idx < end_frame:
+            # Skip frames between samples without decoding them
+            if frame_idx % stride != 0:
+                if not self.cap.grab():
+                    return
+                frame_idx += 1
+                continue
+            
+            ret, frame = self.cap.read(frame)
+            if not ret:
+                return
+            
+            yield frame_idx, self.prepare(frame)
+            frame_idx += 1
+
+
+class FFmpegSceneReader:
+    """Read downscaled grayscale frames from an ``ffmpeg`` raw-video pipe.
+    
+    Scaling, grayscale conversion and frame selection all happen inside
+    ffmpeg, and each fixed-size frame is wrapped with ``np.frombuffer``
+    without further conversion.
+    
+    Attributes:
+        video_path: Path to the video file.
+        fps: Frames per second of the video, used to map frame indices
+            to seek times.
+        size: Output frame size as (width, height).
+        ffmpeg_binary: Name or path of the ffmpeg executable.
+    """
+    
+    def __init__(
+        self,
+        video_path: Union[str, Path],
+        fps: float,
+        size: Tuple[int, int] = SCENE_FRAME_SIZE,
+        ffmpeg_binary: str = "ffmpeg"
+    ) -> None:
+        """Initialize the reader.
+        
+        Args:
+            video_path: Path to the video file.
+            fps: Frames per second of the video.
+            size: Output frame size as (width, height). Defaults to 320x240.
+            ffmpeg_binary: Name or path of the ffmpeg executable.
+                Defaults to "ffmpeg".
+        """
+        self.video_path = Path(video_path)
+        self.fps = fps
+        self.size = size
+        self.ffmpeg_binary = ffmpeg_binary
+    
+    def _build_command(
+        self,
+        start_frame: int,
+        end_frame: Optional[int],
+        stride: int
+    ) -> list:
+        """Build the ffmpeg command line for a frame range."""
+        width, height = self.size
+        filters = []
+        if stride > 1:
+            # Frame numbers restart at the seek point, which is a sample
+            filters.append(f"select='not(mod(n\\,{stride}))'")
+        filters.append(f"scale={width}:{height}")
+        filters.append("format=gray")
+        
+        command = [self.ffmpeg_binary, "-v", "error", "-nostdin"]
+        if start_frame > 0:
+            command += ["-ss", f"{start_frame / self.fps:.6f}"]
+        command += [
+            "-i", str(self.video_path),
+            "-map", "0:v:0", "-an", "-sn",
+            "-vf", ",".join(filters),
+            "-vsync", "0",
+        ]
+        if end_frame is not None:
+            n_frames = max(0, -(-(end_frame - start_frame) // stride))
+            command += ["-frames:v", str(n_frames)]
+        command += ["-f", "rawvideo", "-pix_fmt", "gray", "pipe:1"]
+        return command
+    
+    def frames(
+        self,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        stride: int = 1
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield every ``stride``-th frame from ``start_frame`` on.
+        
+        Args:
+            start_frame: Index of the first frame to yield. Must be a
+                multiple of ``stride``. Defaults to 0.
+            end_frame: Index at which reading stops (exclusive), or None
+                to read to the end of the video. Defaults to None.
+            stride: Distance between yielded frames. Defaults to 1.
+        
+        Yields:
+            Tuples of (frame_index, grayscale analysis frame).
+        
+        Raises:
+            RuntimeError: If ffmpeg is not installed or exits with an error.
+        """
+        command = self._build_command(start_frame, end_frame, stride)
+        frame_idx = start_frame
+        for gray in self._read_pipe(command):
+            if end_frame is not None and frame_idx >= end_frame:
+                break
+            yield frame_idx, gray
+            frame_idx += stride
+    
+    def _read_pipe(self, command: list) -> Iterator[np.ndarray]:
+        """Run ffmpeg and yield fixed-size grayscale frames from its stdout.
+        
+        Args:
+            command: Full ffmpeg command line writing raw gray video to stdout.
+        
+        Yields:
+            Grayscale ``uint8`` arrays of shape ``(height, width)``.
+        
+        Raises:
+            RuntimeError: If ffmpeg is not installed or exits with an error.
+        """
+        if shutil.which(self.ffmpeg_binary) is None:
+            raise RuntimeError(
+                f"{self.ffmpeg_binary} is not installed. "
+                "Install ffmpeg or use the 'opencv' decoder."
+            )
+        
+        width, height = self.size
+        frame_bytes = width * height
+        
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=frame_bytes * 4,
+        )
+        stderr_lines: List[str] = []
+        stderr_thread = threading.Thread(
+            target=self._drain_stderr, args=(process.stderr, stderr_lines), daemon=True
+        )
+        stderr_thread.start()
+        try:
+            while True:
+                buffer = process.stdout.read(frame_bytes)
+                if len(buffer) < frame_bytes:
+                    break
+                yield np.frombuffer(buffer, dtype=np.uint8).reshape(height, width)
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            returncode = process.wait()
+            stderr_thread.join()
+        
+        # Negative return codes mean we stopped ffmpeg early ourselves
+        if returncode > 0:
+            stderr = "\n".join(stderr_lines[-10:])
+            raise RuntimeError(f"ffmpeg failed on {self.video_path}: {stderr}")
+    
+    def _drain_stderr(self, stream, lines: List[str]) -> None:
+        """Collect ffmpeg's stderr so the pipe never fills up."""
+        for raw_line in stream:
+            line = raw_line.decode(errors="replace").rstrip()
+            self._on_stderr_line(line)
+            lines.append(line)
+        stream.close()
+    
+    def _on_stderr_line(self, line: str) -> None:
+        """Hook for subclasses that parse ffmpeg log output."""
+
+
+class KeyframeSceneReader(FFmpegSceneReader):
+    """Read only the keyframes (I-frames) of a video through ffmpeg.
+    
+    Uses ``-skip_frame nokey`` so the decoder drops every non-key frame
+    before decoding it, and the ``showinfo`` filter to recover each
+    keyframe's presentation time. On slide-style screen recordings, where
+    every visual change starts a new keyframe, this decodes a small
+    fraction of the video.
+    """
+    
+    _PTS_TIME = re.compile(r"\bn:\s*\d+\s+pts:\s*-?\d+\s+pts_time:(-?[\d.]+)")
+    
+    def frames(
+        self,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        stride: int = 1
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield every keyframe of the video.
+        
+        Args:
+            start_frame: Keyframes before this index are skipped.
+                Defaults to 0.
+            end_frame: Index at which reading stops (exclusive), or None
+                to read to the end of the video. Defaults to None.
+            stride: Ignored; keyframes are sparse already.
+        
+        Yields:
+            Tuples of (frame_index, grayscale keyframe), where the index is
+            derived from the keyframe's presentation time.
+        
+        Raises:
+            RuntimeError: If ffmpeg is not installed or exits with an error.
+        """
+        width, height = self.size
+        command = [
+            self.ffmpeg_binary, "-v", "info", "-nostats", "-hide_banner", "-nostdin",
+            "-skip_frame", "nokey",
+            "-i", str(self.video_path),
+            "-map", "0:v:0", "-an", "-sn",
+            "-vf", f"showinfo,scale={width}:{height},format=gray",
+            "-vsync", "0",
+            "-f", "rawvideo", "-pix_fmt", "gray", "pipe:1",
+        ]
+        
+        self._pts_times: queue.Queue = queue.Queue()
+        for gray in self._read_pipe(command):
+            # showinfo logs each frame before it reaches the encoder
+            frame_idx = int(round(self._pts_times.get(timeout=60) * self.fps))
+            if frame_idx < start_frame:
+                continue
+            if end_frame is not None and frame_idx >= end_frame:
+                break
+            yield frame_idx, gray
+    
+    def _on_stderr_line(self, line: str) -> None:
+        """Record the presentation time logged by ``showinfo``."""
+        match = self._PTS_TIME.search(line)
+        if match:
+            self._pts_times.put(float(match.group(1)))
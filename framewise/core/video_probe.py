@@ -0,0 +1,321 @@
+"""Video probing with exact frame counts and keyframe positions, cached on disk.
+
+OpenCV reports the frame count and frame rate stored in the container
+header, which is often wrong for variable-frame-rate screen recordings, and
+says nothing about where the keyframes are. :func:`probe_video` can instead
+run ``ffprobe`` over the video's packets. That demuxes the file without
+decoding it, and gives the exact number of frames and the index of every
+keyframe, along with the stream's size and codec.
+
+Reading every packet still means reading the file, so results can be
+cached in a directory, keyed by the file's identity (path, size,
+modification time and inode). Re-processing an unchanged video then
+starts from the cached numbers.
+
+Frame rates are averages. Per-frame presentation timestamps are not kept,
+so timestamps computed as ``frame_index / fps`` are exact only for
+constant-frame-rate video; on variable-frame-rate recordings they can drift
+from the time the frame is actually shown.
+
+Probing backends:
+
+- **opencv** (default): Container header values via ``cv2.VideoCapture``;
+  no keyframe positions.
+- **ffprobe**: Exact packet-level frame count and keyframe indices.
+  Requires ffprobe (shipped with ffmpeg).
+
+Example:
+    Basic usage::
+        
+        from framewise.core.video_probe import probe_video
+        
+        info = probe_video("video.mp4", method="ffprobe", cache_dir=".probe_cache")
+        print(info.frame_count, info.fps, info.keyframes[:5])
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import cv2
+from loguru import logger
+
+PROBE_METHODS = ("opencv", "ffprobe")
+
+
+@dataclass
+class VideoInfo:
+    """Stream properties of a video.
+    
+    Attributes:
+        fps: Average frame rate (frames per second). From ffprobe, this is
+            ``frame_count / duration``, so ``frame_index / fps`` spans the
+            video's duration, but on variable-frame-rate video a frame's
+            timestamp computed that way can differ from its presentation
+            time.
+        duration: Duration in seconds.
+        frame_count: Number of frames.
+        width: Frame width in pixels.
+        height: Frame height in pixels.
+        codec: Codec name, if known.
+        keyframes: Sorted indices of the keyframes, or None if unknown.
+        method: Probing backend that produced the values.
+    """
+    
+    fps: float
+    duration: float
+    frame_count: int
+    width: int
+    height: int
+    codec: Optional[str] = None
+    keyframes: Optional[List[int]] = None
+    method: str = "opencv"
+    
+    def keyframe_at_or_before(self, frame_idx: int) -> Optional[int]:
+        """Return the last keyframe at or before a frame.
+        
+        Args:
+            frame_idx: Frame index.
+        
+        Returns:
+            Index of the keyframe a decoder seeking to ``frame_idx`` starts
+            from, or None if keyframes are unknown or none precedes it.
+        """
+        if not self.keyframes:
+            return None
+        i = bisect.bisect_right(self.keyframes, frame_idx)
+        return self.keyframes[i - 1] if i > 0 else None
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary format."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> VideoInfo:
+        """Reconstruct from :meth:`to_dict` output."""
+        return cls(**data)
+
+
+def file_identity(video_path: Union[str, Path]) -> str:
+    """Identify a file by path, size, modification time and inode.
+    
+    Args:
+        video_path: Path to the file.
+    
+    Returns:
+        Hex digest that changes whenever the file is replaced or modified.
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    path = Path(video_path).resolve()
+    stat = path.stat()
+    identity = f"{path}:{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ino}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def probe_video(
+    video_path: Union[str, Path],
+    method: str = "opencv",
+    cache_dir: Optional[Union[str, Path]] = None,
+    ffprobe_binary: str = "ffprobe"
+) -> VideoInfo:
+    """Probe a video's frame rate, duration, frame count and keyframes.
+    
+    Args:
+        video_path: Path to the video file.
+        method: 'opencv' for container header values, 'ffprobe' for exact
+            packet-level counts and keyframes. Defaults to 'opencv'.
+        cache_dir: Directory caching probe results by file identity. None
+            disables caching. Defaults to None.
+        ffprobe_binary: Name or path of the ffprobe executable.
+            Defaults to "ffprobe".
+    
+    Returns:
+        The video's stream properties.
+    
+    Raises:
+        FileNotFoundError: If the video file doesn't exist.
+        ValueError: If the method is unknown or the video cannot be read.
+        RuntimeError: If ffprobe is not installed or fails.
+    """
+    if method not in PROBE_METHODS:
+        raise ValueError(
+            f"Invalid probe method '{method}'. Must be one of: {', '.join(PROBE_METHODS)}"
+        )
+    video_path = Path(video_path)
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+    
+    cache_path = None
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path = cache_dir / f"{file_identity(video_path)}.{method}.json"
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return VideoInfo.from_dict(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable probe cache entry {cache_path.name}: {e}")
+    
+    if method == "ffprobe":
+        info = _probe_ffprobe(video_path, ffprobe_binary)
+    else:
+        info = _probe_opencv(video_path)
+    
+    if cache_path is not None:
+        # Write then rename, so concurrent probes never read a partial file
+        temp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(info.to_dict(), f)
+        os.replace(temp_path, cache_path)
+    
+    return info
+
+
+def capture_info(cap: cv2.VideoCapture) -> VideoInfo:
+    """Read the container header values of an opened VideoCapture.
+    
+    Args:
+        cap: Opened OpenCV VideoCapture object.
+    
+    Returns:
+        The header's stream properties, without keyframe positions.
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    return VideoInfo(
+        fps=fps,
+        duration=frame_count / fps if fps > 0 else 0.0,
+        frame_count=frame_count,
+        width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+    )
+
+
+def _probe_opencv(video_path: Path) -> VideoInfo:
+    """Read the container header values through OpenCV."""
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise ValueError(f"Failed to open video: {video_path}")
+    try:
+        return capture_info(cap)
+    finally:
+        cap.release()
+
+
+def _probe_ffprobe(video_path: Path, ffprobe_binary: str) -> VideoInfo:
+    """Probe stream info and every video packet with ffprobe."""
+    if shutil.which(ffprobe_binary) is None:
+        raise RuntimeError(
+            f"{ffprobe_binary} is not installed. Install ffmpeg or use the 'opencv' probe."
+        )
+    
+    header = json.loads(_run_ffprobe(ffprobe_binary, [
+        "-show_entries",
+        "stream=codec_name,width,height,avg_frame_rate,duration:format=duration",
+        "-of", "json",
+        str(video_path),
+    ]))
+    packets = _run_ffprobe(ffprobe_binary, [
+        "-show_entries", "packet=pts_time,dts_time,flags",
+        "-of", "csv=p=0",
+        str(video_path),
+    ])
+    return parse_ffprobe(header, packets)
+
+
+def _run_ffprobe(ffprobe_binary: str, args: List[str]) -> str:
+    """Run ffprobe on the first video stream and return its stdout."""
+    result = subprocess.run(
+        [ffprobe_binary, "-v", "error", "-select_streams", "v:0", *args],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def parse_ffprobe(header: Dict, packets: str) -> VideoInfo:
+    """Build a VideoInfo from ffprobe output.
+    
+    Args:
+        header: Parsed JSON of the stream and format entries.
+        packets: CSV lines of ``pts_time,dts_time,flags`` per video packet,
+            in decode order.
+    
+    Returns:
+        The video's stream properties, with frame indices in presentation
+        order.
+    
+    Raises:
+        ValueError: If there is no video stream.
+    """
+    streams = header.get("streams") or []
+    if not streams:
+        raise ValueError("No video stream found")
+    stream = streams[0]
+    
+    # Presentation time and keyframe flag of every packet
+    frames = []
+    for line in packets.splitlines():
+        fields = line.strip().split(",")
+        if len(fields) < 3:
+            continue
+        pts, dts, flags = fields[:3]
+        time = _parse_float(pts)
+        if time is None:
+            time = _parse_float(dts)
+        if time is None or "D" in flags:
+            continue
+        frames.append((time, "K" in flags))
+    frames.sort(key=lambda frame: frame[0])
+    
+    duration = (
+        _parse_float(stream.get("duration"))
+        or _parse_float(header.get("format", {}).get("duration"))
+        or 0.0
+    )
+    frame_count = len(frames)
+    if frame_count and duration > 0:
+        fps = frame_count / duration
+    else:
+        fps = _parse_rate(stream.get("avg_frame_rate")) or 0.0
+    
+    return VideoInfo(
+        fps=fps,
+        duration=duration,
+        frame_count=frame_count,
+        width=int(stream.get("width") or 0),
+        height=int(stream.get("height") or 0),
+        codec=stream.get("codec_name"),
+        keyframes=[idx for idx, (_, key) in enumerate(frames) if key],
+        method="ffprobe",
+    )
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe number, which may be 'N/A'."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_rate(value: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe rational such as '30000/1001'."""
+    if not value or "/" not in value:
+        return _parse_float(value)
+    num, den = value.split("/", 1)
+    num, den = _parse_float(num), _parse_float(den)
+    return num / den if num is not None and den else None
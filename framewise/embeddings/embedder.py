@@ -29,7 +29,12 @@ import torch
 from loguru import logger
 
 from framewise.core.frame_extractor import ExtractedFrame
-from framewise.core.transcript_extractor import TranscriptSegment
+from framewise.core.frame_shard import load_shard_ref, parse_shard_ref
+from framewise.core.transcript_extractor import Transcript, TranscriptSegment
+
+# An image file path or shard reference (see framewise.core.frame_shard),
+# a decoded BGR array (OpenCV convention) or a PIL image
+ImageSource = Union[str, Path, np.ndarray, Image.Image]
 
 
 class FrameWiseEmbedder:
@@ -243,7 +248,25 @@ class FrameWiseEmbedder:
         )
         return embeddings
     
-    def embed_image(self, image_path: Union[str, Path]) -> np.ndarray:
+    def _load_image(self, image: ImageSource) -> Image.Image:
+        """Convert an image source to an RGB PIL image.
+        
+        Arrays are taken to be BGR (or grayscale), as decoded by OpenCV and
+        carried by ``ExtractedFrame.image``, and are converted without any
+        encode/decode round-trip. Strings of the form
+        ``<shard>#<offset>:<length>`` are decoded from the shard.
+        """
+        if isinstance(image, Image.Image):
+            return image.convert("RGB")
+        if isinstance(image, str) and parse_shard_ref(image) is not None:
+            image = load_shard_ref(image)
+        if isinstance(image, np.ndarray):
+            if image.ndim == 2:
+                return Image.fromarray(image).convert("RGB")
+            return Image.fromarray(np.ascontiguousarray(image[..., ::-1]))
+        return Image.open(image).convert("RGB")
+    
+    def embed_image(self, image_path: ImageSource) -> np.ndarray:
         """Generate embedding for an image using CLIP.
         
         Converts an image into a dense vector representation using CLIP's vision
@@ -251,8 +274,9 @@ class FrameWiseEmbedder:
         text embeddings for multimodal search.
         
         Args:
-            image_path: Path to the image file. Supports common formats
-                (jpg, png, etc.).
+            image_path: Path to the image file (jpg, png, etc.), a frame
+                shard reference, or the decoded image as a BGR numpy array
+                or PIL image.
         
         Returns:
             Embedding vector as numpy array. Dimension is 512 for CLIP base models.
@@ -271,7 +295,7 @@ class FrameWiseEmbedder:
         self._load_vision_model()
         
         # Load image
-        image = Image.open(image_path).convert("RGB")
+        image = self._load_image(image_path)
         
         # Process and embed
         inputs = self._vision_processor(images=image, return_tensors="pt")
@@ -286,7 +310,7 @@ class FrameWiseEmbedder:
     
     def embed_image_batch(
         self,
-        image_paths: List[Union[str, Path]],
+        image_paths: List[ImageSource],
         batch_size: int = 8
     ) -> np.ndarray:
         """Generate embeddings for multiple images efficiently.
@@ -295,7 +319,8 @@ class FrameWiseEmbedder:
         embedding one-by-one. Particularly beneficial when using GPU.
         
         Args:
-            image_paths: List of paths to image files.
+            image_paths: List of image file paths, frame shard references,
+                BGR numpy arrays or PIL images (may be mixed).
             batch_size: Number of images to process in each batch. Larger batches
                 are faster but use more GPU memory. Defaults to 8.
         
@@ -321,7 +346,7 @@ class FrameWiseEmbedder:
             batch_paths = image_paths[i:i + batch_size]
             
             # Load images
-            images = [Image.open(path).convert("RGB") for path in batch_paths]
+            images = [self._load_image(path) for path in batch_paths]
             
             # Process batch
             inputs = self._vision_processor(images=images, return_tensors="pt")
@@ -343,8 +368,8 @@ class FrameWiseEmbedder:
         (image) and textual content (transcript) of a frame.
         
         Args:
-            frame: ExtractedFrame object containing image path and optional
-                transcript segment.
+            frame: ExtractedFrame object containing image path (or in-memory
+                pixels) and optional transcript segment.
         
         Returns:
             Dictionary containing:
@@ -353,12 +378,14 @@ class FrameWiseEmbedder:
             - image_embedding: Image embedding vector
             - text_embedding: Text embedding vector (or None if no transcript)
             - text: Transcript text (or None if no transcript)
-            - frame_path: Path to the frame image
+            - frame_path: Path to the frame image, or its shard reference
+              ('' if not saved)
             - extraction_reason: Why this frame was extracted
             - quality_score: Frame quality score
         
         Raises:
-            FileNotFoundError: If the frame image file doesn't exist.
+            FileNotFoundError: If the frame has no in-memory pixels and its
+                image file doesn't exist.
         
         Example:
             >>> embedder = FrameWiseEmbedder()
@@ -374,8 +401,8 @@ class FrameWiseEmbedder:
             >>> print(result['text_embedding'].shape)
             (384,)
         """
-        # Embed the image
-        image_embedding = self.embed_image(frame.path)
+        # Embed the image, from memory when the extractor kept it
+        image_embedding = self.embed_image(self._frame_image(frame))
         
         # Embed the transcript text if available
         text_embedding = None
@@ -390,15 +417,24 @@ class FrameWiseEmbedder:
             "image_embedding": image_embedding,
             "text_embedding": text_embedding,
             "text": text,
-            "frame_path": str(frame.path),
+            "frame_path": self._frame_path(frame),
             "extraction_reason": frame.extraction_reason,
             "quality_score": frame.quality_score,
         }
     
+    def _frame_image(self, frame: ExtractedFrame) -> ImageSource:
+        """Return a frame's in-memory pixels if available, else its location."""
+        return frame.image if frame.image is not None else frame.location
+    
+    def _frame_path(self, frame: ExtractedFrame) -> str:
+        """Return a frame's image path or shard reference ('' if not saved)."""
+        return frame.location or ""
+    
     def embed_frames_batch(
         self,
         frames: List[ExtractedFrame],
-        batch_size: int = 8
+        batch_size: int = 8,
+        transcript: Optional[Transcript] = None
     ) -> List[Dict[str, Union[str, float, np.ndarray, None]]]:
         """Generate embeddings for multiple frames efficiently.
         
@@ -410,6 +446,10 @@ class FrameWiseEmbedder:
             frames: List of ExtractedFrame objects to embed.
             batch_size: Number of images to process in each batch. Larger batches
                 are faster but use more GPU memory. Defaults to 8.
+            transcript: Transcript to take text from for frames without a
+                transcript segment (e.g. frames extracted with the 'scene'
+                strategy), using the segment at or within 2 seconds of the
+                frame. Defaults to None.
         
         Returns:
             List of dictionaries, one per frame, each containing:
@@ -434,16 +474,18 @@ class FrameWiseEmbedder:
         """
         logger.info(f"Embedding {len(frames)} frames...")
         
-        # Extract image paths and texts
-        image_paths = [frame.path for frame in frames]
-        texts = [
-            frame.transcript_segment.text if frame.transcript_segment else ""
+        # Extract images (in-memory pixels or paths) and texts
+        images = [self._frame_image(frame) for frame in frames]
+        segments = [
+            frame.transcript_segment
+            or (transcript.index.lookup(frame.timestamp) if transcript else None)
             for frame in frames
         ]
+        texts = [segment.text if segment else "" for segment in segments]
         
         # Batch embed images
         logger.info("Generating image embeddings...")
-        image_embeddings = self.embed_image_batch(image_paths, batch_size)
+        image_embeddings = self.embed_image_batch(images, batch_size)
         
         # Batch embed texts
         logger.info("Generating text embeddings...")
@@ -458,7 +500,7 @@ class FrameWiseEmbedder:
                 "image_embedding": image_embeddings[i],
                 "text_embedding": text_embeddings[i],
                 "text": texts[i],
-                "frame_path": str(frame.path),
+                "frame_path": self._frame_path(frame),
                 "extraction_reason": frame.extraction_reason,
                 "quality_score": frame.quality_score,
             }
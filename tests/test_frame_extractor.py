@@ -0,0 +1,1481 @@
+"""
+Tests for FrameExtractor
+"""
+
+import json
+import os
+import shutil
+import cv2
+import numpy as np
+import pytest
+
+from framewise.core.frame_extractor import FrameExtractor, ExtractedFrame
+from framewise.core.frame_dedup import NearDuplicateIndex
+from framewise.core.frame_fetcher import FrameFetcher
+from framewise.core.frame_writer import FrameWriter
+from framewise.core.frame_shard import (
+    ShardReader,
+    ShardWriter,
+    format_shard_ref,
+    load_shard_ref,
+    parse_shard_ref,
+)
+from framewise.core.extraction_cache import ExtractionCache, video_fingerprint
+from framewise.core.extraction_checkpoint import CHECKPOINT_NAME, ExtractionCheckpoint
+from framewise.core.keyword_matcher import KeywordMatcher
+from framewise.core.candidate_selector import CandidateSelector
+from framewise.core.adaptive_threshold import AdaptiveThreshold
+from framewise.core.frame_quality import (
+    FrameQualityAssessor,
+    batch_laplacian_variance,
+    laplacian_variance,
+)
+from framewise.core.scene_scorers import TileScorer, get_scorer
+from framewise.core.transcript_extractor import Transcript, TranscriptSegment
+from framewise.core.video_decoder import FFmpegSceneReader, KeyframeSceneReader
+from framewise.core.video_probe import parse_ffprobe, probe_video
+from framewise.core.static_skip import StaticSegmentScanner
+
+
+# Fixtures
+
+@pytest.fixture
+def synthetic_video(tmp_path):
+    """Short 30 fps video with hard cuts at frames 30 and 60.
+    
+    Each scene is a flat colour with a scene-specific checkerboard so
+    frames are sharp enough to pass quality filtering.
+    """
+    video_path = tmp_path / "synthetic.mp4"
+    writer = cv2.VideoWriter(
+        str(video_path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (320, 240)
+    )
+    for idx in range(90):
+        scene = idx // 30
+        frame = np.full((240, 320, 3), (0, 120, 240)[scene], dtype=np.uint8)
+        block = 8 * (scene + 1)
+        yy, xx = np.mgrid[0:240, 0:320]
+        mask = ((yy // block + xx // block) % 2).astype(bool)
+        frame[mask] = 255 - frame[mask]
+        writer.write(frame)
+    writer.release()
+    return video_path
+
+
+@pytest.fixture
+def offbeat_video(tmp_path):
+    """30 fps video with hard cuts at frames 123 and 245.
+    
+    ``123 / 30 * 30`` and ``245 / 30 * 30`` fall just below the frame
+    index, so these cuts catch timestamps truncated back to frames.
+    """
+    video_path = tmp_path / "offbeat.mp4"
+    writer = cv2.VideoWriter(
+        str(video_path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (320, 240)
+    )
+    yy, xx = np.mgrid[0:240, 0:320]
+    for idx in range(300):
+        scene = (idx >= 123) + (idx >= 245)
+        frame = np.full((240, 320, 3), (0, 120, 240)[scene], dtype=np.uint8)
+        block = 8 * (scene + 1)
+        mask = ((yy // block + xx // block) % 2).astype(bool)
+        frame[mask] = 255 - frame[mask]
+        writer.write(frame)
+    writer.release()
+    return video_path
+
+
+@pytest.fixture
+def synthetic_transcript(synthetic_video):
+    """Transcript with one keyword segment per scene"""
+    segments = [
+        TranscriptSegment(0.0, 0.4, "Click the first button"),
+        TranscriptSegment(1.4, 1.8, "Nothing happens here"),
+        TranscriptSegment(2.4, 2.8, "Now save the file"),
+    ]
+    return Transcript(
+        video_path=synthetic_video,
+        language="en",
+        segments=segments,
+        full_text=" ".join(seg.text for seg in segments),
+    )
+
+
+# Tests for FrameExtractor
+
+class TestFrameExtractorInit:
+    """Tests for FrameExtractor configuration"""
+    
+    def test_init_default(self):
+        """Test default configuration"""
+        extractor = FrameExtractor()
+        assert extractor.strategy == "hybrid"
+        assert extractor.analysis_fps is None
+    
+    def test_invalid_strategy(self):
+        """Test that unknown strategies are rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(strategy="random")
+    
+    def test_invalid_analysis_fps(self):
+        """Test that non-positive analysis_fps is rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(analysis_fps=0)
+
+
+class TestSceneDetection:
+    """Tests for scene change detection"""
+    
+    def test_detects_cuts(self, synthetic_video):
+        """Test that every hard cut is detected at its real timestamp"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2)
+        cap = cv2.VideoCapture(str(synthetic_video))
+        changes = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        assert [round(t, 2) for t, _, _ in changes] == [1.0, 2.0]
+    
+    def test_analysis_fps_reports_video_time(self, synthetic_video):
+        """Test that sampled scans still report real video timestamps"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, analysis_fps=5
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        changes = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        assert extractor._analysis_stride(30.0) == 6
+        assert [round(t, 2) for t, _, _ in changes] == [1.0, 2.0]
+
+
+class TestExtract:
+    """End-to-end extraction tests"""
+    
+    def test_extract_scene(self, synthetic_video, tmp_path):
+        """Test extracting frames and writing metadata"""
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, quality_threshold=0.0
+        )
+        frames = extractor.extract(synthetic_video, output_dir=output_dir)
+        
+        assert len(frames) == 2
+        assert all(isinstance(f, ExtractedFrame) for f in frames)
+        assert all(f.path.exists() for f in frames)
+        
+        metadata = json.loads((output_dir / "metadata.json").read_text())
+        assert metadata["total_frames"] == 2
+    
+    def test_extract_missing_video(self, tmp_path):
+        """Test that a missing video raises FileNotFoundError"""
+        extractor = FrameExtractor(strategy="scene")
+        with pytest.raises(FileNotFoundError):
+            extractor.extract(tmp_path / "missing.mp4", output_dir=tmp_path)
+
+
+class TestSinglePass:
+    """Tests for the single-pass candidate capture"""
+    
+    @pytest.mark.parametrize("strategy", ["scene", "transcript", "hybrid"])
+    def test_matches_two_pass(self, synthetic_video, synthetic_transcript, tmp_path, strategy):
+        """Test that single-pass extraction selects the same frames"""
+        kwargs = dict(strategy=strategy, scene_threshold=0.2, quality_threshold=0.0)
+        two_pass = FrameExtractor(**kwargs).extract(
+            synthetic_video, synthetic_transcript, tmp_path / "two_pass"
+        )
+        one_pass = FrameExtractor(single_pass=True, **kwargs).extract(
+            synthetic_video, synthetic_transcript, tmp_path / "one_pass"
+        )
+        
+        assert [(f.timestamp, f.extraction_reason) for f in one_pass] == [
+            (f.timestamp, f.extraction_reason) for f in two_pass
+        ]
+    
+    def test_same_frames_as_two_pass(self, offbeat_video, tmp_path):
+        """Test that both paths save the frame after a cut off the time grid"""
+        kwargs = dict(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        two_pass = FrameExtractor(**kwargs).extract(offbeat_video, output_dir=tmp_path / "a")
+        one_pass = FrameExtractor(single_pass=True, **kwargs).extract(
+            offbeat_video, output_dir=tmp_path / "b"
+        )
+        
+        assert [round(f.timestamp * 30) for f in two_pass] == [123, 245]
+        assert [f.timestamp for f in one_pass] == [f.timestamp for f in two_pass]
+        for one, two in zip(one_pass, two_pass):
+            assert np.array_equal(one.load_image(), two.load_image())
+    
+    def test_buffer_is_bounded(self, synthetic_video):
+        """Test that the captured frames never exceed the frame budget"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.0, single_pass=True, max_frames_per_video=2
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        buffered = extractor._extract_single_pass(cap, 30.0, duration=3.0)
+        cap.release()
+        
+        assert len(buffered) == 2
+        assert [c[0] for c in buffered] == sorted(c[0] for c in buffered)
+
+
+class TestParallelSceneDetection:
+    """Tests for chunked multi-process scene detection"""
+    
+    @pytest.mark.parametrize("analysis_fps", [None, 7])
+    def test_matches_sequential(self, synthetic_video, analysis_fps):
+        """Test that stitched ranges reproduce the sequential scan"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.01, analysis_fps=analysis_fps, workers=4
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        sequential = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        parallel = extractor._extract_by_scene_change_parallel(synthetic_video, 30.0, 90)
+        
+        assert [(t, reason) for t, reason, _ in parallel] == [
+            (t, reason) for t, reason, _ in sequential
+        ]
+        assert np.allclose([s for *_, s in parallel], [s for *_, s in sequential])
+    
+    def test_boundary_cut_is_scored(self, synthetic_video):
+        """Test that a cut on a range boundary is not lost"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2, workers=3)
+        changes = extractor._extract_by_scene_change_parallel(synthetic_video, 30.0, 90)
+        
+        assert [round(t, 2) for t, _, _ in changes] == [1.0, 2.0]
+
+
+class TestDecoders:
+    """Tests for the scene detection decoder backends"""
+    
+    def test_invalid_decoder(self):
+        """Test that unknown decoders are rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(decoder="gstreamer")
+    
+    def test_ffmpeg_rejects_single_pass(self):
+        """Test that the analysis-only ffmpeg decoder cannot feed single-pass"""
+        with pytest.raises(ValueError):
+            FrameExtractor(decoder="ffmpeg", single_pass=True)
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    @pytest.mark.parametrize("analysis_fps", [None, 5])
+    def test_ffmpeg_matches_opencv(self, synthetic_video, analysis_fps):
+        """Test that the ffmpeg pipe finds the same scene changes"""
+        opencv = FrameExtractor(strategy="scene", scene_threshold=0.2, analysis_fps=analysis_fps)
+        ffmpeg = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, analysis_fps=analysis_fps, decoder="ffmpeg"
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        expected = opencv._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        changes = ffmpeg._extract_by_scene_change(None, 30.0, video_path=synthetic_video)
+        
+        assert [t for t, _, _ in changes] == [t for t, _, _ in expected]
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_ffmpeg_frames_are_gray(self, synthetic_video):
+        """Test that raw pipe frames have the analysis shape"""
+        reader = FFmpegSceneReader(synthetic_video, fps=30.0)
+        frames = list(reader.frames(start_frame=30, end_frame=40, stride=5))
+        
+        assert [idx for idx, _ in frames] == [30, 35]
+        assert all(gray.shape == (240, 320) and gray.dtype == np.uint8 for _, gray in frames)
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_keyframe_reader_indices(self, synthetic_video):
+        """Test that keyframe indices map back to video frames"""
+        reader = KeyframeSceneReader(synthetic_video, fps=30.0)
+        indices = [idx for idx, _ in reader.frames()]
+        
+        assert indices[0] == 0
+        assert indices == sorted(indices)
+        assert len(indices) < 90
+
+
+class TestKeyframeScan:
+    """Tests for keyframe-only scene scans"""
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_keyframes_strategy(self, synthetic_video, tmp_path):
+        """Test standalone keyframe extraction finds each new scene"""
+        extractor = FrameExtractor(
+            strategy="keyframes", scene_threshold=0.2, quality_threshold=0.0
+        )
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path / "frames")
+        
+        assert len(frames) == 2
+        assert frames[0].timestamp <= frames[1].timestamp
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_keyframe_changes_have_no_box(self, synthetic_video, tmp_path):
+        """Test that keyframe changes are not given a box from an uncompared pair"""
+        extractor = FrameExtractor(
+            strategy="keyframes", scorer="tiles", scene_threshold=0.2, quality_threshold=0.0
+        )
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path / "frames")
+        
+        assert frames and all(f.change_box is None for f in frames)
+    
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_prepass_matches_full_scan(self, synthetic_video):
+        """Test that refining keyframe intervals finds the exact cuts"""
+        full = FrameExtractor(strategy="scene", scene_threshold=0.2)
+        prepass = FrameExtractor(strategy="scene", scene_threshold=0.2, keyframe_prepass=True)
+        cap = cv2.VideoCapture(str(synthetic_video))
+        expected = full._extract_by_scene_change(cap, 30.0)
+        changes = prepass._detect_scene_changes(cap, synthetic_video, 30.0, 90)
+        cap.release()
+        
+        assert [t for t, _, _ in changes] == [t for t, _, _ in expected]
+    
+    def test_prepass_rejects_single_pass(self):
+        """Test that keyframe scans cannot feed the single-pass buffer"""
+        with pytest.raises(ValueError):
+            FrameExtractor(keyframe_prepass=True, single_pass=True)
+
+
+class TestBoundaryRefinement:
+    """Tests for coarse-to-fine scene boundary refinement"""
+    
+    def test_refines_to_exact_frame(self, synthetic_video):
+        """Test that a coarse scan is bisected to the exact cut frame"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, analysis_fps=4, refine_boundaries=True
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        coarse = extractor._extract_by_scene_change(cap, 30.0)
+        changes = extractor._detect_scene_changes(cap, synthetic_video, 30.0, 90)
+        cap.release()
+        
+        assert [round(t, 3) for t, _, _ in coarse] == [round(32 / 30, 3), round(64 / 30, 3)]
+        assert [round(t, 3) for t, _, _ in changes] == [1.0, 2.0]
+    
+    def test_refines_cut_off_the_time_grid(self, offbeat_video):
+        """Test that refinement finds cuts whose timestamps do not round-trip"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, analysis_fps=5, refine_boundaries=True
+        )
+        cap = cv2.VideoCapture(str(offbeat_video))
+        changes = extractor._detect_scene_changes(cap, offbeat_video, 30.0, 300)
+        cap.release()
+        
+        assert [round(t * 30) for t, _, _ in changes] == [123, 245]
+        assert all(score > 0.2 for _, _, score in changes)
+    
+    def test_rejects_single_pass(self):
+        """Test that refinement cannot be combined with single-pass"""
+        with pytest.raises(ValueError):
+            FrameExtractor(refine_boundaries=True, single_pass=True)
+
+
+class TestSceneScorers:
+    """Tests for the pluggable scene-change scorers"""
+    
+    @pytest.fixture
+    def frames(self):
+        """Three BGR frames: two identical, then a different one"""
+        rng = np.random.default_rng(0)
+        first = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        second = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        return [first, first.copy(), second]
+    
+    def test_diff_matches_absdiff(self, frames):
+        """Test that the batched diff equals the per-pair OpenCV metric"""
+        scorer = get_scorer("diff")
+        prepared = np.stack([scorer.prepare(f) for f in frames])
+        expected = np.mean(cv2.absdiff(prepared[1], prepared[2])) / 255.0
+        
+        scores = scorer.score_pairs(prepared)
+        
+        assert scores[0] == 0.0
+        assert scores[1] == pytest.approx(expected)
+    
+    @pytest.mark.parametrize("name", ["diff", "histogram", "phash", "tiles"])
+    def test_batch_matches_pairs(self, frames, name):
+        """Test that batch scoring equals scoring each pair"""
+        scorer = get_scorer(name)
+        prepared = [scorer.prepare(f) for f in frames]
+        
+        batch = scorer.score_pairs(np.stack(prepared))
+        
+        assert batch[0] == pytest.approx(0.0)
+        assert list(batch) == pytest.approx(
+            [scorer.score(a, b) for a, b in zip(prepared, prepared[1:])]
+        )
+    
+    def test_buffered_prepare_reuses_output(self, frames):
+        """Test that the buffered diff preparer matches prepare in one buffer"""
+        scorer = get_scorer("diff")
+        prepare = scorer.buffered_prepare()
+        
+        first = prepare(frames[0])
+        assert np.array_equal(first, scorer.prepare(frames[0]))
+        second = prepare(frames[2])
+        assert second is first
+        assert np.array_equal(second, scorer.prepare(frames[2]))
+    
+    def test_batches_carry_over(self, synthetic_video, monkeypatch):
+        """Test that scores are unchanged when the scan spans many batches"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.0)
+        cap = cv2.VideoCapture(str(synthetic_video))
+        expected = extractor._extract_by_scene_change(cap, 30.0)
+        
+        monkeypatch.setattr(FrameExtractor, "SCENE_BATCH_SIZE", 4)
+        changes = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        assert changes == expected
+    
+    def test_histogram_detects_color_change(self):
+        """Test that a hue change scores as a full histogram change"""
+        scorer = get_scorer("histogram")
+        red = np.zeros((240, 320, 3), dtype=np.uint8)
+        red[..., 2] = 255
+        blue = np.zeros((240, 320, 3), dtype=np.uint8)
+        blue[..., 0] = 255
+        
+        assert scorer.score(scorer.prepare(red), scorer.prepare(blue)) == pytest.approx(1.0)
+    
+    def test_phash_detects_cuts(self, synthetic_video):
+        """Test that the phash scorer finds the cuts in the synthetic video"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.3, scorer="phash")
+        cap = cv2.VideoCapture(str(synthetic_video))
+        changes = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        assert [round(t, 2) for t, _, _ in changes] == [1.0, 2.0]
+    
+    def test_tiles_localize_small_changes(self):
+        """Test that a change in one corner scores high and is located"""
+        screen = np.full((480, 640, 3), 200, dtype=np.uint8)
+        dialog = screen.copy()
+        dialog[0:160, 480:640] = 30  # 2x2 tiles in the top-right corner
+        
+        diff, tiles = get_scorer("diff"), get_scorer("tiles")
+        pair = [tiles.prepare(screen), tiles.prepare(dialog)]
+        
+        assert diff.score(*pair) < 0.1
+        assert tiles.score(*pair) == pytest.approx(170 / 255)
+        assert tiles.change_box(*pair) == pytest.approx((0.75, 0.0, 0.25, 1 / 3))
+        assert tiles.change_box(pair[0], pair[0]) is None
+        
+        counting = TileScorer(mode="count")
+        assert counting.score(*pair) == pytest.approx(4 / 48)
+    
+    @pytest.mark.parametrize("single_pass", [False, True])
+    @pytest.mark.parametrize("change_at", [30, 123])
+    def test_change_box_on_extracted_frames(self, tmp_path, single_pass, change_at):
+        """Test that scene-change frames carry the changed region"""
+        video_path = tmp_path / "dialog.mp4"
+        writer = cv2.VideoWriter(str(video_path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (320, 240))
+        yy, xx = np.mgrid[0:240, 0:320]
+        screen = np.where(((yy // 8 + xx // 8) % 2)[..., None] == 1, 230, 20).astype(np.uint8)
+        screen = np.repeat(screen, 3, axis=2)
+        for idx in range(change_at + 30):
+            frame = screen.copy()
+            if idx >= change_at:
+                frame[0:40, 0:80] = 128
+            writer.write(frame)
+        writer.release()
+        
+        extractor = FrameExtractor(
+            strategy="scene", scorer="tiles", scene_threshold=0.2,
+            quality_threshold=0.0, single_pass=single_pass,
+        )
+        frames = extractor.extract(video_path, output_dir=tmp_path / "frames")
+        
+        assert [f.timestamp for f in frames] == [change_at / 30]
+        assert frames[0].change_box == pytest.approx((0.0, 0.0, 0.25, 1 / 6))
+        # The saved frame is the one after the change
+        assert abs(frames[0].load_image()[0:40, 0:80].mean() - 128) < 10
+        metadata = json.loads((tmp_path / "frames" / "metadata.json").read_text())
+        restored = ExtractedFrame.from_dict(metadata["frames"][0])
+        assert restored.change_box == pytest.approx(frames[0].change_box)
+    
+    def test_invalid_scorer(self):
+        """Test that unknown scorers are rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(scorer="ssim")
+    
+    def test_color_scorer_needs_color_decoder(self):
+        """Test that colour scorers cannot run on grayscale ffmpeg frames"""
+        with pytest.raises(ValueError):
+            FrameExtractor(scorer="histogram", decoder="ffmpeg")
+
+
+class TestDuplicateSuppression:
+    """Tests for perceptual-hash near-duplicate suppression"""
+    
+    def test_index_matches_within_radius(self):
+        """Test that identical frames match and different frames do not"""
+        rng = np.random.default_rng(1)
+        frame = rng.integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        other = rng.integers(0, 256, (240, 320, 3), dtype=np.uint8)
+        index = NearDuplicateIndex(radius=4)
+        index.add(frame, "frame_0000")
+        
+        assert index.find(frame.copy()) == ("frame_0000", 0)
+        assert index.find(other) is None
+    
+    def test_extract_drops_duplicates(self, synthetic_video, synthetic_transcript, tmp_path):
+        """Test that revisited screens are recorded instead of written"""
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(
+            strategy="transcript", quality_threshold=0.0, duplicate_hash_radius=4
+        )
+        # Two keyword segments inside the same scene
+        synthetic_transcript.segments[1].text = "Then click again"
+        synthetic_transcript.segments[1].start = 0.25
+        synthetic_transcript.segments[1].end = 0.35
+        
+        frames = extractor.extract(synthetic_video, synthetic_transcript, output_dir)
+        metadata = json.loads((output_dir / "metadata.json").read_text())
+        
+        assert len(frames) == 2
+        assert len(list(output_dir.glob("*.jpg"))) == 2
+        assert metadata["duplicates"][0]["duplicate_of"] == frames[0].frame_id
+
+
+class TestIterExtract:
+    """Tests for the streaming extraction API"""
+    
+    def test_yields_written_frames(self, synthetic_video, tmp_path):
+        """Test that each yielded frame is already on disk"""
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        
+        frames = []
+        for frame in extractor.iter_extract(synthetic_video, output_dir=output_dir):
+            assert frame.path.exists()
+            assert not (output_dir / "metadata.json").exists()
+            frames.append(frame)
+        
+        metadata = json.loads((output_dir / "metadata.json").read_text())
+        assert metadata["total_frames"] == len(frames) == 2
+    
+    def test_matches_extract(self, synthetic_video, synthetic_transcript, tmp_path):
+        """Test that streaming yields the same frames as extract"""
+        extractor = FrameExtractor(scene_threshold=0.2, quality_threshold=0.0)
+        
+        listed = extractor.extract(synthetic_video, synthetic_transcript, tmp_path / "a")
+        streamed = list(
+            extractor.iter_extract(synthetic_video, synthetic_transcript, tmp_path / "b")
+        )
+        
+        assert [f.timestamp for f in streamed] == [f.timestamp for f in listed]
+
+
+class TestFrameFetcher:
+    """Tests for seek-minimizing candidate fetching"""
+    
+    def test_nearby_frames_share_one_seek(self, synthetic_video):
+        """Test that short gaps are read through instead of seeking"""
+        cap = cv2.VideoCapture(str(synthetic_video))
+        fetcher = FrameFetcher(cap, seek_cost_frames=30)
+        fetched = dict(fetcher.fetch_many([40, 5, 10, 50, 89]))
+        cap.release()
+        
+        assert sorted(fetched) == [5, 10, 40, 50, 89]
+        assert fetcher.stats.seeks == 1  # only the jump from 50 to 89
+        assert fetcher.stats.decoded == 5
+        assert fetcher.stats.grabbed == 5 + 4 + 29 + 9
+    
+    def test_matches_seeking(self, synthetic_video):
+        """Test that fetched frames are identical to seek-per-frame reads"""
+        extractor = FrameExtractor()
+        cap = cv2.VideoCapture(str(synthetic_video))
+        fetcher = FrameFetcher(cap, seek_cost_frames=60)
+        for idx in (12, 13, 31, 75):
+            frame = fetcher.fetch(idx)
+            seek_cap = cv2.VideoCapture(str(synthetic_video))
+            expected = extractor._extract_frame_at_timestamp(seek_cap, idx / 30, 30)
+            seek_cap.release()
+            assert np.array_equal(frame, expected)
+        cap.release()
+    
+    def test_seeks_after_failed_read(self, synthetic_video):
+        """Test that a fetch after a failed read seeks instead of reading on"""
+        cap = cv2.VideoCapture(str(synthetic_video))
+        fetcher = FrameFetcher(cap, seek_cost_frames=1000)
+        past_end = fetcher.fetch(120)
+        fetcher.fetch(89)
+        missing = fetcher.fetch(90)
+        frame = fetcher.fetch(10)
+        
+        seek_cap = cv2.VideoCapture(str(synthetic_video))
+        expected = FrameExtractor()._extract_frame_at_timestamp(seek_cap, 10 / 30, 30)
+        seek_cap.release()
+        cap.release()
+        
+        assert past_end is None and missing is None
+        assert np.array_equal(frame, expected)
+        assert [entry["seek"] for entry in fetcher.stats.per_frame] == [False, True, False, True]
+        assert [entry["grabbed"] for entry in fetcher.stats.per_frame] == [90, 0, 0, 0]
+        assert fetcher.stats.grabbed == 90
+    
+    def test_stats_in_metadata(self, synthetic_video, tmp_path):
+        """Test that fetch stats are written to metadata.json"""
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        extractor.extract(synthetic_video, output_dir=output_dir)
+        
+        stats = json.loads((output_dir / "metadata.json").read_text())["fetch_stats"]
+        assert stats["decoded"] == len(stats["per_frame"]) == 2
+        # One seek back from the end of the scan, then read forward
+        assert stats["seeks"] == 1
+
+
+class TestFrameWriter:
+    """Tests for background frame writing"""
+    
+    def test_webp_downscaled(self, synthetic_video, tmp_path):
+        """Test encoder format and downscale-on-save settings"""
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            image_format="webp",
+            save_max_size=160,
+        )
+        frames = extractor.extract(synthetic_video, output_dir=output_dir)
+        
+        assert len(frames) == 2
+        for frame in frames:
+            assert frame.path.suffix == ".webp"
+            assert cv2.imread(str(frame.path)).shape == (120, 160, 3)
+    
+    def test_inline_matches_threaded(self, synthetic_video, tmp_path):
+        """Test that threaded writes produce the same files as inline writes"""
+        outputs = []
+        for threads in (0, 2):
+            extractor = FrameExtractor(
+                strategy="scene",
+                scene_threshold=0.2,
+                quality_threshold=0.0,
+                writer_threads=threads,
+                writer_queue_size=1,
+            )
+            frames = extractor.extract(synthetic_video, output_dir=tmp_path / str(threads))
+            outputs.append([f.path.read_bytes() for f in frames])
+        
+        assert outputs[0] == outputs[1]
+    
+    def test_failed_write_is_reported(self, tmp_path):
+        """Test that write errors surface on the future"""
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        with FrameWriter(threads=1) as writer:
+            ok = writer.submit(frame, tmp_path / "ok.jpg")
+            failed = writer.submit(frame, tmp_path / "missing" / "bad.jpg")
+        
+        assert ok.result() == tmp_path / "ok.jpg"
+        assert isinstance(failed.exception(), OSError)
+    
+    def test_invalid_format(self):
+        """Test that unknown formats are rejected at construction"""
+        with pytest.raises(ValueError):
+            FrameExtractor(image_format="gif")
+    
+    def test_settings_checked_without_threads(self, monkeypatch):
+        """Test that writer settings are validated without starting a writer"""
+        def fail(*args, **kwargs):
+            raise AssertionError("writer pool started during validation")
+        monkeypatch.setattr("framewise.core.frame_writer.ThreadPoolExecutor", fail)
+        
+        FrameExtractor(image_format="png", image_quality=9)
+        with pytest.raises(ValueError):
+            FrameExtractor(image_format="png", image_quality=95)
+        with pytest.raises(ValueError):
+            FrameExtractor(writer_queue_size=0)
+
+
+class TestInMemoryFrames:
+    """Tests for handing frames over without a disk round-trip"""
+    
+    def test_keep_images(self, synthetic_video, tmp_path):
+        """Test that kept frames carry pixels and are still saved"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, quality_threshold=0.0, keep_images=True
+        )
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path / "frames")
+        
+        assert len(frames) == 2
+        for frame in frames:
+            assert frame.image.shape == (240, 320, 3)
+            assert frame.path.exists()
+            assert frame.load_image() is frame.image
+            assert "image" not in frame.to_dict()
+    
+    def test_without_saving(self, synthetic_video, tmp_path):
+        """Test that no images are written when saving is disabled"""
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            save_images=False,
+            keep_images=True,
+        )
+        frames = extractor.extract(synthetic_video, output_dir=output_dir)
+        
+        assert len(frames) == 2
+        assert all(frame.path is None and frame.image is not None for frame in frames)
+        assert [p.name for p in output_dir.iterdir()] == ["metadata.json"]
+    
+    def test_load_image_from_disk(self, synthetic_video, tmp_path):
+        """Test that frames without pixels read their saved image lazily"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        frame = extractor.extract(synthetic_video, output_dir=tmp_path / "frames")[0]
+        
+        assert frame.image is None
+        assert frame.load_image().shape == (240, 320, 3)
+    
+    def test_requires_an_image(self):
+        """Test that frames must be either saved or kept"""
+        with pytest.raises(ValueError):
+            FrameExtractor(save_images=False)
+
+
+class TestFrameShards:
+    """Tests for packed shard frame storage"""
+    
+    def test_write_and_read_back(self, tmp_path):
+        """Test that frames appended to a shard decode from their locations"""
+        frames = [np.full((48, 64, 3), value, dtype=np.uint8) for value in (0, 128, 255)]
+        shard_path = tmp_path / "frames.shard"
+        with ShardWriter(shard_path, image_format="png") as writer:
+            locations = [writer.submit(frame, None).result() for frame in frames]
+        
+        assert sum(length for _, length in locations) == shard_path.stat().st_size
+        with ShardReader(shard_path) as reader:
+            for frame, (offset, length) in zip(frames, locations):
+                assert np.array_equal(reader.decode(offset, length), frame)
+    
+    def test_no_file_without_frames(self, tmp_path):
+        """Test that an empty writer leaves no shard behind"""
+        ShardWriter(tmp_path / "frames.shard").close()
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_refs(self, tmp_path):
+        """Test that shard references round-trip and plain paths are not refs"""
+        ref = format_shard_ref(tmp_path / "frames.shard", 10, 20)
+        
+        assert parse_shard_ref(ref) == (tmp_path / "frames.shard", (10, 20))
+        assert parse_shard_ref(str(tmp_path / "frame_0000.jpg")) is None
+        with pytest.raises(ValueError):
+            load_shard_ref("frame_0000.jpg")
+    
+    def test_extract_to_shard(self, synthetic_video, tmp_path):
+        """Test that shard extraction writes one file and frames load from it"""
+        kwargs = dict(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        loose = FrameExtractor(**kwargs).extract(synthetic_video, output_dir=tmp_path / "a")
+        sharded = FrameExtractor(frame_storage="shard", **kwargs).extract(
+            synthetic_video, output_dir=tmp_path / "b"
+        )
+        
+        assert sorted(p.name for p in (tmp_path / "b").iterdir()) == [
+            "frames.shard", "metadata.json"
+        ]
+        assert [f.timestamp for f in sharded] == [f.timestamp for f in loose]
+        for shard_frame, file_frame in zip(sharded, loose):
+            assert shard_frame.path == tmp_path / "b" / "frames.shard"
+            assert np.array_equal(shard_frame.load_image(), file_frame.load_image())
+            assert np.array_equal(load_shard_ref(shard_frame.location), file_frame.load_image())
+        
+        metadata = json.loads((tmp_path / "b" / "metadata.json").read_text())
+        restored = [ExtractedFrame.from_dict(data) for data in metadata["frames"]]
+        assert restored == sharded
+    
+    def test_load_while_streaming(self, synthetic_video, tmp_path):
+        """Test that streamed shard frames load before extraction finishes"""
+        kwargs = dict(
+            strategy="scene", scene_threshold=0.2, quality_threshold=0.0, frame_storage="shard"
+        )
+        output_dir = tmp_path / "frames"
+        # First without an earlier shard, then over the smaller stale one
+        for max_size, shape in ((64, (48, 64, 3)), (None, (240, 320, 3))):
+            extractor = FrameExtractor(save_max_size=max_size, **kwargs)
+            shapes = [
+                frame.load_image().shape
+                for frame in extractor.iter_extract(synthetic_video, output_dir=output_dir)
+            ]
+            assert shapes == [shape, shape]
+    
+    def test_kept_frames_carry_location(self, synthetic_video, tmp_path):
+        """Test that kept shard frames are yielded with their shard offsets"""
+        extractor = FrameExtractor(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            frame_storage="shard",
+            keep_images=True,
+        )
+        for frame in extractor.iter_extract(synthetic_video, output_dir=tmp_path / "frames"):
+            assert frame.offset is not None and frame.length is not None
+            assert np.array_equal(load_shard_ref(frame.location), frame.image)
+    
+    def test_cache_restores_shard(self, synthetic_video, tmp_path):
+        """Test that a cached shard extraction is restored with its offsets"""
+        extractor = FrameExtractor(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            frame_storage="shard",
+            cache_dir=tmp_path / "cache",
+        )
+        first = extractor.extract(synthetic_video, output_dir=tmp_path / "a")
+        second = extractor.extract(synthetic_video, output_dir=tmp_path / "b")
+        
+        assert [(f.offset, f.length) for f in second] == [(f.offset, f.length) for f in first]
+        assert np.array_equal(second[-1].load_image(), first[-1].load_image())
+
+
+class TestExtractionCache:
+    """Tests for the content-addressed extraction cache"""
+    
+    def test_hit_skips_decoding(self, synthetic_video, tmp_path, monkeypatch):
+        """Test that a repeat extraction is restored without opening the video"""
+        extractor = FrameExtractor(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            cache_dir=tmp_path / "cache",
+        )
+        first = extractor.extract(synthetic_video, output_dir=tmp_path / "a")
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("video was decoded on a cache hit")
+        monkeypatch.setattr(cv2, "VideoCapture", fail)
+        
+        second = extractor.extract(synthetic_video, output_dir=tmp_path / "b")
+        
+        assert [f.to_dict() | {"path": None} for f in second] == [
+            f.to_dict() | {"path": None} for f in first
+        ]
+        assert all(f.path.parent == tmp_path / "b" and f.path.exists() for f in second)
+        metadata = json.loads((tmp_path / "b" / "metadata.json").read_text())
+        assert metadata["total_frames"] == 2
+    
+    def test_settings_change_misses(self, synthetic_video, tmp_path):
+        """Test that different settings produce different cache keys"""
+        cache = ExtractionCache(tmp_path / "cache")
+        loose = FrameExtractor(strategy="scene", scene_threshold=0.2)
+        strict = FrameExtractor(strategy="scene", scene_threshold=0.5)
+        
+        assert cache.key(synthetic_video, loose._cache_settings(None)) != cache.key(
+            synthetic_video, strict._cache_settings(None)
+        )
+        assert cache.get("missing", tmp_path / "out") is None
+    
+    def test_fingerprint_tracks_content(self, tmp_path):
+        """Test that the fingerprint changes with content of equal size"""
+        video = tmp_path / "video.bin"
+        video.write_bytes(b"a" * 500_000)
+        before = video_fingerprint(video)
+        stat = video.stat()
+        
+        with open(video, "r+b") as f:
+            f.seek(499_999)
+            f.write(b"b")
+        os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        assert video_fingerprint(video) != before
+    
+    def test_eviction_under_budget(self, synthetic_video, tmp_path):
+        """Test that least recently used entries are evicted"""
+        cache_dir = tmp_path / "cache"
+        for threshold in (0.2, 0.25):
+            FrameExtractor(
+                strategy="scene",
+                scene_threshold=threshold,
+                quality_threshold=0.0,
+                cache_dir=cache_dir,
+                cache_max_bytes=1,
+            ).extract(synthetic_video, output_dir=tmp_path / str(threshold))
+        
+        assert len(list(cache_dir.iterdir())) <= 1
+    
+    def test_rewrite_keeps_cached_images(self, synthetic_video, tmp_path):
+        """Test that re-extracting into the same directory leaves cached images intact"""
+        kwargs = dict(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            cache_dir=tmp_path / "cache",
+        )
+        FrameExtractor(**kwargs).extract(synthetic_video, output_dir=tmp_path / "a")
+        small = FrameExtractor(save_max_size=64, **kwargs).extract(
+            synthetic_video, output_dir=tmp_path / "a"
+        )
+        full = FrameExtractor(**kwargs).extract(synthetic_video, output_dir=tmp_path / "b")
+        small_again = FrameExtractor(save_max_size=64, **kwargs).extract(
+            synthetic_video, output_dir=tmp_path / "c"
+        )
+        
+        assert all(cv2.imread(str(f.path)).shape == (48, 64, 3) for f in small)
+        assert all(cv2.imread(str(f.path)).shape == (240, 320, 3) for f in full)
+        assert all(cv2.imread(str(f.path)).shape == (48, 64, 3) for f in small_again)
+
+
+class TestKeywordMatching:
+    """Tests for compiled transcript keyword matching"""
+    
+    def test_whole_words_only(self):
+        """Test that keywords do not match inside other words"""
+        matcher = KeywordMatcher(FrameExtractor.ACTION_KEYWORDS)
+        
+        assert matcher.findall("Open the table of contents") == ["open"]
+        assert matcher.findall("Press TAB, then Save.") == ["press", "tab", "save"]
+    
+    def test_priority_and_phrases(self):
+        """Test keyword priority, phrases and shared prefixes"""
+        matcher = KeywordMatcher(["save", "log in", "log", "Click"])
+        
+        assert matcher.first("click save") == "save"
+        assert matcher.findall("log in and log out") == ["log in", "log"]
+        assert matcher.first("nothing here") is None
+    
+    def test_priority_beats_longer_match(self):
+        """Test that an earlier keyword wins inside a longer, later one"""
+        matcher = KeywordMatcher(["open", "menu bar", "open menu"])
+        
+        assert matcher.findall("open menu bar") == ["open menu"]
+        assert matcher.first("open menu bar") == "open"
+        assert KeywordMatcher(["menu bar", "open menu"]).first("open menu bar") == "menu bar"
+        assert matcher.first("reopen menus") is None
+    
+    def test_large_vocabulary(self):
+        """Test that a vocabulary of thousands of keywords still matches"""
+        words = [f"verb{i}" for i in range(5000)]
+        matcher = KeywordMatcher(words)
+        
+        assert matcher.findall("then verb4999 and verb12 but not verb123x") == [
+            "verb4999", "verb12"
+        ]
+    
+    def test_custom_vocabulary(self, synthetic_transcript):
+        """Test transcript extraction with a per-deployment vocabulary"""
+        extractor = FrameExtractor(strategy="transcript", action_keywords=["nothing"])
+        timestamps = extractor._extract_by_transcript(synthetic_transcript)
+        
+        assert timestamps == [(1.6, "keyword:nothing", 1.0)]
+
+
+class TestCandidateSelection:
+    """Tests for budgeted top-k candidate selection"""
+    
+    def test_keeps_strongest(self):
+        """Test that selection is by score, not by position"""
+        selector = CandidateSelector(budget=2)
+        for i, score in enumerate([0.4, 0.9, 0.1, 0.8, 0.2]):
+            selector.add(float(i), score, i)
+        
+        assert selector.selected() == [1, 3]
+    
+    def test_covers_every_window(self):
+        """Test that a weak candidate in a quiet window is still kept"""
+        selector = CandidateSelector(budget=3, duration=100.0, window=50.0)
+        for timestamp, score in [(1, 0.9), (2, 0.8), (3, 0.7), (4, 0.6), (80, 0.1)]:
+            selector.add(float(timestamp), score, timestamp)
+        
+        assert selector.selected() == [1, 2, 80]
+    
+    def test_windows_fit_budget(self):
+        """Test that windows are widened to at most budget / quota"""
+        selector = CandidateSelector(budget=4, duration=3600.0, window=30.0)
+        for i in range(3600):
+            selector.add(float(i), float(i % 7), i)
+        
+        assert selector.n_windows == 4
+        selected = selector.selected()
+        assert len(selected) == 4
+        assert [t // 900 for t in selected] == [0, 1, 2, 3]
+    
+    def test_single_pass_matches_two_pass(self, synthetic_video, tmp_path):
+        """Test that streaming selection during the scan matches post-hoc selection"""
+        kwargs = dict(
+            strategy="scene",
+            scene_threshold=0.0,
+            quality_threshold=0.0,
+            max_frames_per_video=2,
+            coverage_window=1.5,
+        )
+        two_pass = FrameExtractor(**kwargs).extract(synthetic_video, output_dir=tmp_path / "a")
+        one_pass = FrameExtractor(single_pass=True, **kwargs).extract(
+            synthetic_video, output_dir=tmp_path / "b"
+        )
+        
+        # Three candidates; the weak one at 0.4s is dropped
+        assert [f.timestamp for f in two_pass] == [1.0, 2.0]
+        assert [f.timestamp for f in one_pass] == [f.timestamp for f in two_pass]
+
+
+class TestFrameQuality:
+    """Tests for full and fast frame quality assessment"""
+    
+    @staticmethod
+    def _frames():
+        """A sharp 1280x960 frame and a blurred copy"""
+        rng = np.random.default_rng(0)
+        sharp = np.repeat(np.kron(
+            rng.integers(0, 256, (96, 128), dtype=np.uint8),
+            np.ones((10, 10), dtype=np.uint8),
+        )[..., np.newaxis], 3, axis=2)
+        blurred = cv2.blur(sharp, (41, 41))
+        return sharp, blurred
+    
+    def test_batch_matches_opencv(self):
+        """Test that the vectorized Laplacian variance matches cv2.Laplacian"""
+        grays = np.random.default_rng(1).integers(0, 256, (3, 24, 32), dtype=np.uint8)
+        
+        expected = [laplacian_variance(gray) for gray in grays]
+        assert np.allclose(batch_laplacian_variance(grays), expected)
+    
+    def test_fast_separates_sharp_from_blurred(self):
+        """Test that calibrated fast scores agree with full scores"""
+        sharp, blurred = self._frames()
+        full = FrameQualityAssessor(mode="full")
+        fast = FrameQualityAssessor(mode="fast", calibration_frames=1)
+        
+        scores = fast.score_batch([sharp, sharp, blurred])
+        assert fast.gain is not None
+        assert scores[1] == pytest.approx(full.score(sharp), rel=0.01)
+        assert scores[2] < 0.5 < scores[1]
+        assert fast.score(blurred) == pytest.approx(scores[2])
+    
+    def test_invalid_mode(self):
+        """Test that unknown quality modes are rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(quality_mode="approximate")
+    
+    @pytest.mark.parametrize("single_pass", [False, True])
+    def test_fast_extraction(self, synthetic_video, tmp_path, single_pass):
+        """Test that fast mode keeps the same frames on the synthetic video"""
+        kwargs = dict(strategy="scene", scene_threshold=0.3, single_pass=single_pass)
+        full = FrameExtractor(**kwargs).extract(synthetic_video, output_dir=tmp_path / "a")
+        fast = FrameExtractor(quality_mode="fast", **kwargs).extract(
+            synthetic_video, output_dir=tmp_path / "b"
+        )
+        
+        assert [f.timestamp for f in fast] == [f.timestamp for f in full]
+        assert all(f.quality_score >= 0.5 for f in fast)
+    
+    def test_single_pass_reuses_scan_frames(self, synthetic_video, tmp_path, monkeypatch):
+        """Test that single-pass fast scoring uses the scan's analysis frames"""
+        def fail(frame):
+            raise AssertionError("candidate converted again")
+        monkeypatch.setattr("framewise.core.frame_extractor.to_scene_frame", fail)
+        
+        extractor = FrameExtractor(
+            strategy="scene",
+            scene_threshold=0.2,
+            quality_threshold=0.0,
+            single_pass=True,
+            quality_mode="fast",
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        buffered = extractor._extract_single_pass(cap, 30.0, duration=3.0)
+        cap.release()
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path / "frames")
+        
+        assert [f.timestamp for f in frames] == [c[0] for c in buffered]
+        assert len(buffered) == 2
+        for *_, frame, _, gray in buffered:
+            gray_frame = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (320, 240))
+            assert np.array_equal(gray, gray_frame)
+
+
+class TestAdaptiveThreshold:
+    """Tests for the rolling-statistics scene threshold"""
+    
+    @staticmethod
+    def _scores(noise, cuts, n=600, fps=10.0):
+        """Noisy score series with spikes at the given sample indices"""
+        rng = np.random.default_rng(0)
+        scores = np.abs(rng.normal(0.0, noise, n))
+        scores[cuts] += 0.3
+        return [(i / fps, "scene_change", float(score)) for i, score in enumerate(scores)]
+    
+    @pytest.mark.parametrize("noise", [0.002, 0.03])
+    def test_finds_cuts_at_any_noise_level(self, noise):
+        """Test that the same cuts are found in clean and noisy footage"""
+        cuts = [100, 250, 400]
+        changes = AdaptiveThreshold(k=5.0).filter(self._scores(noise, cuts))
+        
+        assert [t for t, _, _ in changes] == [10.0, 25.0, 40.0]
+    
+    def test_min_gap(self):
+        """Test that detections closer than min_gap are suppressed"""
+        detector = AdaptiveThreshold(k=0.0, min_gap=1.0, warmup=0, fallback=0.1)
+        flags = [
+            detector.update(t, score)
+            for t, score in [(0.0, 0.2), (0.5, 0.3), (1.0, 0.4), (1.2, 0.5)]
+        ]
+        
+        assert flags == [True, False, True, False]
+    
+    def test_state_round_trip(self):
+        """Test that a detector restored from its state continues identically"""
+        scores = self._scores(0.03, [100, 250, 400])
+        whole = AdaptiveThreshold(k=5.0)
+        expected = [whole.update(t, score) for t, _, score in scores]
+        
+        first = AdaptiveThreshold(k=5.0)
+        flags = [first.update(t, score) for t, _, score in scores[:300]]
+        resumed = AdaptiveThreshold(k=5.0)
+        resumed.load_state(json.loads(json.dumps(first.state())))
+        flags += [resumed.update(t, score) for t, _, score in scores[300:]]
+        
+        assert flags == expected
+        assert len(first.state()["scores"]) <= 301
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_checkpoint_holds_detections_only(
+        self, synthetic_video, tmp_path, monkeypatch, workers
+    ):
+        """Test that checkpointed adaptive scans record changes, not every score"""
+        extractor = FrameExtractor(
+            strategy="scene", threshold_mode="adaptive", scene_threshold=0.9,
+            workers=workers, checkpoint_interval=0.4,
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        expected = extractor._extract_by_scene_change(cap, 30.0)
+        checkpoint = ExtractionCheckpoint(tmp_path, "key")
+        changes = extractor._detect_scene_changes(
+            cap, synthetic_video, 30.0, 90, checkpoint=checkpoint
+        )
+        checkpoint.close()
+        
+        assert [t for t, _, _ in expected] == [1.0, 2.0]
+        assert changes == expected
+        assert sum(len(found) for found in checkpoint.segments.values()) == 2
+        
+        def no_scan(*args, **kwargs):
+            raise AssertionError("recorded segments were scanned again")
+        
+        monkeypatch.setattr(FrameExtractor, "_extract_by_scene_change", no_scan)
+        resumed = ExtractionCheckpoint(tmp_path, "key")
+        assert extractor._detect_scene_changes(
+            cap, synthetic_video, 30.0, 90, checkpoint=resumed
+        ) == expected
+        resumed.close()
+        cap.release()
+    
+    def test_invalid_mode(self):
+        """Test that unknown modes and keyframe combinations are rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(threshold_mode="percentile")
+        with pytest.raises(ValueError):
+            FrameExtractor(threshold_mode="adaptive", refine_boundaries=True)
+    
+    @pytest.mark.parametrize("options", [{}, {"single_pass": True}, {"workers": 2}])
+    def test_extraction(self, synthetic_video, tmp_path, options):
+        """Test that every scan mode finds the synthetic cuts adaptively"""
+        extractor = FrameExtractor(
+            strategy="scene",
+            threshold_mode="adaptive",
+            scene_threshold=0.9,
+            quality_threshold=0.0,
+            **options,
+        )
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path)
+        
+        assert [f.timestamp for f in frames] == [1.0, 2.0]
+
+
+class TestVideoProbe:
+    """Tests for cached video probing"""
+    
+    def test_parse_ffprobe_output(self):
+        """Test that packets are counted in presentation order"""
+        header = {
+            "streams": [{"codec_name": "h264", "width": 640, "height": 360,
+                         "avg_frame_rate": "30/1", "duration": "0.200000"}],
+        }
+        # Decode order with B-frames; the last packet is discardable
+        packets = (
+            "0.000000,0.000000,K_\n0.100000,0.033333,__\n0.033333,0.066667,__\n"
+            "0.066667,0.100000,__\n0.133333,0.133333,K_\n0.166667,0.166667,__\n"
+            "0.200000,0.200000,_D\n"
+        )
+        info = parse_ffprobe(header, packets)
+        
+        assert info.frame_count == 6
+        assert info.keyframes == [0, 4]
+        assert info.fps == pytest.approx(30.0)
+        assert (info.width, info.height, info.codec) == (640, 360, "h264")
+        assert info.keyframe_at_or_before(3) == 0
+        assert info.keyframe_at_or_before(5) == 4
+    
+    def test_cache_round_trip(self, synthetic_video, tmp_path):
+        """Test that probe results are reused until the file changes"""
+        cache_dir = tmp_path / "probe"
+        info = probe_video(synthetic_video, cache_dir=cache_dir)
+        assert info.frame_count == 90
+        assert info.fps == pytest.approx(30.0)
+        
+        # A doctored entry proves the second probe reads the cache
+        (entry,) = cache_dir.glob("*.json")
+        entry.write_text(json.dumps(dict(info.to_dict(), frame_count=7)))
+        assert probe_video(synthetic_video, cache_dir=cache_dir).frame_count == 7
+        
+        stat = synthetic_video.stat()
+        os.utime(synthetic_video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert probe_video(synthetic_video, cache_dir=cache_dir).frame_count == 90
+    
+    def test_invalid_probe(self):
+        """Test that an unknown probe method is rejected"""
+        with pytest.raises(ValueError):
+            FrameExtractor(probe="mediainfo")
+    
+    def test_fetcher_seeks_past_keyframes_only(self, synthetic_video):
+        """Test that known keyframes decide between seeking and reading on"""
+        cap = cv2.VideoCapture(str(synthetic_video))
+        fetcher = FrameFetcher(cap, seek_cost_frames=0, keyframes=[0, 50, 60])
+        fetched = dict(fetcher.fetch_many([5, 45, 50, 75]))
+        cap.release()
+        
+        assert all(frame is not None for frame in fetched.values())
+        # 50 is a few frames on from 45; 75 is decoded from keyframe 60
+        assert [entry["seek"] for entry in fetcher.stats.per_frame] == [
+            False, False, False, True
+        ]
+    
+    def test_parallel_ranges_snap_to_keyframes(self, synthetic_video):
+        """Test that keyframe-aligned ranges reproduce the sequential scan"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.01, workers=3)
+        cap = cv2.VideoCapture(str(synthetic_video))
+        sequential = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        parallel = extractor._extract_by_scene_change_parallel(
+            synthetic_video, 30.0, 90, keyframes=[0, 12, 24, 36, 48, 60, 72, 84]
+        )
+        
+        assert [t for t, _, _ in parallel] == [t for t, _, _ in sequential]
+    
+    def test_probes_before_opening(self, synthetic_video, tmp_path, monkeypatch):
+        """Test that a cached probe plans the work before the video is opened"""
+        cache_dir = tmp_path / "probe"
+        probe_video(synthetic_video, cache_dir=cache_dir)
+        events = []
+        
+        def probe(*args, **kwargs):
+            events.append("probe")
+            return probe_video(*args, **kwargs)
+        
+        def capture(*args):
+            events.append("open")
+            return open_capture(*args)
+        
+        open_capture = cv2.VideoCapture
+        monkeypatch.setattr("framewise.core.frame_extractor.probe_video", probe)
+        monkeypatch.setattr(cv2, "VideoCapture", capture)
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, quality_threshold=0.0,
+            probe_cache_dir=cache_dir,
+        )
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path / "out")
+        
+        assert [f.timestamp for f in frames] == [1.0, 2.0]
+        assert events == ["probe", "open"]
+    
+    @pytest.mark.skipif(shutil.which("ffprobe") is None, reason="ffprobe not installed")
+    def test_ffprobe_extraction(self, synthetic_video, tmp_path):
+        """Test extraction planned from an ffprobe packet scan"""
+        info = probe_video(synthetic_video, method="ffprobe")
+        assert info.frame_count == 90
+        assert info.keyframes and info.keyframes[0] == 0
+        
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, quality_threshold=0.0,
+            probe="ffprobe", workers=2,
+        )
+        frames = extractor.extract(synthetic_video, output_dir=tmp_path)
+        assert [f.timestamp for f in frames] == [1.0, 2.0]
+
+
+class TestStaticSkip:
+    """Tests for collapsing static stretches in scene scans"""
+    
+    @staticmethod
+    def _scanner(levels, **kwargs):
+        """Scanner over a 1-pixel video whose frame i has value levels[i]"""
+        fetch = lambda i: np.array([levels[i]], dtype=np.float64) if i < len(levels) else None
+        score = lambda a, b: float(abs(b[0] - a[0]))
+        return StaticSegmentScanner(fetch, score, **kwargs)
+    
+    def test_finds_changes_with_few_decodes(self):
+        """Test that changes after long static runs are located exactly"""
+        levels = [0.0] * 1000 + [0.5] * 1000 + [0.2] * 777
+        scanner = self._scanner(levels, max_step=128)
+        changes = [(i, s) for _, i, s in scanner.scan() if s > 0.1]
+        
+        assert changes == [(1000, 0.5), (2000, pytest.approx(0.3))]
+        assert [start for start, _ in scanner.runs] == [0, 1000, 2000]
+        assert scanner.runs[-1][1] == len(levels) - 1
+        assert scanner.decoded < len(levels) / 10
+    
+    def test_strided_changes(self):
+        """Test that bisection stays on the sampling grid"""
+        levels = [0.0] * 500 + [1.0] * 500
+        scanner = self._scanner(levels, stride=4, max_step=64)
+        changes = [(p, i) for p, i, s in scanner.scan() if s > 0.1]
+        
+        assert changes == [(496, 500)]
+    
+    def test_extraction_matches_dense_scan(self, synthetic_video, tmp_path):
+        """Test that collapsing keeps the cuts and adds one frame per run"""
+        options = dict(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        dense = FrameExtractor(**options).extract(synthetic_video, output_dir=tmp_path / "a")
+        collapsed = FrameExtractor(collapse_static=True, max_static_skip=0.5, **options).extract(
+            synthetic_video, output_dir=tmp_path / "b"
+        )
+        
+        assert [f.timestamp for f in dense] == [1.0, 2.0]
+        assert [(f.timestamp, f.extraction_reason) for f in collapsed] == [
+            (0.0, "static_segment"), (1.0, "scene_change"), (2.0, "scene_change")
+        ]
+    
+    def test_parallel_matches_sequential(self, synthetic_video):
+        """Test that chunked scans report each static run once"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.2, collapse_static=True, workers=4
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        sequential = extractor._extract_by_scene_change(cap, 30.0)
+        cap.release()
+        
+        parallel = extractor._extract_by_scene_change_parallel(synthetic_video, 30.0, 90)
+        
+        assert [(t, r) for t, r, _ in parallel] == [(t, r) for t, r, _ in sequential]
+    
+    def test_incompatible_options(self):
+        """Test that collapsing is rejected where it cannot seek"""
+        with pytest.raises(ValueError):
+            FrameExtractor(collapse_static=True, single_pass=True)
+        with pytest.raises(ValueError):
+            FrameExtractor(collapse_static=True, threshold_mode="adaptive")
+
+
+class TestResumableExtraction:
+    """Tests for checkpointed, resumable extraction"""
+    
+    def test_resume_skips_scan_and_reuses_frames(self, synthetic_video, tmp_path, monkeypatch):
+        """Test that an interrupted extraction resumes from its checkpoint"""
+        options = dict(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        expected = FrameExtractor(**options).extract(synthetic_video, output_dir=tmp_path / "full")
+        
+        output_dir = tmp_path / "frames"
+        extractor = FrameExtractor(resumable=True, checkpoint_interval=1.0, **options)
+        stream = extractor.iter_extract(synthetic_video, output_dir=output_dir)
+        first = next(stream)
+        stream.close()  # interrupted after the first frame
+        
+        assert (output_dir / CHECKPOINT_NAME).exists()
+        assert not (output_dir / "metadata.json").exists()
+        written = first.path.stat().st_mtime_ns
+        
+        def no_scan(*args, **kwargs):
+            raise AssertionError("recorded segments were scanned again")
+        
+        monkeypatch.setattr(FrameExtractor, "_extract_by_scene_change", no_scan)
+        frames = extractor.extract(synthetic_video, output_dir=output_dir)
+        
+        assert [(f.frame_id, f.timestamp) for f in frames] == [
+            (f.frame_id, f.timestamp) for f in expected
+        ]
+        assert first.path.stat().st_mtime_ns == written
+        assert (output_dir / "metadata.json").exists()
+        assert not (output_dir / CHECKPOINT_NAME).exists()
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_segments_match_one_scan(self, synthetic_video, tmp_path, workers):
+        """Test that a segmented scan equals an uninterrupted one"""
+        extractor = FrameExtractor(
+            strategy="scene", scene_threshold=0.01, analysis_fps=7,
+            workers=workers, checkpoint_interval=0.4,
+        )
+        cap = cv2.VideoCapture(str(synthetic_video))
+        expected = extractor._extract_by_scene_change(cap, 30.0)
+        
+        checkpoint = ExtractionCheckpoint(tmp_path, "key")
+        changes = extractor._detect_scene_changes(
+            cap, synthetic_video, 30.0, 90, checkpoint=checkpoint
+        )
+        cap.release()
+        checkpoint.close()
+        
+        assert [t for t, _, _ in changes] == [t for t, _, _ in expected]
+        assert len(checkpoint.segments) == 8
+    
+    def test_checkpoint_drops_torn_records(self, tmp_path):
+        """Test that a partial last record and foreign checkpoints are ignored"""
+        checkpoint = ExtractionCheckpoint(tmp_path, "key")
+        checkpoint.add_segment(0, 30, [(0.5, "scene_change", 0.4)])
+        checkpoint.close()
+        with open(tmp_path / CHECKPOINT_NAME, "a") as f:
+            f.write('{"type": "segment", "start": 30')
+        
+        resumed = ExtractionCheckpoint(tmp_path, "key")
+        resumed.add_segment(30, None, [])
+        resumed.close()
+        reopened = ExtractionCheckpoint(tmp_path, "key")
+        reopened.close()
+        assert reopened.segments == {(0, 30): [(0.5, "scene_change", 0.4)], (30, None): []}
+        
+        foreign = ExtractionCheckpoint(tmp_path, "other")
+        foreign.close()
+        assert foreign.segments == {}
+
+
+class TestExtractBatch:
+    """Tests for multi-video batch extraction"""
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_batch_in_input_order(self, synthetic_video, tmp_path, workers):
+        """Test per-video outputs, input ordering and failure isolation"""
+        missing = tmp_path / "missing.mp4"
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        
+        results = extractor.extract_batch(
+            [synthetic_video, missing, synthetic_video],
+            output_root=tmp_path / "out",
+            workers=workers,
+        )
+        
+        assert [r.index for r in results] == [0, 1, 2]
+        assert [r.ok for r in results] == [True, False, True]
+        assert "FileNotFoundError" in results[1].error
+        assert results[0].output_dir != results[2].output_dir
+        assert len(results[0].frames) == len(results[2].frames) == 2
+        assert (results[2].output_dir / "metadata.json").exists()
+    
+    def test_renamed_stems_avoid_real_stems(self, tmp_path):
+        """Test that a duplicate stem's new name never takes another video's"""
+        extractor = FrameExtractor(strategy="scene")
+        paths = [tmp_path / "a.mp4", tmp_path / "a.mov", tmp_path / "a_1.mp4"]
+        
+        dirs = extractor._batch_output_dirs(paths, tmp_path / "out")
+        
+        assert len(set(dirs)) == len(paths)
+        assert dirs[2].name == "a_1"
+    
+    def test_iter_batch_yields_every_video(self, synthetic_video, tmp_path):
+        """Test that the unordered stream covers every input"""
+        extractor = FrameExtractor(strategy="scene", scene_threshold=0.2, quality_threshold=0.0)
+        
+        results = list(extractor.iter_extract_batch(
+            [synthetic_video, synthetic_video], output_root=tmp_path / "out", workers=2
+        ))
+        
+        assert sorted(r.index for r in results) == [0, 1]
+    
+    def test_misaligned_transcripts(self, synthetic_video, tmp_path):
+        """Test that transcripts must align with videos"""
+        extractor = FrameExtractor(strategy="scene")
+        with pytest.raises(ValueError):
+            extractor.extract_batch([synthetic_video], transcripts=[], output_root=tmp_path)
@@ -5,6 +5,7 @@ Comprehensive tests for TranscriptExtractor
 import json
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
+import numpy as np
 import pytest
 
 from framewise.core.transcript_extractor import (
@@ -171,6 +172,74 @@ class TestTranscript:
             assert orig.text == loaded_seg.text
 
 
+# Tests for TranscriptIndex
+
+class TestTranscriptIndex:
+    """Tests for the transcript interval index"""
+    
+    @staticmethod
+    def linear_lookup(segments, timestamp, tolerance=2.0):
+        """Reference implementation: linear scan, then closest segment"""
+        for segment in segments:
+            if segment.start <= timestamp <= segment.end:
+                return segment
+        closest = min(
+            segments,
+            key=lambda s: min(abs(s.start - timestamp), abs(s.end - timestamp))
+        )
+        if min(abs(closest.start - timestamp), abs(closest.end - timestamp)) < tolerance:
+            return closest
+        return None
+    
+    def test_point_lookup(self, sample_transcript):
+        """Test containment, shared boundaries and tolerance"""
+        index = sample_transcript.index
+        segments = sample_transcript.segments
+        
+        assert index.find(1.0) is segments[0]
+        assert index.find(2.5) is segments[0]  # earliest of two sharing a boundary
+        assert index.find(9.0) is None
+        assert index.lookup(9.5) is segments[2]
+        assert index.lookup(10.5) is None
+    
+    def test_overlapping_range(self, sample_transcript):
+        """Test time-range queries"""
+        texts = [s.text for s in sample_transcript.index.overlapping(3.0, 5.5)]
+        assert texts == ["Today we'll learn about exports", "Click the export button here"]
+    
+    def test_matches_linear_scan(self, tmp_path):
+        """Test against a linear scan on unsorted, overlapping segments"""
+        rng = np.random.default_rng(0)
+        starts = rng.uniform(0, 100, 200)
+        segments = [
+            TranscriptSegment(float(start), float(start + rng.uniform(0, 3)), str(i))
+            for i, start in enumerate(starts)
+        ]
+        # The reference returns the first match in list order
+        segments.sort(key=lambda s: s.start)
+        transcript = Transcript(tmp_path / "v.mp4", "en", segments, "")
+        
+        for timestamp in rng.uniform(-5, 110, 500):
+            assert transcript.index.lookup(timestamp) is self.linear_lookup(
+                segments, timestamp
+            )
+    
+    def test_rebuilt_when_segments_change(self, sample_transcript):
+        """Test that appending a segment invalidates the index"""
+        assert sample_transcript.index.find(20.0) is None
+        sample_transcript.segments.append(TranscriptSegment(19.0, 21.0, "Later"))
+        assert sample_transcript.index.find(20.0).text == "Later"
+    
+    def test_rebuilt_when_edited_in_place(self, sample_transcript):
+        """Test that edits keeping the segment count invalidate the index"""
+        assert sample_transcript.index.find(20.0) is None
+        sample_transcript.segments[0] = TranscriptSegment(19.0, 21.0, "Later")
+        assert sample_transcript.index.find(20.0).text == "Later"
+        
+        sample_transcript.segments[1].end = 30.0
+        assert sample_transcript.index.find(25.0) is sample_transcript.segments[1]
+
+
 # Tests for TranscriptExtractor
 
 class TestTranscriptExtractor: